@@ -0,0 +1,161 @@
+# Benchmarks the task data paths on generated datasets.
+#
+#   python -m benchmarks                          # 1k, 10k and 100k tasks
+#   python -m benchmarks --sizes 1000 --output before.json
+#   python -m benchmarks --output after.json --compare before.json
+#
+# Firebase is replaced by an in-process fake (benchmarks/fake_db.py) and the
+# rate limiter by unlimited budgets, so the numbers are the app's own cost.
+import os
+import sys
+
+# Before any Qt import: no window system is needed unless one is asked for
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+from datetime import datetime
+from typing import Dict, List, Optional
+import argparse
+import contextlib
+import gc
+import io
+import json
+import logging
+import platform
+import subprocess
+import time
+
+from benchmarks.datasets import describe, generate_tasks
+from benchmarks.fake_db import FakeDatabase
+from benchmarks.task_paths import CASES, TaskPathBench, run_case
+from ui.theme import apply_theme
+
+SCHEMA_VERSION = 1
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+def git_revision() -> Dict[str, Optional[object]]:
+    """Commit being measured, so result files can be matched to the tree."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=root, capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=root,
+                                capture_output=True, text=True, timeout=30).stdout
+        return {'commit': commit, 'dirty': bool(status.strip())}
+    except (OSError, subprocess.SubprocessError):
+        return {'commit': None, 'dirty': None}
+
+def run(sizes: List[int], case_names: Optional[List[str]], repeat: int, seed: int,
+        latency_ms: float, show: bool) -> Dict:
+    """
+    Run every selected case at every size.
+
+    Returns:
+        The results document written by --output
+    """
+    cases = [case for case in CASES if not case_names or case.name in case_names]
+    unknown = set(case_names or []) - {case.name for case in CASES}
+    if unknown:
+        raise SystemExit(f"Unknown cases: {', '.join(sorted(unknown))}")
+
+    document = {
+        'schema': SCHEMA_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        **git_revision(),
+        'python': platform.python_version(),
+        'qt': QT_VERSION_STR,
+        'pyqt': PYQT_VERSION_STR,
+        'platform': platform.platform(),
+        'config': {'repeat': repeat, 'seed': seed, 'latency_ms': latency_ms, 'show': show},
+        'datasets': {},
+        'results': [],
+    }
+
+    database = FakeDatabase(latency=latency_ms / 1000)
+    # The app prints progress as it goes; keep stdout for --output -
+    with contextlib.redirect_stdout(io.StringIO()):
+        bench = TaskPathBench(database, show=show)
+    try:
+        for size in sizes:
+            started = time.perf_counter()
+            tasks = generate_tasks(size, seed)
+            document['datasets'][str(size)] = describe(tasks)
+            print(f"{size} tasks generated in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+            for case in cases:
+                gc.collect()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = run_case(bench, case, tasks, repeat)
+                document['results'].append({'case': case.name, 'size': size, **result})
+                print(f"  {case.name:<28} {result['median_ms']:>10.1f} ms (median of {repeat})",
+                      file=sys.stderr)
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            bench.close()
+    return document
+
+def compare(current: Dict, baseline: Dict) -> str:
+    """Table of median times against a baseline results file."""
+    previous = {(r['case'], r['size']): r for r in baseline.get('results', [])}
+    lines = [f"Compared with {baseline.get('commit') or 'baseline'} "
+             f"({baseline.get('created', '?')}):",
+             f"  {'case':<28} {'size':>7} {'before':>10} {'after':>10} {'change':>8}"]
+    for result in current['results']:
+        before = previous.get((result['case'], result['size']))
+        if before is None:
+            continue
+        ratio = result['median_ms'] / before['median_ms'] if before['median_ms'] else float('inf')
+        lines.append(f"  {result['case']:<28} {result['size']:>7} {before['median_ms']:>8.1f}ms "
+                     f"{result['median_ms']:>8.1f}ms {(ratio - 1) * 100:>+7.0f}%")
+    return '\n'.join(lines)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Time the task data paths on generated datasets.")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated task counts (default: %(default)s)")
+    parser.add_argument('--cases', help="Comma-separated case names (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per case and size")
+    parser.add_argument('--seed', type=int, default=0, help="Dataset seed")
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help="Simulated latency of each database request")
+    parser.add_argument('--no-show', action='store_true',
+                        help="Keep the window hidden, leaving out layout and painting")
+    parser.add_argument('--output', help="Write results as JSON to this file ('-' for stdout)")
+    parser.add_argument('--compare', help="Results file to compare the medians against")
+    parser.add_argument('--list', action='store_true', help="List the cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for case in CASES:
+            print(f"{case.name:<28} {case.description}")
+        return 0
+
+    logging.basicConfig(level=logging.WARNING)
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    apply_theme(app)
+    document = run(
+        sizes=[int(size) for size in args.sizes.split(',') if size.strip()],
+        case_names=[name.strip() for name in args.cases.split(',')] if args.cases else None,
+        repeat=max(1, args.repeat),
+        seed=args.seed,
+        latency_ms=args.latency_ms,
+        show=not args.no_show,
+    )
+
+    if args.output == '-':
+        json.dump(document, sys.stdout, indent=2)
+        print()
+    elif args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print(compare(document, json.load(f)), file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+import random
+
+# Labels stored in Firebase, with how often each is used
+PRIORITIES: List[Tuple[str, float]] = [
+    ("Urgent ⚡", 0.10),
+    ("High 🔴", 0.25),
+    ("Medium 🟡", 0.40),
+    ("Low 🟢", 0.25),
+]
+
+# Due date relative to today: (first day, last day, share of tasks).
+# None means no due date.
+DUE_DATE_BUCKETS: List[Tuple[Optional[int], Optional[int], float]] = [
+    (None, None, 0.15),
+    (-60, -1, 0.15),    # overdue
+    (0, 0, 0.08),       # today
+    (1, 1, 0.07),       # tomorrow
+    (2, 7, 0.20),       # this week
+    (8, 120, 0.35),     # later
+]
+
+# Number of notes on a task: (fewest, most, share of tasks)
+NOTE_COUNTS: List[Tuple[int, int, float]] = [
+    (0, 0, 0.50),
+    (1, 3, 0.35),
+    (4, 12, 0.15),
+]
+
+COMPLETED_SHARE = 0.30
+# Completed tasks finished this many days ago at most; the sweep removes those
+# older than 20 days
+COMPLETED_WITHIN_DAYS = 45
+
+_WORDS = (
+    "review update call send draft plan fix check book order prepare write "
+    "meeting report invoice budget client design team release notes slides "
+    "groceries dentist flight hotel taxes car insurance backup server email "
+    "follow up with about before after for the and new old weekly monthly"
+).split()
+
+_PUSH_CHARS = '-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz'
+
+def _pick(rng: random.Random, weighted: Sequence[tuple]):
+    return rng.choices(weighted, weights=[entry[-1] for entry in weighted])[0]
+
+def _sentence(rng: random.Random, fewest: int, most: int) -> str:
+    words = rng.choices(_WORDS, k=rng.randint(fewest, most))
+    return ' '.join(words).capitalize()
+
+def push_key(timestamp_ms: int, rng: random.Random) -> str:
+    """A Firebase push ID: 8 time characters then 12 random ones, so keys sort by creation."""
+    chars = []
+    for _ in range(8):
+        chars.append(_PUSH_CHARS[timestamp_ms % 64])
+        timestamp_ms //= 64
+    return ''.join(reversed(chars)) + ''.join(rng.choice(_PUSH_CHARS) for _ in range(12))
+
+def generate_task(rng: random.Random, created: datetime, today: date) -> Dict:
+    """One task as stored under tasks/<user id>/<key>."""
+    priority = _pick(rng, PRIORITIES)[0]
+    task = {
+        'task_name': _sentence(rng, 2, 8),
+        'priority': priority,
+        'priority_value': [label for label, _ in PRIORITIES].index(priority) + 1,
+        'created_at': created.isoformat(),
+        'completed': False,
+        'notes': '',
+    }
+
+    first, last, _ = _pick(rng, DUE_DATE_BUCKETS)
+    if first is not None:
+        task['due_date'] = (today + timedelta(days=rng.randint(first, last))).strftime("%Y-%m-%d")
+
+    fewest, most, _ = _pick(rng, NOTE_COUNTS)
+    notes = [_sentence(rng, 3, 15) for _ in range(rng.randint(fewest, most))]
+    task['notes'] = '\n'.join(notes)
+
+    if rng.random() < COMPLETED_SHARE:
+        task['completed'] = True
+        completed_at = datetime.combine(today, datetime.min.time()) - timedelta(
+            minutes=rng.randint(0, COMPLETED_WITHIN_DAYS * 24 * 60))
+        task['completed_at'] = completed_at.isoformat()
+    return task
+
+def generate_tasks(count: int, seed: int = 0, today: Optional[date] = None) -> Dict[str, Dict]:
+    """
+    Generate a user's tasks, keyed like Firebase push IDs.
+
+    The same count and seed always give the same tasks (relative to today).
+
+    Args:
+        count: Number of tasks
+        seed: Random seed
+        today: Date that due dates are spread around (defaults to today)
+
+    Returns:
+        Mapping of task key to task data, in creation order
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    # Created over the last year, oldest first
+    start = datetime.combine(today, datetime.min.time()) - timedelta(days=365)
+    step = timedelta(days=365) / max(count, 1)
+    tasks = {}
+    for i in range(count):
+        created = start + step * i
+        key = push_key(int(created.timestamp() * 1000), rng)
+        tasks[key] = generate_task(rng, created, today)
+    return tasks
+
+def is_expired(task: Dict, now: datetime) -> bool:
+    """Whether the completed-task sweep removes this task (done 20 or more days ago)."""
+    completed_at = task.get('completed_at')
+    return bool(task.get('completed') and completed_at
+                and (now - datetime.fromisoformat(completed_at)).days >= 20)
+
+def describe(tasks: Dict[str, Dict], now: Optional[datetime] = None) -> Dict[str, int]:
+    """Counts that matter to the benchmarked paths, for the results file."""
+    now = now or datetime.now()
+    today_text = now.strftime("%Y-%m-%d")
+    week_text = (now + timedelta(days=7)).strftime("%Y-%m-%d")
+    active = [task for task in tasks.values() if not task['completed']]
+    return {
+        'tasks': len(tasks),
+        'active': len(active),
+        'completed': len(tasks) - len(active),
+        'completed_over_20_days': sum(1 for task in tasks.values() if is_expired(task, now)),
+        'notifications': sum(1 for task in active if task.get('due_date')
+                             and task['due_date'] <= week_text),
+        'overdue': sum(1 for task in active if task.get('due_date')
+                       and task['due_date'] < today_text),
+        'notes': sum(len(task['notes'].split('\n')) for task in tasks.values() if task['notes']),
+    }
@@ -0,0 +1,143 @@
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import threading
+import time
+
+class FakeResponse:
+    """What pyrebase returns from get(): val(), key() and each()."""
+
+    def __init__(self, value: Any, key: Optional[str] = None):
+        self._value = value
+        self._key = key
+
+    def val(self) -> Any:
+        return self._value
+
+    def key(self) -> Optional[str]:
+        return self._key
+
+    def each(self) -> Optional[List['FakeResponse']]:
+        if not isinstance(self._value, dict):
+            return None
+        return [FakeResponse(value, key) for key, value in self._value.items()]
+
+class FakeQuery:
+    """A path into the fake database, built with child() like pyrebase's."""
+
+    def __init__(self, database: 'FakeDatabase', path: Tuple[str, ...] = ()):
+        self._database = database
+        self._path = path
+
+    def child(self, *names: str) -> 'FakeQuery':
+        parts = []
+        for name in names:
+            parts.extend(part for part in str(name).split('/') if part)
+        return FakeQuery(self._database, self._path + tuple(parts))
+
+    def get(self, token: Optional[str] = None) -> FakeResponse:
+        value = self._database._request('get', self._path)
+        return FakeResponse(value, self._path[-1] if self._path else None)
+
+    def set(self, data: Any, token: Optional[str] = None) -> Any:
+        return self._database._request('set', self._path, data)
+
+    def update(self, data: Dict, token: Optional[str] = None) -> Dict:
+        return self._database._request('update', self._path, data)
+
+    def push(self, data: Any, token: Optional[str] = None) -> Dict:
+        return self._database._request('push', self._path, data)
+
+    def remove(self, token: Optional[str] = None) -> None:
+        return self._database._request('remove', self._path)
+
+class FakeDatabase:
+    """
+    In-process stand-in for the pyrebase database used by the benchmarks.
+
+    Data lives in nested dicts. Values are JSON-encoded on the way in and
+    decoded on the way out, as they would be over the REST API, so callers
+    get private copies and pay a realistic parsing cost. Requests are
+    counted per method and can be given a fixed latency.
+    """
+
+    def __init__(self, data: Optional[Dict] = None, latency: float = 0.0):
+        """
+        Args:
+            data: Initial contents (copied)
+            latency: Seconds each request sleeps, to stand in for the network
+        """
+        self.latency = latency
+        self.requests: Counter = Counter()
+        self._lock = threading.Lock()
+        self._root: Dict = {}
+        self._push_count = 0
+        self.load(data or {})
+
+    def load(self, data: Dict) -> None:
+        """Replace all contents and reset the request counts."""
+        with self._lock:
+            self._root = json.loads(json.dumps(data))
+            self.requests.clear()
+
+    def child(self, *names: str) -> FakeQuery:
+        return FakeQuery(self).child(*names)
+
+    def snapshot(self, *path: str) -> Any:
+        """Current value at a path, without counting a request."""
+        with self._lock:
+            return json.loads(json.dumps(self._node(tuple(path))))
+
+    def count(self, *path: str) -> int:
+        """Number of children at a path, without counting a request."""
+        with self._lock:
+            node = self._node(tuple(path))
+            return len(node) if isinstance(node, dict) else 0
+
+    def _node(self, path: Tuple[str, ...]) -> Any:
+        node = self._root
+        for name in path:
+            if not isinstance(node, dict) or name not in node:
+                return None
+            node = node[name]
+        return node
+
+    def _parent(self, path: Tuple[str, ...]) -> Dict:
+        node = self._root
+        for name in path[:-1]:
+            child = node.get(name)
+            if not isinstance(child, dict):
+                child = node[name] = {}
+            node = child
+        return node
+
+    def _request(self, method: str, path: Tuple[str, ...], data: Any = None) -> Any:
+        if self.latency:
+            time.sleep(self.latency)
+        encoded = json.dumps(data) if data is not None else None
+        with self._lock:
+            self.requests[method] += 1
+            if method == 'get':
+                return json.loads(json.dumps(self._node(path)))
+            if method == 'remove':
+                if path:
+                    self._parent(path).pop(path[-1], None)
+                else:
+                    self._root = {}
+                return None
+            if not path:
+                raise ValueError(f"Cannot {method} the database root")
+            value = json.loads(encoded)
+            if method == 'set':
+                self._parent(path)[path[-1]] = value
+                return value
+            if method == 'update':
+                node = self._parent(path).setdefault(path[-1], {})
+                node.update(value)
+                return value
+            if method == 'push':
+                self._push_count += 1
+                name = f"-bench{self._push_count:014d}"
+                self._parent(path).setdefault(path[-1], {})[name] = value
+                return {'name': name}
+            raise ValueError(f"Unknown method {method}")
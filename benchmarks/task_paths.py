@@ -0,0 +1,228 @@
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QItemSelection, QItemSelectionModel
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import time
+from benchmarks.datasets import is_expired
+from benchmarks.fake_db import FakeDatabase
+from rate_limiter import DEFAULT_BUDGETS, RateLimiter
+from request_scheduler import RequestScheduler
+from firebase_operations import RateLimitedFirebaseOperations
+
+USER_ID = 'bench-user'
+TOKEN = 'bench-token'
+# Budgets large enough that the limiter never defers, so timings show our own
+# cost rather than the production request rate
+UNLIMITED_BUDGETS = {name: (1e9, 1e9) for name in DEFAULT_BUDGETS}
+# Share of tasks edited between loads in the 'reload_changed' case
+CHANGED_SHARE = 0.01
+# Share of completed tasks selected in 'delete_selected_completed'
+SELECTED_SHARE = 0.10
+# TaskManager checks notifications this long after it is built
+INITIAL_CHECK_DELAY = 1.2
+
+class BenchSessionManager:
+    """Always signed in; tokens never expire."""
+
+    def load_session(self) -> Dict:
+        return {'user_id': USER_ID, 'idToken': TOKEN, 'email': 'bench@example.com'}
+
+    def get_current_token(self) -> str:
+        return TOKEN
+
+    def get_valid_token(self) -> str:
+        return TOKEN
+
+class BenchApp:
+    """The parts of ToDoListApp that TaskManager uses."""
+
+    def __init__(self):
+        self.session_manager = BenchSessionManager()
+
+def wait_until(condition: Callable[[], bool], timeout: float = 300.0) -> None:
+    """Process Qt events until condition() holds (background work delivers through them)."""
+    app = QApplication.instance()
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Benchmark step did not finish in time")
+        app.processEvents()
+        time.sleep(0.0002)
+
+class TaskPathBench:
+    """
+    A TaskManager wired to a FakeDatabase.
+
+    The module-level database and the confirmation dialogs in ui.main_ui are
+    swapped out while the bench is open; close() puts them back.
+    """
+
+    def __init__(self, database: FakeDatabase, show: bool = True):
+        """
+        Args:
+            database: Fake database holding tasks/<USER_ID>
+            show: Show the window, so timings include laying out visible rows
+        """
+        import ui.main_ui as main_ui
+        self.database = database
+        self.dialogs: List[str] = []
+        # Deletes the running case waits for, worked out during its setup
+        self.expected_removals = 0
+        self._main_ui = main_ui
+        self._saved = {name: getattr(main_ui, name)
+                       for name in ('db', 'show_question', 'show_success', 'show_error')}
+        main_ui.db = database
+        main_ui.show_question = lambda parent, title, message: "Yes"
+        main_ui.show_success = lambda parent, title, message: self.dialogs.append(f"success: {title}")
+        main_ui.show_error = lambda parent, title, message: self.dialogs.append(f"error: {title}")
+
+        self.manager = main_ui.TaskManager(BenchApp())
+        self.manager.firebase_ops = RateLimitedFirebaseOperations(
+            self.manager.app.session_manager,
+            limiter=RateLimiter(UNLIMITED_BUDGETS),
+            scheduler=RequestScheduler(),
+        )
+        # Set directly; set_user_id would also load the tasks
+        self.manager.user_id = USER_ID
+        if show:
+            self.manager.resize(1000, 700)
+            self.manager.show()
+        # Let the start-up notification check pass so it can't land in a timed run
+        deadline = time.perf_counter() + INITIAL_CHECK_DELAY
+        wait_until(lambda: time.perf_counter() > deadline)
+
+    def close(self) -> None:
+        self.manager.close()
+        self.manager.deleteLater()
+        for name, value in self._saved.items():
+            setattr(self._main_ui, name, value)
+        self.settle()
+
+    def settle(self) -> None:
+        """Let pending paints and deliveries run before the next step."""
+        app = QApplication.instance()
+        for _ in range(3):
+            app.processEvents()
+
+    def wait_for_removals(self, expected: int) -> None:
+        wait_until(lambda: self.database.requests['remove'] >= expected)
+
+class Case:
+    """One timed code path: setup (untimed), then run until its work is done."""
+
+    def __init__(self, name: str, description: str, run: Callable[[TaskPathBench, Dict], None],
+                 setup: Optional[Callable[[TaskPathBench, Dict], None]] = None):
+        self.name = name
+        self.description = description
+        self.run = run
+        self.setup = setup
+
+def _clear_tables(bench: TaskPathBench, tasks: Dict) -> None:
+    bench.database.load({'tasks': {USER_ID: tasks}})
+    bench.manager.task_model.clear()
+    bench.manager.completed_model.clear()
+    bench.settle()
+
+def _load(bench: TaskPathBench, tasks: Dict) -> None:
+    bench.manager.load_initial_tasks()
+    bench.settle()
+
+def _loaded(bench: TaskPathBench, tasks: Dict) -> None:
+    _clear_tables(bench, tasks)
+    _load(bench, tasks)
+    bench.database.requests.clear()
+
+def _loaded_then_edited(bench: TaskPathBench, tasks: Dict) -> None:
+    _loaded(bench, tasks)
+    keys = list(tasks)
+    step = max(1, int(1 / CHANGED_SHARE))
+    for key in keys[::step]:
+        bench.database.child('tasks', USER_ID, key).update({'task_name': tasks[key]['task_name'] + ' (edited)'})
+    bench.database.requests.clear()
+
+def _sort(bench: TaskPathBench, tasks: Dict) -> None:
+    proxy = bench.manager.task_proxy
+    proxy.set_sort_keys(proxy.sort_keys())
+    bench.settle()
+
+def _check_notifications(bench: TaskPathBench, tasks: Dict) -> None:
+    manager = bench.manager
+    manager.notifications = None
+    manager.check_notifications()
+    wait_until(lambda: manager.notifications is not None)
+
+def _loaded_with_completed(bench: TaskPathBench, tasks: Dict) -> None:
+    _loaded(bench, tasks)
+    bench.expected_removals = sum(1 for task in tasks.values() if task['completed'])
+
+def _clear_all_completed(bench: TaskPathBench, tasks: Dict) -> None:
+    bench.manager.clear_all_completed_tasks()
+    bench.wait_for_removals(bench.expected_removals)
+    bench.settle()
+
+def _select_completed(bench: TaskPathBench, tasks: Dict) -> None:
+    _loaded(bench, tasks)
+    table = bench.manager.completed_table
+    model = table.model()
+    count = int(model.rowCount() * SELECTED_SHARE)
+    if count:
+        selection = QItemSelection(model.index(0, 0), model.index(count - 1, model.columnCount() - 1))
+        table.selectionModel().select(selection, QItemSelectionModel.SelectionFlag.ClearAndSelect
+                                      | QItemSelectionModel.SelectionFlag.Rows)
+    bench.expected_removals = count
+
+def _delete_selected_completed(bench: TaskPathBench, tasks: Dict) -> None:
+    bench.manager.delete_selected_completed_tasks()
+    bench.wait_for_removals(bench.expected_removals)
+    bench.settle()
+
+def _with_expired(bench: TaskPathBench, tasks: Dict) -> None:
+    _clear_tables(bench, tasks)
+    now = datetime.now()
+    bench.expected_removals = sum(1 for task in tasks.values() if is_expired(task, now))
+
+def _sweep_old_completed(bench: TaskPathBench, tasks: Dict) -> None:
+    bench.manager.check_old_completed_tasks()
+    bench.wait_for_removals(bench.expected_removals)
+
+CASES: List[Case] = [
+    Case('load_initial_tasks', "First load into empty tables", _load, setup=_clear_tables),
+    Case('reload_unchanged', "Refresh with nothing changed", _load, setup=_loaded),
+    Case('reload_changed', f"Refresh after {CHANGED_SHARE:.0%} of tasks were edited",
+         _load, setup=_loaded_then_edited),
+    Case('sort', "Full re-sort of the active tasks", _sort, setup=_loaded),
+    Case('check_notifications', "Background fetch and notification scan", _check_notifications,
+         setup=_loaded),
+    Case('clear_all_completed', "Delete every completed task", _clear_all_completed,
+         setup=_loaded_with_completed),
+    Case('delete_selected_completed', f"Delete {SELECTED_SHARE:.0%} of completed tasks, selected",
+         _delete_selected_completed, setup=_select_completed),
+    Case('sweep_old_completed', "Background removal of tasks completed over 20 days ago",
+         _sweep_old_completed, setup=_with_expired),
+]
+
+def run_case(bench: TaskPathBench, case: Case, tasks: Dict, repeat: int) -> Dict:
+    """
+    Time a case several times, resetting the data before each run.
+
+    Returns:
+        Timings in milliseconds and the database requests of the last run
+    """
+    times = []
+    for _ in range(repeat):
+        # Setups reset the database themselves
+        if case.setup:
+            case.setup(bench, tasks)
+        else:
+            bench.database.load({'tasks': {USER_ID: tasks}})
+        bench.database.requests.clear()
+        started = time.perf_counter()
+        case.run(bench, tasks)
+        times.append((time.perf_counter() - started) * 1000)
+    ordered = sorted(times)
+    return {
+        'times_ms': [round(t, 3) for t in times],
+        'min_ms': round(ordered[0], 3),
+        'median_ms': round(ordered[len(ordered) // 2], 3),
+        'requests': dict(bench.database.requests),
+    }
@@ -0,0 +1,143 @@
+from typing import Any, Callable, Dict, Optional
+import threading
+import time
+import logging
+from service_errors import ServiceError, classify_error
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(ServiceError):
+    """Raised without touching the network while an endpoint's breaker is open."""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"{endpoint} is unavailable, retry in {retry_after:.0f}s",
+                         retry_after=retry_after)
+        self.endpoint = endpoint
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    CLOSED: calls pass through; consecutive transient failures are counted.
+    OPEN: calls fail fast until reset_timeout has elapsed.
+    HALF_OPEN: a limited number of probe calls decide whether to close again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5,
+                 reset_timeout: float = 30.0, half_open_max_calls: int = 1):
+        """
+        Initialize the breaker.
+
+        Args:
+            name: Endpoint name used in logs and errors
+            failure_threshold: Consecutive failures that trip the breaker
+            reset_timeout: Seconds to stay open before probing
+            half_open_max_calls: Concurrent probe calls allowed while half-open
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+            logger.info(f"Circuit '{self.name}' half-open, probing")
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker will allow a probe."""
+        with self._lock:
+            if self._current_state() != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        """Whether a call may go to the network now."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit '{self.name}' closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            state = self._current_state()
+            self._failures += 1
+            if state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                logger.warning(f"Circuit '{self.name}' opened after {self._failures} failure(s)")
+
+    def call(self, fn: Callable[..., Any], *args: Any,
+             fallback: Optional[Callable[[ServiceError], Any]] = None, **kwargs: Any) -> Any:
+        """
+        Run fn through the breaker.
+
+        Only transient errors (network, 5xx, 429) count as failures; auth and
+        client errors mean the service itself is answering.
+
+        Args:
+            fn: Callable making the outbound call
+            fallback: Called with the error instead of raising when the call is
+                rejected or fails transiently (e.g. serve cached data)
+
+        Raises:
+            CircuitOpenError: If the breaker is open and no fallback was given
+        """
+        if not self.allow_request():
+            error = CircuitOpenError(self.name, self.retry_after())
+            if fallback is not None:
+                return fallback(error)
+            raise error
+
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            error = classify_error(e)
+            if error.retryable:
+                self.record_failure()
+                if fallback is not None:
+                    return fallback(error)
+            else:
+                self.record_success()
+            raise
+
+        self.record_success()
+        return result
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    """Shared breaker for an endpoint ('firebase', 'auth', 'imgbb', ...)."""
+    with _breakers_lock:
+        if endpoint not in _breakers:
+            _breakers[endpoint] = CircuitBreaker(endpoint)
+        return _breakers[endpoint]
@@ -0,0 +1,82 @@
+# Local stand-ins for the Firebase services, for offline tests and benchmarks.
+#
+#   python -m devserver                              # empty database and no accounts
+#   python -m devserver --snapshot devdata.json      # keep data between runs
+#   python -m devserver --token-lifetime 120 --auth-latency-ms 300
+#
+# Then run the app against them with
+#   FIREBASE_DATABASE_EMULATOR_HOST=127.0.0.1:9000 \
+#   FIREBASE_AUTH_EMULATOR_HOST=127.0.0.1:9099 python run.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typing import List, Optional
+import argparse
+import json
+import logging
+import threading
+
+from devserver.auth import DEFAULT_SECRET, DEFAULT_TOKEN_LIFETIME, AuthServer, AuthService
+from devserver.rtdb import KEEPALIVE_INTERVAL, RealtimeDatabase, RTDBServer
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m devserver',
+                                     description="Serve local stand-ins for the Firebase services.")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to listen on")
+    parser.add_argument('--database-port', type=int, default=9000,
+                        help="Realtime Database port (default: %(default)s)")
+    parser.add_argument('--snapshot', help="JSON file to load the database from and save it to")
+    parser.add_argument('--seed', help="JSON file to load into the database at start; it reaches the "
+                             "snapshot only along with later writes")
+    parser.add_argument('--keepalive', type=float, default=KEEPALIVE_INTERVAL,
+                        help="Seconds between keep-alive events on idle streams")
+    parser.add_argument('--auth-port', type=int, default=9099,
+                        help="Identity Toolkit and securetoken port (default: %(default)s)")
+    parser.add_argument('--token-lifetime', type=float, default=DEFAULT_TOKEN_LIFETIME,
+                        help="Seconds an ID token stays valid (default: %(default)s)")
+    parser.add_argument('--auth-latency-ms', type=float, default=0.0,
+                        help="Delay before every auth response")
+    parser.add_argument('--auth-jitter-ms', type=float, default=0.0,
+                        help="Up to this much extra random delay per auth response")
+    parser.add_argument('--secret', default=DEFAULT_SECRET, help="Key test tokens are signed with")
+    parser.add_argument('--require-auth', action='store_true',
+                        help="Reject database requests without a valid, unexpired ID token")
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s %(name)s %(message)s')
+
+    service = AuthService(args.secret, args.token_lifetime,
+                          args.auth_latency_ms / 1000, args.auth_jitter_ms / 1000)
+    auth_server = AuthServer((args.host, args.auth_port), service)
+
+    database = RealtimeDatabase(args.snapshot)
+    if args.seed:
+        with open(args.seed, 'r', encoding='utf-8') as f:
+            database.load(json.load(f), persist=False)
+    database_server = RTDBServer((args.host, args.database_port), database, args.keepalive,
+                                 service.verify_id_token if args.require_auth else None)
+
+    print(f"Realtime Database: {database_server.url}")
+    print(f"Auth:              {auth_server.url}")
+    for name, server in (('FIREBASE_DATABASE_EMULATOR_HOST', database_server),
+                         ('FIREBASE_AUTH_EMULATOR_HOST', auth_server)):
+        host, port = server.server_address[:2]
+        print(f"  export {name}={host}:{port}")
+
+    threading.Thread(target=auth_server.serve_forever, name='auth-server', daemon=True).start()
+    try:
+        database_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        auth_server.shutdown()
+        auth_server.server_close()
+        database_server.server_close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
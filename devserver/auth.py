@@ -0,0 +1,359 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import random
+import re
+import secrets
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Lifetime of issued ID tokens, in seconds (the real service uses an hour)
+DEFAULT_TOKEN_LIFETIME = 3600
+# Key the test tokens are signed with; the database stand-in checks with the same one
+DEFAULT_SECRET = 'taskmaster-local-auth'
+PROJECT_ID = 'local'
+
+# Hosts the clients address; the stand-in accepts them as the first path segment
+_SERVICE_HOSTS = ('www.googleapis.com', 'identitytoolkit.googleapis.com', 'securetoken.googleapis.com')
+_EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+class AuthError(Exception):
+    """An error the real service reports with its message code (e.g. EMAIL_NOT_FOUND)."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+def encode_jwt(claims: Dict[str, Any], secret: str) -> str:
+    """Sign claims as an HS256 JSON Web Token."""
+    header = {'alg': 'HS256', 'typ': 'JWT', 'kid': 'local'}
+    signing_input = '.'.join(_b64encode(json.dumps(part, separators=(',', ':')).encode('utf-8'))
+                             for part in (header, claims))
+    signature = hmac.new(secret.encode('utf-8'), signing_input.encode('ascii'), hashlib.sha256).digest()
+    return f"{signing_input}.{_b64encode(signature)}"
+
+def decode_jwt(token: str, secret: str, now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Check an HS256 token's signature and expiry.
+
+    Returns:
+        The token's claims
+
+    Raises:
+        AuthError: INVALID_ID_TOKEN if malformed or badly signed, TOKEN_EXPIRED if expired
+    """
+    try:
+        signing_input, signature = token.rsplit('.', 1)
+        claims = json.loads(_b64decode(signing_input.split('.', 1)[1]))
+        expected = hmac.new(secret.encode('utf-8'), signing_input.encode('ascii'), hashlib.sha256).digest()
+        valid = hmac.compare_digest(expected, _b64decode(signature))
+    except (ValueError, IndexError, AttributeError):
+        raise AuthError('INVALID_ID_TOKEN')
+    if not valid:
+        raise AuthError('INVALID_ID_TOKEN')
+    if claims.get('exp', 0) <= (now if now is not None else time.time()):
+        raise AuthError('TOKEN_EXPIRED')
+    return claims
+
+class AuthService:
+    """
+    Accounts and tokens for the Identity Toolkit and securetoken stand-in.
+
+    ID tokens are HS256 JWTs with the claims Firebase puts in its own, signed
+    with a shared secret so other stand-ins can check them. Their lifetime and
+    the delay before every response are attributes that tests may change
+    while the server runs.
+    """
+
+    def __init__(self, secret: str = DEFAULT_SECRET, token_lifetime: float = DEFAULT_TOKEN_LIFETIME,
+                 latency: float = 0.0, jitter: float = 0.0):
+        """
+        Args:
+            secret: Key tokens are signed with
+            token_lifetime: Seconds an ID token stays valid
+            latency: Seconds every request waits before it is answered
+            jitter: Up to this many extra seconds, chosen at random per request
+        """
+        self.secret = secret
+        self.token_lifetime = token_lifetime
+        self.latency = latency
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._accounts: Dict[str, Dict[str, Any]] = {}
+        self._refresh_tokens: Dict[str, str] = {}
+        # Counts per endpoint, so tests can check how often a flow refreshes
+        self.calls: Dict[str, int] = {}
+
+    def delay(self) -> None:
+        wait = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if wait > 0:
+            time.sleep(wait)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    @staticmethod
+    def _hash_password(password: str, salt: str) -> str:
+        return hashlib.sha256(f"{salt}:{password}".encode('utf-8')).hexdigest()
+
+    def _id_token(self, account: Dict[str, Any]) -> str:
+        now = int(time.time())
+        claims = {
+            'iss': f"https://securetoken.google.com/{PROJECT_ID}",
+            'aud': PROJECT_ID,
+            'auth_time': now,
+            'user_id': account['localId'],
+            'sub': account['localId'],
+            'iat': now,
+            'exp': now + int(self.token_lifetime),
+            'firebase': {'identities': {}, 'sign_in_provider': 'password' if account.get('email') else 'anonymous'},
+        }
+        if account.get('email'):
+            claims['email'] = account['email']
+            claims['email_verified'] = False
+            claims['firebase']['identities'] = {'email': [account['email']]}
+        return encode_jwt(claims, self.secret)
+
+    def _issue(self, account: Dict[str, Any]) -> Dict[str, Any]:
+        """Fresh ID token and refresh token for an account, as sign-up and sign-in return them."""
+        refresh_token = secrets.token_urlsafe(32)
+        with self._lock:
+            self._refresh_tokens[refresh_token] = account['localId']
+        return {
+            'idToken': self._id_token(account),
+            'refreshToken': refresh_token,
+            'expiresIn': str(int(self.token_lifetime)),
+            'localId': account['localId'],
+        }
+
+    def sign_up(self, email: Optional[str], password: Optional[str]) -> Dict[str, Any]:
+        self._count('signUp')
+        if email is not None or password is not None:
+            if not email or not _EMAIL.match(email):
+                raise AuthError('INVALID_EMAIL')
+            if not password:
+                raise AuthError('MISSING_PASSWORD')
+            if len(password) < 6:
+                raise AuthError('WEAK_PASSWORD : Password should be at least 6 characters')
+        salt = secrets.token_hex(8)
+        account = {
+            'localId': secrets.token_urlsafe(21)[:28],
+            'email': email.lower() if email else None,
+            'salt': salt,
+            'passwordHash': self._hash_password(password, salt) if password else None,
+            'createdAt': str(int(time.time() * 1000)),
+        }
+        with self._lock:
+            if account['email'] and account['email'] in self._accounts:
+                raise AuthError('EMAIL_EXISTS')
+            self._accounts[account['email'] or f"anonymous:{account['localId']}"] = account
+        return {'kind': 'identitytoolkit#SignupNewUserResponse', 'email': email or '', **self._issue(account)}
+
+    def sign_in(self, email: Optional[str], password: Optional[str]) -> Dict[str, Any]:
+        self._count('signInWithPassword')
+        if not email or not _EMAIL.match(email):
+            raise AuthError('INVALID_EMAIL')
+        if not password:
+            raise AuthError('MISSING_PASSWORD')
+        with self._lock:
+            account = self._accounts.get(email.lower())
+        if account is None:
+            raise AuthError('EMAIL_NOT_FOUND')
+        if account['passwordHash'] != self._hash_password(password, account['salt']):
+            raise AuthError('INVALID_PASSWORD')
+        return {'kind': 'identitytoolkit#VerifyPasswordResponse', 'email': account['email'],
+                'displayName': '', 'registered': True, **self._issue(account)}
+
+    def refresh(self, refresh_token: Optional[str]) -> Dict[str, Any]:
+        self._count('token')
+        if not refresh_token:
+            raise AuthError('MISSING_REFRESH_TOKEN')
+        with self._lock:
+            local_id = self._refresh_tokens.get(refresh_token)
+            account = self._find(local_id) if local_id else None
+        if local_id is None:
+            raise AuthError('INVALID_REFRESH_TOKEN')
+        if account is None:
+            raise AuthError('USER_NOT_FOUND')
+        id_token = self._id_token(account)
+        # Refresh tokens stay valid until revoked, like the real ones
+        return {
+            'access_token': id_token,
+            'expires_in': str(int(self.token_lifetime)),
+            'token_type': 'Bearer',
+            'refresh_token': refresh_token,
+            'id_token': id_token,
+            'user_id': account['localId'],
+            'project_id': PROJECT_ID,
+        }
+
+    def verify_id_token(self, token: str) -> Dict[str, Any]:
+        """Claims of a valid ID token; raises AuthError otherwise."""
+        claims = decode_jwt(token, self.secret)
+        with self._lock:
+            if self._find(claims.get('user_id')) is None:
+                raise AuthError('USER_NOT_FOUND')
+        return claims
+
+    def lookup(self, id_token: Optional[str]) -> Dict[str, Any]:
+        self._count('lookup')
+        claims = self.verify_id_token(id_token or '')
+        with self._lock:
+            account = self._find(claims['user_id'])
+        return {'kind': 'identitytoolkit#GetAccountInfoResponse', 'users': [{
+            'localId': account['localId'],
+            'email': account['email'] or '',
+            'emailVerified': False,
+            'passwordHash': 'UkVEQUNURUQ=',
+            'createdAt': account['createdAt'],
+        }]}
+
+    def send_oob_code(self, request_type: Optional[str], email: Optional[str]) -> Dict[str, Any]:
+        self._count('sendOobCode')
+        if request_type == 'PASSWORD_RESET':
+            with self._lock:
+                if not email or email.lower() not in self._accounts:
+                    raise AuthError('EMAIL_NOT_FOUND')
+        return {'kind': 'identitytoolkit#GetOobConfirmationCodeResponse', 'email': email or ''}
+
+    def delete(self, id_token: Optional[str]) -> Dict[str, Any]:
+        self._count('delete')
+        claims = self.verify_id_token(id_token or '')
+        self.revoke(claims['user_id'], delete=True)
+        return {'kind': 'identitytoolkit#DeleteAccountResponse'}
+
+    def revoke(self, local_id: str, delete: bool = False) -> None:
+        """Invalidate a user's refresh tokens (and optionally the account itself)."""
+        with self._lock:
+            self._refresh_tokens = {token: owner for token, owner in self._refresh_tokens.items()
+                                    if owner != local_id}
+            if delete:
+                self._accounts = {key: account for key, account in self._accounts.items()
+                                  if account['localId'] != local_id}
+
+    def _find(self, local_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        # Called with the lock held
+        for account in self._accounts.values():
+            if account['localId'] == local_id:
+                return account
+        return None
+
+# Endpoint name (last path segment) to the service call that answers it; v3
+# relyingparty names and v1 accounts: names both appear in pyrebase
+_ROUTES = {
+    'verifyPassword': lambda s, b: s.sign_in(b.get('email'), b.get('password')),
+    'accounts:signInWithPassword': lambda s, b: s.sign_in(b.get('email'), b.get('password')),
+    'signupNewUser': lambda s, b: s.sign_up(b.get('email'), b.get('password')),
+    'accounts:signUp': lambda s, b: s.sign_up(b.get('email'), b.get('password')),
+    'getAccountInfo': lambda s, b: s.lookup(b.get('idToken')),
+    'accounts:lookup': lambda s, b: s.lookup(b.get('idToken')),
+    'getOobConfirmationCode': lambda s, b: s.send_oob_code(b.get('requestType'), b.get('email')),
+    'accounts:sendOobCode': lambda s, b: s.send_oob_code(b.get('requestType'), b.get('email')),
+    'deleteAccount': lambda s, b: s.delete(b.get('idToken')),
+    'accounts:delete': lambda s, b: s.delete(b.get('idToken')),
+    'token': lambda s, b: s.refresh(b.get('refreshToken') or b.get('refresh_token')),
+}
+
+class AuthRequestHandler(BaseHTTPRequestHandler):
+    """JSON (or form-encoded) POSTs to the Identity Toolkit and securetoken endpoints."""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'TaskMasterAuth/1.0'
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _route(self) -> Optional[str]:
+        parts = [part for part in urlsplit(self.path).path.split('/') if part]
+        if parts and parts[0] in _SERVICE_HOSTS:
+            parts = parts[1:]
+        return parts[-1] if parts else None
+
+    def _read_body(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length).decode('utf-8') if length else ''
+        if not raw:
+            return {}
+        if 'application/x-www-form-urlencoded' in self.headers.get('Content-Type', ''):
+            return {name: values[-1] for name, values in parse_qs(raw).items()}
+        return json.loads(raw)
+
+    def _send_json(self, status: int, value: Any) -> None:
+        body = json.dumps(value).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, error: AuthError) -> None:
+        self._send_json(error.status, {'error': {
+            'code': error.status,
+            'message': error.message,
+            'errors': [{'message': error.message, 'domain': 'global', 'reason': 'invalid'}],
+        }})
+
+    def do_POST(self):
+        service: AuthService = self.server.service
+        try:
+            body = self._read_body()
+        except ValueError:
+            self._send_error(AuthError('INVALID_JSON'))
+            return
+        service.delay()
+        handler = _ROUTES.get(self._route())
+        if handler is None:
+            self._send_error(AuthError('NOT_FOUND', 404))
+            return
+        try:
+            self._send_json(200, handler(service, body))
+        except AuthError as e:
+            self._send_error(e)
+
+class AuthServer(ThreadingHTTPServer):
+    """Threaded HTTP server around one AuthService."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: Optional[AuthService] = None):
+        """
+        Args:
+            address: (host, port); port 0 picks a free one
+            service: Accounts and token settings (a new default one if omitted)
+        """
+        super().__init__(address, AuthRequestHandler)
+        self.service = service or AuthService()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+def start_in_thread(host: str = '127.0.0.1', port: int = 0,
+                    service: Optional[AuthService] = None) -> AuthServer:
+    """
+    Serve the auth endpoints from a background thread, for tests and benchmarks.
+
+    Returns:
+        The running server; point FIREBASE_AUTH_EMULATOR_HOST at its address.
+        Stop it with shutdown() then server_close().
+    """
+    server = AuthServer((host, port), service)
+    thread = threading.Thread(target=server.serve_forever, name='auth-server', daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,539 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+import base64
+import hashlib
+import json
+import logging
+import queue
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Seconds between keep-alive events on idle streams, as the real service sends
+KEEPALIVE_INTERVAL = 30.0
+# Snapshot writes are coalesced over this many seconds
+SNAPSHOT_DELAY = 1.0
+
+_PUSH_CHARS = '-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz'
+
+# A database path as its segments, e.g. ('tasks', '<user id>')
+Location = Tuple[str, ...]
+
+class QueryError(ValueError):
+    """A request the real service would reject with 400 Bad Request."""
+
+def split_path(path: str) -> Location:
+    return tuple(part for part in unquote(path).split('/') if part)
+
+def _normalize(value: Any, now_ms: int) -> Any:
+    """Value as stored: arrays become objects, nulls and empty objects vanish, server values resolve."""
+    if isinstance(value, list):
+        value = {str(i): item for i, item in enumerate(value)}
+    if isinstance(value, dict):
+        if value.get('.sv') == 'timestamp' and len(value) == 1:
+            return now_ms
+        children = {}
+        for key, child in value.items():
+            child = _normalize(child, now_ms)
+            if child is not None:
+                children[str(key)] = child
+        return children or None
+    return value
+
+def _render(value: Any) -> Any:
+    """Value as returned: objects with mostly consecutive integer keys come back as arrays."""
+    if not isinstance(value, dict):
+        return value
+    rendered = {key: _render(child) for key, child in value.items()}
+    if rendered and all(key.isdigit() and (key == '0' or not key.startswith('0')) for key in rendered):
+        indexes = [int(key) for key in rendered]
+        if max(indexes) < 2 * len(indexes):
+            array = [None] * (max(indexes) + 1)
+            for index, child in zip(indexes, rendered.values()):
+                array[index] = child
+            return array
+    return rendered
+
+def compute_etag(value: Any) -> str:
+    if value is None:
+        return 'null_etag'
+    canonical = json.dumps(value, sort_keys=True, separators=(',', ':'))
+    return base64.b64encode(hashlib.sha1(canonical.encode('utf-8')).digest()).decode('ascii')
+
+def _type_rank(value: Any) -> Tuple:
+    """Firebase ordering: null, false, true, numbers, strings, then objects."""
+    if value is None:
+        return (0,)
+    if value is False:
+        return (1,)
+    if value is True:
+        return (2,)
+    if isinstance(value, (int, float)):
+        return (3, value)
+    if isinstance(value, str):
+        return (4, value)
+    return (5,)
+
+def _key_rank(key: str) -> Tuple:
+    """Keys that are 32-bit integers sort first, numerically; the rest as strings."""
+    try:
+        number = int(key)
+        if -2 ** 31 <= number < 2 ** 31 and str(number) == key:
+            return (0, number)
+    except ValueError:
+        pass
+    return (1, key)
+
+def _json_param(params: Dict[str, str], name: str) -> Any:
+    try:
+        return json.loads(params[name])
+    except ValueError:
+        raise QueryError(f"{name} must be a valid JSON value")
+
+def apply_query(value: Any, params: Dict[str, str]) -> Any:
+    """
+    Filter a value the way a REST GET with query parameters would.
+
+    Args:
+        value: Stored value at the requested path
+        params: Query string parameters (orderBy, limitToFirst, shallow...)
+
+    Returns:
+        The value to send back
+
+    Raises:
+        QueryError: For parameter combinations the service rejects
+    """
+    filters = [name for name in ('startAt', 'endAt', 'equalTo', 'limitToFirst', 'limitToLast')
+               if name in params]
+    shallow = params.get('shallow') == 'true'
+    if 'orderBy' not in params:
+        if filters:
+            raise QueryError("orderBy must be defined when other query parameters are defined")
+        if shallow and isinstance(value, dict):
+            return {key: True for key in value}
+        return value
+    if shallow:
+        raise QueryError("Mixing shallow and orderBy is not supported")
+    if 'limitToFirst' in params and 'limitToLast' in params:
+        raise QueryError("Only one of limitToFirst and limitToLast may be set")
+    if not isinstance(value, dict):
+        return value
+
+    order_by = _json_param(params, 'orderBy')
+    if not isinstance(order_by, str):
+        raise QueryError("orderBy must be a string")
+    if order_by == '$key':
+        rank = lambda key, child: _key_rank(key)
+        bound = lambda bound_value: _key_rank(str(bound_value))
+    else:
+        if order_by == '$value':
+            pick = lambda child: child
+        elif order_by == '$priority':
+            # Priorities are not stored, so every child ties
+            pick = lambda child: None
+        else:
+            child_path = split_path(order_by)
+            pick = lambda child: _lookup(child, child_path)
+        rank = lambda key, child: (_type_rank(pick(child)), _key_rank(key))
+        bound = lambda bound_value: (_type_rank(bound_value),)
+
+    items = sorted(value.items(), key=lambda item: rank(*item))
+    if 'startAt' in params:
+        low = bound(_json_param(params, 'startAt'))
+        items = [item for item in items if rank(*item)[:len(low)] >= low]
+    if 'endAt' in params:
+        high = bound(_json_param(params, 'endAt'))
+        items = [item for item in items if rank(*item)[:len(high)] <= high]
+    if 'equalTo' in params:
+        exact = bound(_json_param(params, 'equalTo'))
+        items = [item for item in items if rank(*item)[:len(exact)] == exact]
+    if 'limitToFirst' in params:
+        items = items[:_limit(params, 'limitToFirst')]
+    if 'limitToLast' in params:
+        count = _limit(params, 'limitToLast')
+        items = items[-count:] if count else []
+    return dict(items)
+
+def _limit(params: Dict[str, str], name: str) -> int:
+    limit = _json_param(params, name)
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit < 0:
+        raise QueryError(f"{name} must be a non-negative integer")
+    return limit
+
+def _lookup(node: Any, path: Location) -> Any:
+    for name in path:
+        if not isinstance(node, dict) or name not in node:
+            return None
+        node = node[name]
+    return node
+
+class RealtimeDatabase:
+    """
+    In-memory data tree with the write semantics of the Realtime Database.
+
+    Writing null or an empty object deletes, parents left empty disappear,
+    and every change is published to the streams listening above or below it.
+    With a snapshot file the tree is loaded from it on start and written back
+    shortly after changes, so data survives restarts.
+    """
+
+    def __init__(self, snapshot: Optional[str] = None):
+        """
+        Args:
+            snapshot: JSON file to load from and save to (optional)
+        """
+        self._lock = threading.RLock()
+        self._root: Any = None
+        self._listeners: List[Tuple[Location, queue.Queue]] = []
+        self._snapshot = Path(snapshot) if snapshot else None
+        self._save_timer: Optional[threading.Timer] = None
+        self._last_push = (0, [0] * 12)
+        if self._snapshot and self._snapshot.exists():
+            with open(self._snapshot, 'r', encoding='utf-8') as f:
+                self._root = _normalize(json.load(f), self._now_ms())
+            logger.info(f"Loaded database snapshot from {self._snapshot}")
+
+    @staticmethod
+    def _now_ms() -> int:
+        return int(time.time() * 1000)
+
+    def get(self, path: Location) -> Any:
+        with self._lock:
+            return _lookup(self._root, path)
+
+    def etag(self, path: Location) -> str:
+        with self._lock:
+            return compute_etag(_lookup(self._root, path))
+
+    def set(self, path: Location, value: Any, if_match: Optional[str] = None) -> Tuple[bool, Any]:
+        """
+        Replace the value at path.
+
+        Returns:
+            (True, new value), or (False, current value) when if_match is stale
+        """
+        with self._lock:
+            if if_match is not None and compute_etag(_lookup(self._root, path)) != if_match:
+                return False, _lookup(self._root, path)
+            value = _normalize(value, self._now_ms())
+            self._root = self._replaced(self._root, path, value)
+            self._publish('put', path, value)
+            return True, value
+
+    def update(self, path: Location, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Multi-location update; keys may be slash-separated paths below path."""
+        with self._lock:
+            now_ms = self._now_ms()
+            normalized = {}
+            for key, value in changes.items():
+                child = split_path(key)
+                if not child:
+                    raise QueryError("Update keys must not be empty")
+                normalized['/'.join(child)] = _normalize(value, now_ms)
+            for key, value in normalized.items():
+                self._root = self._replaced(self._root, path + split_path(key), value)
+            self._publish('patch', path, normalized)
+            return changes
+
+    def push(self, path: Location, value: Any) -> str:
+        with self._lock:
+            name = self._push_id()
+            self.set(path + (name,), value)
+            return name
+
+    def load(self, data: Any, persist: bool = True) -> None:
+        """
+        Replace the whole tree (e.g. test fixtures) and tell every stream.
+
+        Args:
+            data: New contents of the database
+            persist: Whether the change is written to the snapshot; seed data
+                loaded with False is saved only along with a later write
+        """
+        with self._lock:
+            value = _normalize(data, self._now_ms())
+            self._root = value
+            self._publish('put', (), value, persist)
+
+    def _push_id(self) -> str:
+        """Chronological push ID: 8 time characters, 12 random ones bumped within the same millisecond."""
+        now_ms = self._now_ms()
+        last_ms, tail = self._last_push
+        if now_ms == last_ms:
+            tail = list(tail)
+            for i in range(11, -1, -1):
+                if tail[i] < 63:
+                    tail[i] += 1
+                    break
+                tail[i] = 0
+        else:
+            tail = [random.randrange(64) for _ in range(12)]
+        self._last_push = (now_ms, tail)
+        head = []
+        for _ in range(8):
+            head.append(_PUSH_CHARS[now_ms % 64])
+            now_ms //= 64
+        return ''.join(reversed(head)) + ''.join(_PUSH_CHARS[i] for i in tail)
+
+    def _replaced(self, node: Any, path: Location, value: Any) -> Any:
+        """Copy of node with value at path, pruning objects left empty."""
+        if not path:
+            return value
+        children = dict(node) if isinstance(node, dict) else {}
+        child = self._replaced(children.get(path[0]), path[1:], value)
+        if child is None:
+            children.pop(path[0], None)
+        else:
+            children[path[0]] = child
+        return children or None
+
+    def subscribe(self, path: Location) -> queue.Queue:
+        """Queue receiving (event, relative path, data) for changes at or around path."""
+        events: queue.Queue = queue.Queue()
+        with self._lock:
+            self._listeners.append((path, events))
+        return events
+
+    def unsubscribe(self, events: queue.Queue) -> None:
+        with self._lock:
+            self._listeners = [(path, q) for path, q in self._listeners if q is not events]
+
+    def close(self) -> None:
+        """End every open stream and write any pending snapshot."""
+        with self._lock:
+            for _, events in self._listeners:
+                events.put(None)
+            self._listeners = []
+            pending = self._save_timer is not None
+            if pending:
+                self._save_timer.cancel()
+                self._save_timer = None
+        if pending:
+            self.save()
+
+    def save(self) -> None:
+        if not self._snapshot:
+            return
+        # Imported here so the server does not depend on the app unless saving
+        from utils import atomic_write_bytes
+        with self._lock:
+            self._save_timer = None
+            data = json.dumps(self._root, ensure_ascii=False, indent=2).encode('utf-8')
+        self._snapshot.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(self._snapshot, data)
+
+    def _publish(self, event: str, path: Location, data: Any, persist: bool = True) -> None:
+        # Called with the lock held
+        for listen_path, events in self._listeners:
+            if path[:len(listen_path)] == listen_path:
+                relative = '/' + '/'.join(path[len(listen_path):])
+                events.put((event, relative, data))
+            elif listen_path[:len(path)] == path:
+                # A write above the listener replaces what it sees outright
+                events.put(('put', '/', _lookup(self._root, listen_path)))
+        if persist and self._snapshot and self._save_timer is None:
+            self._save_timer = threading.Timer(SNAPSHOT_DELAY, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+class RTDBRequestHandler(BaseHTTPRequestHandler):
+    """The REST protocol: <path>.json with JSON bodies and query-string options."""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'TaskMasterRTDB/1.0'
+
+    @property
+    def database(self) -> RealtimeDatabase:
+        return self.server.database
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _target(self) -> Tuple[Optional[Location], Dict[str, str]]:
+        url = urlsplit(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        if not url.path.endswith('.json'):
+            return None, params
+        return split_path(url.path[:-len('.json')]), params
+
+    def _send_json(self, status: int, value: Any, etag: Optional[str] = None) -> None:
+        body = json.dumps(_render(value), ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-cache')
+        if etag is not None:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str) -> None:
+        self._send_json(status, {'error': message})
+
+    def _read_body(self) -> Any:
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        if not raw:
+            return None
+        return json.loads(raw.decode('utf-8'))
+
+    def _handle(self, method: str) -> None:
+        path, params = self._target()
+        if path is None:
+            self._send_error(404, "Not found: paths must end in .json")
+            return
+        try:
+            body = self._read_body()
+        except ValueError:
+            self._send_error(400, "Invalid data; couldn't parse JSON object, array, or value.")
+            return
+        if not self._authorized(params):
+            return
+        wants_etag = self.headers.get('X-Firebase-ETag', '').lower() == 'true'
+        if_match = self.headers.get('if-match')
+        try:
+            if method == 'GET':
+                if 'text/event-stream' in self.headers.get('Accept', ''):
+                    self._stream(path)
+                    return
+                value = apply_query(self.database.get(path), params)
+                self._respond(params, 200, value, self.database.etag(path) if wants_etag else None)
+            elif method in ('PUT', 'DELETE'):
+                ok, value = self.database.set(path, body if method == 'PUT' else None, if_match)
+                if not ok:
+                    self._send_json(412, value, compute_etag(value))
+                    return
+                self._respond(params, 200, value, compute_etag(value) if wants_etag else None)
+            elif method == 'PATCH':
+                if not isinstance(body, dict):
+                    raise QueryError("Invalid data; couldn't parse JSON object.")
+                self._respond(params, 200, self.database.update(path, body))
+            elif method == 'POST':
+                self._respond(params, 200, {'name': self.database.push(path, body)})
+        except QueryError as e:
+            self._send_error(400, str(e))
+
+    def _authorized(self, params: Dict[str, str]) -> bool:
+        """With a token verifier set, every request needs a valid ?auth= token."""
+        verifier = self.server.token_verifier
+        if verifier is None:
+            return True
+        token = params.get('auth')
+        if not token:
+            self._send_error(401, "Permission denied")
+            return False
+        try:
+            verifier(token)
+        except Exception as e:
+            expired = getattr(e, 'message', str(e)) == 'TOKEN_EXPIRED'
+            self._send_error(401, "Auth token is expired" if expired else "Could not parse auth token.")
+            return False
+        return True
+
+    def _respond(self, params: Dict[str, str], status: int, value: Any,
+                 etag: Optional[str] = None) -> None:
+        if params.get('print') == 'silent':
+            self.send_response(204)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self._send_json(status, value, etag)
+
+    def _stream(self, path: Location) -> None:
+        """Server-sent events: the current value, then every change until the client leaves."""
+        events = self.database.subscribe(path)
+        self.close_connection = True
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            self._write_event('put', {'path': '/', 'data': _render(self.database.get(path))})
+            while True:
+                try:
+                    event = events.get(timeout=self.server.keepalive_interval)
+                except queue.Empty:
+                    self._write_raw('keep-alive', 'null')
+                    continue
+                if event is None:
+                    break
+                name, relative, data = event
+                self._write_event(name, {'path': relative, 'data': _render(data)})
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+        finally:
+            self.database.unsubscribe(events)
+
+    def _write_event(self, name: str, payload: Dict) -> None:
+        self._write_raw(name, json.dumps(payload, ensure_ascii=False))
+
+    def _write_raw(self, name: str, data: str) -> None:
+        self.wfile.write(f"event: {name}\ndata: {data}\n\n".encode('utf-8'))
+        self.wfile.flush()
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_POST(self):
+        # Some clients can only send POST; the override header picks the real method
+        override = self.headers.get('X-HTTP-Method-Override', '').upper()
+        self._handle(override if override in ('PUT', 'PATCH', 'DELETE') else 'POST')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+class RTDBServer(ThreadingHTTPServer):
+    """Threaded HTTP server around one RealtimeDatabase."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], database: Optional[RealtimeDatabase] = None,
+                 keepalive_interval: float = KEEPALIVE_INTERVAL,
+                 token_verifier: Optional[Callable[[str], Any]] = None):
+        """
+        Args:
+            address: (host, port); port 0 picks a free one
+            database: Data to serve (a new empty one by default)
+            keepalive_interval: Seconds between keep-alive events on idle streams
+            token_verifier: Checks the ?auth= ID token, raising if it is not valid
+                (e.g. AuthService.verify_id_token); by default tokens are not checked
+        """
+        super().__init__(address, RTDBRequestHandler)
+        self.database = database or RealtimeDatabase()
+        self.keepalive_interval = keepalive_interval
+        self.token_verifier = token_verifier
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def server_close(self):
+        self.database.close()
+        super().server_close()
+
+def start_in_thread(host: str = '127.0.0.1', port: int = 0, snapshot: Optional[str] = None,
+                    token_verifier: Optional[Callable[[str], Any]] = None) -> RTDBServer:
+    """
+    Serve a database from a background thread, for tests and benchmarks.
+
+    Returns:
+        The running server; its url goes in databaseURL. Stop it with
+        shutdown() then server_close().
+    """
+    server = RTDBServer((host, port), RealtimeDatabase(snapshot), token_verifier=token_verifier)
+    thread = threading.Thread(target=server.serve_forever, name='rtdb-server', daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,329 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from collections import Counter
+import io
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import logging
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Profile name, path to a profile JSON file, or the profile JSON itself
+FAULTS_ENV = 'TASKMASTER_FAULTS'
+
+# Ready-made profiles for TASKMASTER_FAULTS=<name>
+BUILTIN_PROFILES: Dict[str, Dict] = {
+    # Congested shared Wi-Fi: long-tailed latency, resets, the odd gateway error
+    'hotel-wifi': {
+        'rules': [{
+            'latency': {'distribution': 'lognormal', 'median_ms': 400, 'sigma': 0.9, 'max_ms': 20000},
+            'errors': {'502': 0.02, '503': 0.03},
+            'drop': 0.05,
+            'drop_response': 0.02,
+            'slow_body': {'probability': 0.2, 'bytes_per_second': 4096},
+        }],
+    },
+    # Servers under load: throttling and 5xx, with a normal network
+    'flaky': {
+        'rules': [{
+            'latency': {'distribution': 'exponential', 'mean_ms': 150},
+            'errors': {'429': 0.05, '500': 0.05, '503': 0.10},
+            'retry_after': 2,
+        }],
+    },
+    # Every request is slow, none fail
+    'slow': {
+        'rules': [{'latency': {'distribution': 'normal', 'mean_ms': 2000, 'stddev_ms': 500}}],
+    },
+    # No connection at all
+    'offline': {
+        'rules': [{'drop': 1.0}],
+    },
+}
+
+_REASONS = {429: 'Too Many Requests', 500: 'Internal Server Error', 502: 'Bad Gateway',
+            503: 'Service Unavailable', 504: 'Gateway Timeout'}
+
+Timeout = Union[None, float, Tuple[Optional[float], Optional[float]]]
+
+class LatencyDistribution:
+    """Delay added before a request is sent, drawn per request."""
+
+    KINDS = ('fixed', 'uniform', 'normal', 'lognormal', 'exponential')
+
+    def __init__(self, spec: Dict[str, Any]):
+        """
+        Args:
+            spec: {'distribution': one of KINDS, plus its parameters in
+                milliseconds: ms (fixed), min_ms/max_ms (uniform),
+                mean_ms/stddev_ms (normal), median_ms/sigma (lognormal) or
+                mean_ms (exponential); max_ms caps any of them}
+
+        Raises:
+            ValueError: Unknown distribution or missing parameter
+        """
+        self.kind = spec.get('distribution', 'fixed')
+        if self.kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution '{self.kind}'")
+        self.spec = spec
+        try:
+            self.sample(random.Random(0))
+        except KeyError as e:
+            raise ValueError(f"Latency distribution '{self.kind}' needs {e.args[0]}")
+
+    def sample(self, rng: random.Random) -> float:
+        """A delay in seconds."""
+        spec = self.spec
+        if self.kind == 'fixed':
+            ms = spec['ms']
+        elif self.kind == 'uniform':
+            ms = rng.uniform(spec.get('min_ms', 0), spec['max_ms'])
+        elif self.kind == 'normal':
+            ms = rng.gauss(spec['mean_ms'], spec.get('stddev_ms', 0))
+        elif self.kind == 'lognormal':
+            ms = rng.lognormvariate(math.log(spec['median_ms']), spec.get('sigma', 0.5))
+        else:
+            ms = rng.expovariate(1 / spec['mean_ms'])
+        if 'max_ms' in spec and self.kind != 'uniform':
+            ms = min(ms, spec['max_ms'])
+        return max(0.0, ms) / 1000
+
+class FaultRule:
+    """Faults for the requests whose URL (and method) match."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        """
+        Args:
+            spec: Rule from a profile; see BUILTIN_PROFILES for examples.
+                url: regex searched in the request URL (default: every URL)
+                methods: HTTP methods to match (default: all)
+                latency: LatencyDistribution spec
+                errors: {status code: probability} of answering with that error
+                retry_after: Retry-After seconds sent with injected 429/503s
+                drop: probability the connection fails before the request is sent
+                drop_response: probability it fails after the server handled it
+                slow_body: {probability, bytes_per_second} for drip-fed bodies
+
+        Raises:
+            ValueError: If the rule is malformed
+        """
+        self.url = re.compile(spec['url']) if spec.get('url') else None
+        self.methods = {method.upper() for method in spec.get('methods', [])}
+        self.latency = LatencyDistribution(spec['latency']) if spec.get('latency') else None
+        self.errors = [(int(status), float(p)) for status, p in spec.get('errors', {}).items()]
+        self.retry_after = spec.get('retry_after')
+        self.drop = float(spec.get('drop', 0))
+        self.drop_response = float(spec.get('drop_response', 0))
+        slow_body = spec.get('slow_body') or {}
+        self.slow_body = float(slow_body.get('probability', 0))
+        self.bytes_per_second = float(slow_body.get('bytes_per_second', 8192))
+        if sum(p for _, p in self.errors) + self.drop > 1:
+            raise ValueError("Error and drop probabilities of a rule add up to more than 1")
+        if self.bytes_per_second <= 0:
+            raise ValueError("slow_body bytes_per_second must be positive")
+
+    def matches(self, request: requests.PreparedRequest) -> bool:
+        if self.methods and request.method.upper() not in self.methods:
+            return False
+        return self.url is None or bool(self.url.search(request.url))
+
+class _DripReader:
+    """
+    Response body that arrives at a fixed byte rate.
+    
+    Wraps urllib3's raw response; the bytes are throttled after decoding, so
+    gzip or deflate bodies still reach requests decompressed.
+    """
+
+    def __init__(self, raw, bytes_per_second: float):
+        self._raw = raw
+        self._bytes_per_second = bytes_per_second
+
+    def _wait(self, data: bytes) -> None:
+        if data:
+            time.sleep(len(data) / self._bytes_per_second)
+
+    def stream(self, amt=2 ** 16, decode_content=True):
+        for chunk in self._raw.stream(amt, decode_content=decode_content):
+            self._wait(chunk)
+            yield chunk
+
+    def read(self, amt=None, decode_content=True, **kwargs):
+        data = self._raw.read(amt, decode_content=decode_content, **kwargs)
+        self._wait(data)
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+class FaultInjector:
+    """
+    Applies a fault profile to outbound HTTP requests.
+
+    http_client's adapters hand every request to send(); the first rule whose
+    url and methods match decides what goes wrong with it. Counts of the
+    injected faults are kept in `injected` for tests and logs.
+    """
+
+    def __init__(self, profile: Dict[str, Any], name: str = 'custom'):
+        """
+        Args:
+            profile: {'rules': [rule, ...], 'seed': optional int}
+            name: Shown in logs
+
+        Raises:
+            ValueError: If the profile is malformed
+        """
+        self.name = name
+        self.rules: List[FaultRule] = [FaultRule(rule) for rule in profile.get('rules', [])]
+        self.injected: Counter = Counter()
+        self._rng = random.Random(profile.get('seed'))
+        self._lock = threading.Lock()
+
+    def _random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def _rule_for(self, request: requests.PreparedRequest) -> Optional[FaultRule]:
+        for rule in self.rules:
+            if rule.matches(request):
+                return rule
+        return None
+
+    def _count(self, fault: str, request: requests.PreparedRequest) -> None:
+        with self._lock:
+            self.injected[fault] += 1
+        logger.debug(f"Injected {fault} into {request.method} {request.url}")
+
+    def send(self, request: requests.PreparedRequest, timeout: Timeout,
+             send: Callable[[], requests.Response]) -> requests.Response:
+        """
+        Send a request through the faults of its rule.
+
+        Args:
+            request: Request about to go out
+            timeout: Timeout the adapter is using, so injected delays time out alike
+            send: Sends the request for real
+
+        Returns:
+            The real response, a delayed or drip-fed one, or an injected error
+        """
+        rule = self._rule_for(request)
+        if rule is None:
+            return send()
+
+        if rule.latency:
+            delay = self._sample(rule.latency)
+            read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+            if read_timeout is not None and delay >= read_timeout:
+                time.sleep(read_timeout)
+                self._count('timeout', request)
+                raise requests.exceptions.ReadTimeout(f"Read timed out (injected, {read_timeout}s)",
+                                                      request=request)
+            if delay:
+                time.sleep(delay)
+
+        roll = self._random()
+        if roll < rule.drop:
+            self._count('drop', request)
+            raise requests.exceptions.ConnectionError("Connection aborted (injected)", request=request)
+        roll -= rule.drop
+        for status, probability in rule.errors:
+            if roll < probability:
+                self._count(f"status {status}", request)
+                return self._error_response(request, status, rule.retry_after)
+            roll -= probability
+
+        response = send()
+        if rule.drop_response and self._random() < rule.drop_response:
+            response.close()
+            self._count('drop_response', request)
+            raise requests.exceptions.ConnectionError("Connection reset while reading response (injected)",
+                                                      request=request)
+        if rule.slow_body and self._random() < rule.slow_body:
+            self._count('slow_body', request)
+            response.raw = _DripReader(response.raw, rule.bytes_per_second)
+        return response
+
+    def _sample(self, latency: LatencyDistribution) -> float:
+        with self._lock:
+            return latency.sample(self._rng)
+
+    @staticmethod
+    def _error_response(request: requests.PreparedRequest, status: int,
+                        retry_after: Optional[float]) -> requests.Response:
+        """A response as the server would send it, without contacting the server."""
+        response = requests.Response()
+        response.status_code = status
+        response.reason = _REASONS.get(status, 'Injected Fault')
+        response.url = request.url
+        response.request = request
+        response.headers['Content-Type'] = 'application/json; charset=utf-8'
+        if retry_after is not None and status in (429, 503):
+            response.headers['Retry-After'] = str(retry_after)
+        response.raw = io.BytesIO(json.dumps({'error': f"Injected {status}"}).encode('utf-8'))
+        response.encoding = 'utf-8'
+        return response
+
+def load_profile(value: str) -> Tuple[Dict[str, Any], str]:
+    """
+    Resolve a TASKMASTER_FAULTS value.
+
+    Args:
+        value: Built-in profile name, path to a JSON file, or inline JSON
+
+    Returns:
+        (profile, name for logs)
+
+    Raises:
+        ValueError: If the value names nothing usable
+    """
+    value = value.strip()
+    if value in BUILTIN_PROFILES:
+        return BUILTIN_PROFILES[value], value
+    if value.startswith('{'):
+        return json.loads(value), 'inline'
+    if os.path.exists(value):
+        with open(value, 'r', encoding='utf-8') as f:
+            return json.load(f), os.path.basename(value)
+    raise ValueError(f"'{value}' is not a built-in profile ({', '.join(BUILTIN_PROFILES)}) "
+                     f"or an existing file")
+
+_injector: Optional[FaultInjector] = None
+_injector_loaded = False
+_injector_lock = threading.Lock()
+
+def get_fault_injector() -> Optional[FaultInjector]:
+    """The active injector, set up from TASKMASTER_FAULTS on first call; None when off."""
+    global _injector, _injector_loaded
+    if not _injector_loaded:
+        with _injector_lock:
+            if not _injector_loaded:
+                value = os.getenv(FAULTS_ENV)
+                if value:
+                    try:
+                        profile, name = load_profile(value)
+                        _injector = FaultInjector(profile, name)
+                        logger.warning(f"Fault injection active: profile '{name}'")
+                    except (ValueError, OSError) as e:
+                        logger.error(f"Ignoring {FAULTS_ENV}: {e}")
+                _injector_loaded = True
+    return _injector
+
+def set_fault_profile(profile: Optional[Dict[str, Any]], name: str = 'custom') -> Optional[FaultInjector]:
+    """
+    Replace the active profile at run time (None turns faults off).
+
+    Returns:
+        The new injector, or None
+    """
+    global _injector, _injector_loaded
+    with _injector_lock:
+        _injector = FaultInjector(profile, name) if profile is not None else None
+        _injector_loaded = True
+        return _injector
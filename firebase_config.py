@@ -1,16 +1,32 @@
 import os
-from dotenv import load_dotenv
-import pyrebase
+import sys
 import json
-from typing import Optional, Dict
+import base64
+from typing import Any, Callable, Optional, Dict
 import logging
+import threading
 import time
 from datetime import datetime, timedelta
+from rate_limiter import rate_limiter
+from circuit_breaker import get_breaker
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def token_expiry(token: str) -> Optional[datetime]:
+    """
+    When an ID token expires, from its exp claim.
+    
+    The signature is not checked; this only schedules refreshes.
+    """
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return datetime.fromtimestamp(claims['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
 class TokenManager:
     """Manages Firebase authentication tokens."""
     
@@ -19,10 +35,25 @@ class TokenManager:
         self.token_expiry = None
         self.refresh_token = None
         
-    def set_token(self, token: str, expiry_minutes: int = 55):
-        """Set a new token with expiry time"""
+    def set_token(self, token: str, expiry_minutes: Optional[int] = None):
+        """
+        Set a new token with expiry time.
+        
+        Without expiry_minutes the token is treated as expiring 5 minutes (or a
+        twelfth of its lifetime, if shorter) before its own exp claim: 55
+        minutes for Firebase's hour-long tokens.
+        """
         self.current_token = token
-        self.token_expiry = datetime.now() + timedelta(minutes=expiry_minutes)
+        if expiry_minutes is not None:
+            self.token_expiry = datetime.now() + timedelta(minutes=expiry_minutes)
+            return
+        expires_at = token_expiry(token)
+        if expires_at is None:
+            self.token_expiry = datetime.now() + timedelta(minutes=55)
+        else:
+            # A token that has already expired gets no margin, not a negative one
+            margin = max(timedelta(0), min(timedelta(minutes=5), (expires_at - datetime.now()) / 12))
+            self.token_expiry = expires_at - margin
         
     def set_refresh_token(self, token: str):
         """Set the refresh token"""
@@ -47,9 +78,13 @@ class TokenManager:
             return self.current_token
             
         if self.refresh_token and auth:
+            if not rate_limiter.try_acquire('auth'):
+                # Don't hammer securetoken; fall back to the token we still hold
+                logger.warning("Token refresh rate limited, reusing current token")
+                return self.current_token if self.is_token_valid() else None
             try:
                 # Refresh the token
-                user = auth.refresh(self.refresh_token)
+                user = get_breaker('auth').call(auth.refresh, self.refresh_token)
                 self.set_token(user['idToken'])
                 return self.current_token
             except Exception as e:
@@ -57,26 +92,89 @@ class TokenManager:
                 return None
         return None
 
-def verify_api_key():
+CONFIG_PATH = os.path.join("credentials", "firebase_config.json")
+ENV_PATH = os.path.join("credentials", ".env")
+
+_config: Optional[Dict] = None
+_config_lock = threading.Lock()
+
+def load_config() -> Dict:
+    """
+    Firebase configuration from the credentials folder or environment variables.
+    
+    Read once per process; later calls return the same dict.
+    """
+    global _config
+    with _config_lock:
+        if _config is None:
+            # First try loading from credentials folder
+            if os.path.exists(CONFIG_PATH):
+                with open(CONFIG_PATH, 'r') as f:
+                    _config = json.load(f)
+                    logger.info("Loaded configuration from firebase_config.json")
+            else:
+                logger.info(f"Config file not found at: {CONFIG_PATH}, using environment variables")
+                from dotenv import load_dotenv
+                load_dotenv(ENV_PATH)
+                _config = {
+                    "apiKey": os.getenv("FIREBASE_API_KEY"),
+                    "authDomain": os.getenv("FIREBASE_AUTH_DOMAIN"),
+                    "databaseURL": os.getenv("FIREBASE_DATABASE_URL"),
+                    "projectId": os.getenv("FIREBASE_PROJECT_ID"),
+                    "storageBucket": os.getenv("FIREBASE_STORAGE_BUCKET"),
+                    "messagingSenderId": os.getenv("FIREBASE_MESSAGING_SENDER_ID"),
+                    "appId": os.getenv("FIREBASE_APP_ID")
+                }
+            _apply_emulators(_config)
+        return _config
+
+# host:port of local stand-ins (python -m devserver); when set, the app talks
+# to them instead of the project's database and Google's auth endpoints
+DATABASE_EMULATOR_ENV = "FIREBASE_DATABASE_EMULATOR_HOST"
+AUTH_EMULATOR_ENV = "FIREBASE_AUTH_EMULATOR_HOST"
+
+# Where pyrebase sends sign-in, sign-up, account and token refresh requests
+AUTH_URL_PREFIXES = (
+    "https://www.googleapis.com/identitytoolkit/",
+    "https://identitytoolkit.googleapis.com/",
+    "https://securetoken.googleapis.com/",
+)
+
+# Placeholders so the app starts against local stand-ins with no project config
+EMULATOR_DEFAULTS = {
+    "apiKey": "local-api-key",
+    "authDomain": "localhost",
+    "projectId": "local",
+    "storageBucket": "local.appspot.com",
+}
+
+def _apply_emulators(config: Dict) -> None:
+    """Point config at local stand-ins named in the environment, if any."""
+    database_host = os.getenv(DATABASE_EMULATOR_ENV)
+    auth_host = os.getenv(AUTH_EMULATOR_ENV)
+    if not database_host and not auth_host:
+        return
+    if database_host:
+        config["databaseURL"] = f"http://{database_host}"
+        logger.info(f"Using local Realtime Database at {config['databaseURL']}")
+    if auth_host:
+        logger.info(f"Using local auth service at http://{auth_host}")
+    for field, value in EMULATOR_DEFAULTS.items():
+        if not config.get(field):
+            config[field] = value
+
+def verify_api_key(config: Optional[Dict] = None):
     """Verify that the API key is loaded correctly"""
     try:
-        config_path = os.path.join("credentials", "firebase_config.json")
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-                api_key = config.get("apiKey")
-                
-                if api_key:
-                    # Only log length and first/last few chars for verification
-                    key_len = len(api_key)
-                    key_preview = f"{api_key[:3]}...{api_key[-3:]}"
-                    logger.info(f"API Key found (length: {key_len}, preview: {key_preview})")
-                    return True
-                else:
-                    logger.error("API Key is missing from config!")
-                    return False
+        api_key = (config if config is not None else load_config()).get("apiKey")
+        if api_key:
+            # Only log length and first/last few chars for verification
+            key_len = len(api_key)
+            key_preview = f"{api_key[:3]}...{api_key[-3:]}"
+            logger.info(f"API Key found (length: {key_len}, preview: {key_preview})")
+            return True
         else:
-            logger.error(f"Config file not found at: {config_path}")
+            logger.error("API Key is missing from config!")
             return False
             
     except Exception as e:
@@ -86,28 +184,11 @@ def verify_api_key():
 def initialize_firebase() -> Optional[Dict]:
     """Initialize Firebase with configuration from environment variables or file"""
     try:
+        config = load_config()
+        
         # First verify API key
-        if not verify_api_key():
+        if not verify_api_key(config):
             raise ValueError("Invalid API key configuration")
-            
-        # First try loading from credentials folder
-        config_path = os.path.join("credentials", "firebase_config.json")
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-                logger.info("Loaded configuration from firebase_config.json")
-        else:
-            # Fallback to environment variables
-            load_dotenv(os.path.join("credentials", ".env"))
-            config = {
-                "apiKey": os.getenv("FIREBASE_API_KEY"),
-                "authDomain": os.getenv("FIREBASE_AUTH_DOMAIN"),
-                "databaseURL": os.getenv("FIREBASE_DATABASE_URL"),
-                "projectId": os.getenv("FIREBASE_PROJECT_ID"),
-                "storageBucket": os.getenv("FIREBASE_STORAGE_BUCKET"),
-                "messagingSenderId": os.getenv("FIREBASE_MESSAGING_SENDER_ID"),
-                "appId": os.getenv("FIREBASE_APP_ID")
-            }
         
         # Verify configuration
         required_fields = ["apiKey", "authDomain", "databaseURL", "projectId"]
@@ -121,33 +202,109 @@ def initialize_firebase() -> Optional[Dict]:
         safe_config["apiKey"] = "***" if config["apiKey"] else None
         logger.info(f"Firebase Configuration: {safe_config}")
         
-        # Initialize Firebase
+        # Initialize Firebase; pyrebase pulls in a large dependency tree, so
+        # it is imported here rather than at module import
+        import pyrebase
+        from http_client import SessionRequests, install_adapters, install_redirects
         firebase = pyrebase.initialize_app(config)
+        
+        # pyrebase sets no timeouts; without them a stalled connection hangs forever
+        install_adapters(firebase.requests)
+        # Its Auth calls requests.post() directly instead of using that session;
+        # route those through the session as well, for the same timeouts
+        sys.modules[pyrebase.initialize_app.__module__].requests = SessionRequests(firebase.requests)
+        auth_host = os.getenv(AUTH_EMULATOR_ENV)
+        if auth_host:
+            install_redirects(firebase.requests, AUTH_URL_PREFIXES, f"http://{auth_host}")
         return firebase
         
     except Exception as e:
         logger.error(f"Firebase initialization failed: {str(e)}")
         return None
 
-# Initialize Firebase when module is imported
-firebase = initialize_firebase()
+class DatabaseRef:
+    """
+    Hands out a fresh pyrebase Database for every query chain.
+    
+    pyrebase stores the path being built on the Database object itself, so a
+    single shared instance corrupts paths once calls run on worker threads.
+    """
+    
+    def __init__(self, firebase_app):
+        self._firebase_app = firebase_app
+        
+    def __getattr__(self, name):
+        return getattr(self._firebase_app.database(), name)
+
+_services: Optional[Dict] = None
+_services_lock = threading.Lock()
+
+def _get_services() -> Dict:
+    """Initialize Firebase on first use and build the shared service objects."""
+    global _services
+    if _services is None:
+        with _services_lock:
+            if _services is None:
+                firebase = initialize_firebase()
+                _services = {
+                    'firebase': firebase,
+                    'auth': firebase.auth() if firebase else None,
+                    'db': DatabaseRef(firebase) if firebase else None,
+                    'storage': firebase.storage() if firebase else None,
+                }
+    return _services
+
+def get_firebase():
+    """The pyrebase app, initialized on first call; None if initialization failed."""
+    return _get_services()['firebase']
+
+def get_auth():
+    return _get_services()['auth']
+
+def get_db() -> Optional[DatabaseRef]:
+    return _get_services()['db']
+
+def get_storage():
+    return _get_services()['storage']
+
+def is_initialized() -> bool:
+    """Whether Firebase initialized successfully (initializes it if needed)."""
+    return get_firebase() is not None
+
+class LazyService:
+    """
+    Stand-in for a Firebase service object that initializes Firebase on first use.
+    
+    Modules keep importing `auth`, `db` and friends at import time; nothing
+    is loaded until an attribute is used or the object is tested for truth.
+    """
+    
+    def __init__(self, resolve: Callable[[], Any], name: str):
+        self._resolve = resolve
+        self._name = name
+        
+    def __getattr__(self, name):
+        service = self._resolve()
+        if service is None:
+            raise AttributeError(f"Firebase {self._name} is unavailable: initialization failed")
+        return getattr(service, name)
+        
+    def __bool__(self):
+        return self._resolve() is not None
+        
+    def __repr__(self):
+        return f"<LazyService {self._name}>"
+
+# Firebase is initialized on first use of any of these, not at import
+firebase = LazyService(get_firebase, 'app')
+auth = LazyService(get_auth, 'auth')
+db = LazyService(get_db, 'db')
+storage = LazyService(get_storage, 'storage')
+current_user = None
 
 # Create token manager instance
 token_manager = TokenManager()
 
-# Export these for other modules to use
-if firebase:
-    auth = firebase.auth()
-    db = firebase.database()
-    storage = firebase.storage()
-    current_user = None
-    is_initialized = lambda: True
-else:
-    auth = None
-    db = None
-    storage = None
-    current_user = None
-    is_initialized = lambda: False
-
 # Export all required components
-__all__ = ['firebase', 'auth', 'db', 'storage', 'current_user', 'token_manager', 'is_initialized']
+__all__ = ['firebase', 'auth', 'db', 'storage', 'current_user', 'token_manager', 'is_initialized',
+           'get_firebase', 'get_auth', 'get_db', 'get_storage', 'load_config']
@@ -1,9 +1,11 @@
 from typing import Any, Callable, Optional, Dict
-from firebase_admin import auth, db
-from datetime import datetime, timedelta
-from collections import deque
-import time
+from concurrent.futures import Future
 from utils import SessionManager
+from rate_limiter import RateLimiter, RateLimitExceeded, rate_limiter
+from retry_policy import RetryPolicy
+from request_scheduler import Priority, RequestScheduler, request_scheduler
+from service_errors import AuthError, ServiceError
+from circuit_breaker import CircuitBreaker, CircuitOpenError, get_breaker
 import logging
 
 # Setup logging
@@ -12,79 +14,147 @@ logger = logging.getLogger(__name__)
 class FirebaseOperations:
     """Handles Firebase operations with automatic token refresh and error handling."""
     
-    def __init__(self, session_manager: SessionManager):
+    def __init__(self, session_manager: SessionManager, 
+                 retry_policy: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None):
         """
         Initialize Firebase operations.
         
         Args:
             session_manager: Session manager instance for token handling
+            retry_policy: Policy for retrying transient failures
+            breaker: Circuit breaker guarding the Firebase endpoint
         """
         self.session_manager = session_manager
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker or get_breaker('firebase')
         
-    def execute_operation(self, operation: Callable, *args: Any, **kwargs: Any) -> Any:
+    def execute_operation(self, operation: Callable, *args: Any, 
+                          fallback: Optional[Callable[[ServiceError], Any]] = None,
+                          **kwargs: Any) -> Any:
         """
-        Execute a Firebase operation with automatic token refresh.
+        Execute a Firebase operation with retries and token refresh.
+        
+        Network errors, 429 and 5xx responses are retried with backoff; the
+        token is refreshed only when Firebase rejects it. While the Firebase
+        circuit breaker is open the call fails fast without network access.
         
         Args:
             operation: Firebase operation to execute
             *args: Positional arguments for the operation
+            fallback: Called with the error instead of raising when Firebase is
+                unavailable (breaker open or transient failure after retries)
             **kwargs: Keyword arguments for the operation
             
         Returns:
-            Result of the operation
+            Result of the operation, or of the fallback
             
         Raises:
-            FirebaseError: If operation fails after retries
+            ServiceError: Classified error if the operation fails after retries
         """
-        max_retries = 2
-        last_error = None
-        
-        for attempt in range(max_retries):
-            try:
-                token = self.session_manager.get_valid_token()
-                if not token:
-                    raise Exception("No valid authentication token")
-                    
-                return operation(*args, **kwargs, token=token)
-                
-            except Exception as e:
-                last_error = e
-                if attempt < max_retries - 1:
-                    # Try getting a new token for the next attempt
-                    continue
-                    
-        raise last_error  # Re-raise the last error if all retries failed
+        return self._execute(self.retry_policy, operation, *args, fallback=fallback, **kwargs)
+        
+    def _execute(self, policy: RetryPolicy, operation: Callable, *args: Any,
+                 fallback: Optional[Callable[[ServiceError], Any]] = None,
+                 **kwargs: Any) -> Any:
+        state = {'token': self.session_manager.get_current_token()}
+        
+        def refresh_token() -> bool:
+            state['token'] = self.session_manager.get_valid_token()
+            return bool(state['token'])
+            
+        def attempt():
+            if not state['token'] and not refresh_token():
+                raise AuthError("No valid authentication token")
+            return self.breaker.call(operation, *args, **kwargs, token=state['token'])
+            
+        try:
+            return policy.call(attempt, on_auth_error=refresh_token)
+        except ServiceError as e:
+            if fallback is not None and (e.retryable or isinstance(e, CircuitOpenError)):
+                logger.warning(f"Firebase unavailable, using fallback: {e}")
+                return fallback(e)
+            raise
 
 class RateLimitedFirebaseOperations(FirebaseOperations):
-    """Firebase operations with rate limiting."""
+    """Firebase operations with per-endpoint token-bucket rate limiting."""
     
-    def __init__(self, session_manager: SessionManager):
+    def __init__(self, session_manager: SessionManager, 
+                 limiter: Optional[RateLimiter] = None,
+                 scheduler: Optional[RequestScheduler] = None):
+        """
+        Initialize rate-limited Firebase operations.
+        
+        Args:
+            session_manager: Session manager instance for token handling
+            limiter: Rate limiter to draw budgets from (shared limiter by default)
+            scheduler: Scheduler separating interactive and background requests
+        """
         super().__init__(session_manager)
-        self._requests = deque()
-        self._max_requests = 100  # Max requests per minute
-        self._window = 60  # Time window in seconds
+        # Inline calls run on the caller's (usually the GUI) thread, so they
+        # get one attempt; backoff between retries would freeze the window
+        self.inline_policy = RetryPolicy(max_attempts=1)
+        self.limiter = limiter or rate_limiter
+        self.scheduler = scheduler or request_scheduler
         
-    def _check_rate_limit(self):
-        """Check if operation should be rate limited."""
-        now = datetime.now()
+    def execute_operation(self, operation: Callable, *args: Any, 
+                          bucket: str = 'write', **kwargs: Any) -> Any:
+        """
+        Execute an operation now, once, if the bucket has budget.
         
-        # Remove old requests
-        while self._requests and self._requests[0] < now - timedelta(seconds=self._window):
-            self._requests.popleft()
-            
-        # Check if we're over the limit
-        if len(self._requests) >= self._max_requests:
-            sleep_time = (self._requests[0] + timedelta(seconds=self._window) - now).total_seconds()
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-                
-        # Add current request
-        self._requests.append(now)
-        
-    def execute_operation(self, operation: Callable, *args: Any, **kwargs: Any) -> Any:
-        """Execute rate-limited operation."""
-        self._check_rate_limit()
-        return super().execute_operation(operation, *args, **kwargs)
+        Never sleeps: when over budget this raises instead, and transient
+        failures are not retried but raised, so callers on the GUI thread stay
+        responsive. Use submit_operation or schedule_operation for retries.
+        
+        Raises:
+            RateLimitExceeded: If the bucket is exhausted
+            ServiceError: Classified error (e.g. NetworkError, ServerError) if
+                the attempt fails and no fallback is given
+        """
+        if not self.limiter.try_acquire(bucket):
+            raise RateLimitExceeded(bucket, self.limiter.retry_after(bucket))
+        # Runs inline, but holds background requests off until it completes
+        return self.scheduler.run_interactive(
+            self._execute, self.inline_policy, operation, *args, **kwargs
+        )
+        
+    def submit_operation(self, operation: Callable, *args: Any, 
+                         bucket: str = 'write', **kwargs: Any) -> Future:
+        """
+        Run an operation with retries as an interactive request.
+        
+        It runs on a worker thread, ahead of background requests, and waits
+        there for budget; retries and their backoff never block the caller.
+        
+        Returns:
+            Future resolved with the operation result once it has run
+        """
+        return self.schedule_operation(
+            operation, *args, priority=Priority.INTERACTIVE, bucket=bucket, **kwargs
+        )
+        
+    def schedule_operation(self, operation: Callable, *args: Any,
+                           priority: Priority = Priority.BACKGROUND,
+                           bucket: str = 'background', **kwargs: Any) -> Future:
+        """
+        Run an operation on a scheduler worker thread.
+        
+        Background operations draw from their own budget and only start when
+        no interactive request is pending; the worker waits for budget
+        instead of failing.
+        
+        Returns:
+            Future resolved with the operation result
+        """
+        run = super().execute_operation
+        return self.scheduler.submit(
+            lambda: self.limiter.submit(bucket, run, operation, *args, **kwargs).result(),
+            priority=priority
+        )
+        
+    def queue_depth(self, bucket: Optional[str] = None) -> int:
+        """Number of deferred operations waiting for budget."""
+        return self.limiter.queue_depth(bucket)
 
 def login(email: str, password: str) -> Optional[Dict]:
     """Login user with email and password"""
@@ -0,0 +1,132 @@
+from requests.adapters import HTTPAdapter
+from typing import Iterable, Optional, Tuple, Union
+from urllib.parse import urlsplit
+import threading
+import requests
+import logging
+from fault_injection import get_fault_injector
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) seconds; applied whenever a caller doesn't pass its own timeout
+DEFAULT_TIMEOUT: Tuple[float, float] = (5, 15)
+
+Timeout = Union[float, Tuple[float, float]]
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter that enforces a default timeout on every request.
+    
+    It is also where the faults of an active TASKMASTER_FAULTS profile are
+    applied (see fault_injection), since every outbound call passes through it.
+    """
+
+    def __init__(self, *args, timeout: Timeout = DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        injector = get_fault_injector()
+        if injector is not None:
+            send = super().send
+            return injector.send(request, kwargs['timeout'], lambda: send(request, **kwargs))
+        return super().send(request, **kwargs)
+
+def install_adapters(session: requests.Session, timeout: Timeout = DEFAULT_TIMEOUT) -> requests.Session:
+    """
+    Mount timeout-enforcing adapters on a session.
+
+    Args:
+        session: Session to configure (e.g. pyrebase's shared session)
+        timeout: Default timeout for requests without an explicit one
+
+    Returns:
+        The same session
+    """
+    adapter = TimeoutHTTPAdapter(timeout=timeout, pool_connections=4, pool_maxsize=8)
+    for scheme in ('http://', 'https://'):
+        session.mount(scheme, adapter)
+    return session
+
+class RedirectAdapter(TimeoutHTTPAdapter):
+    """
+    Sends requests for a remote service to a local stand-in instead.
+    
+    The original host becomes the first path segment, the layout the Firebase
+    emulators use: https://securetoken.googleapis.com/v1/token is sent to
+    <target>/securetoken.googleapis.com/v1/token.
+    """
+
+    def __init__(self, target: str, *args, **kwargs):
+        self.target = target.rstrip('/')
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        request.url = f"{self.target}/{url.netloc}{url.path}" + (f"?{url.query}" if url.query else '')
+        return super().send(request, **kwargs)
+
+def install_redirects(session: requests.Session, prefixes: Iterable[str], target: str,
+                      timeout: Timeout = DEFAULT_TIMEOUT) -> requests.Session:
+    """
+    Route requests under the given URL prefixes to a local stand-in.
+
+    Args:
+        session: Session to configure
+        prefixes: URL prefixes to redirect (e.g. 'https://securetoken.googleapis.com/')
+        target: Base URL of the stand-in, e.g. http://127.0.0.1:9099
+        timeout: Default timeout for requests without an explicit one
+
+    Returns:
+        The same session
+    """
+    adapter = RedirectAdapter(target, timeout=timeout)
+    for prefix in prefixes:
+        session.mount(prefix, adapter)
+    return session
+
+class SessionRequests:
+    """
+    Stands in for the requests module inside a library that calls
+    requests.post() and friends directly, sending those calls through a
+    session so they get its adapters (timeouts, pooling, redirects).
+    """
+
+    def __init__(self, session: requests.Session):
+        self._session = session
+
+    def request(self, method, url, **kwargs):
+        return self._session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self._session.get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._session.post(url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self._session.put(url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self._session.patch(url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self._session.delete(url, **kwargs)
+
+    def __getattr__(self, name):
+        # Session, exceptions and the rest come from the real module
+        return getattr(requests, name)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    """Shared, connection-pooled session for ImgBB and image downloads."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = install_adapters(requests.Session())
+    return _session
@@ -0,0 +1,227 @@
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import logging
+from circuit_breaker import get_breaker
+from http_client import get_http_session
+from utils import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / '.todoapp' / 'cache'
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+# How long a response without Cache-Control is served without revalidating
+DEFAULT_TTL = 24 * 60 * 60
+
+class ContentCache:
+    """
+    On-disk cache for remote content, keyed by URL.
+
+    Entries keep the (optionally processed) bytes together with the ETag and
+    Last-Modified validators. Fresh entries are served without any network
+    access; stale ones are revalidated with a conditional GET, so an unchanged
+    image costs a 304 rather than a full download. Total size is capped with
+    least-recently-used eviction.
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES, default_ttl: float = DEFAULT_TTL):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached files and the index
+            max_bytes: Size cap for all cached content
+            default_ttl: Freshness lifetime when the server gives none
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.index_file = cache_dir / 'index.json'
+        self._lock = threading.RLock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._index: Dict[str, Dict] = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            if self.index_file.exists():
+                index = json.loads(self.index_file.read_text())
+                # Hits since the index was last saved are only recorded in the
+                # files' mtimes (see _read)
+                for key, entry in index.items():
+                    try:
+                        mtime = self._path(key).stat().st_mtime
+                    except OSError:
+                        continue
+                    entry['last_access'] = max(entry.get('last_access', 0), mtime)
+                return index
+        except Exception as e:
+            logger.error(f"Discarding unreadable cache index: {e}")
+        return {}
+
+    def _save_index(self) -> None:
+        try:
+            atomic_write_bytes(self.index_file, json.dumps(self._index).encode())
+        except Exception as e:
+            logger.error(f"Failed to save cache index: {e}")
+
+    @staticmethod
+    def key_for(url: str, variant: str = 'raw') -> str:
+        """Cache key for a URL and processing variant."""
+        return hashlib.sha256(f"{variant}:{url}".encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.bin"
+
+    def _read(self, key: str) -> Optional[bytes]:
+        entry = self._index.get(key)
+        if not entry:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self._index.pop(key, None)
+            return None
+        now = time.time()
+        entry['last_access'] = now
+        # The index is saved only on writes; touching the file keeps the
+        # access time across restarts without rewriting it on every hit
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        return data
+
+    def get(self, url: str, variant: str = 'raw') -> Optional[bytes]:
+        """Cached bytes for a URL, without touching the network."""
+        with self._lock:
+            return self._read(self.key_for(url, variant))
+
+    def put(self, url: str, data: bytes, variant: str = 'raw',
+            etag: Optional[str] = None, last_modified: Optional[str] = None,
+            ttl: Optional[float] = None) -> None:
+        """Store bytes for a URL and evict old entries if over the size cap."""
+        key = self.key_for(url, variant)
+        with self._lock:
+            atomic_write_bytes(self._path(key), data)
+            now = time.time()
+            self._index[key] = {
+                'url': url,
+                'variant': variant,
+                'etag': etag,
+                'last_modified': last_modified,
+                'size': len(data),
+                'expires': now + (self.default_ttl if ttl is None else ttl),
+                'last_access': now,
+            }
+            self._evict()
+            self._save_index()
+
+    def _evict(self) -> None:
+        total = sum(entry['size'] for entry in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+            total -= entry['size']
+            del self._index[key]
+
+    def _freshness(self, headers) -> float:
+        match = re.search(r'max-age=(\d+)', headers.get('Cache-Control', ''))
+        if match:
+            return float(match.group(1))
+        expires = headers.get('Expires')
+        if expires:
+            try:
+                return max(0.0, parsedate_to_datetime(expires).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+        return self.default_ttl
+
+    def fetch(self, url: str, processor: Optional[Callable[[bytes], bytes]] = None,
+              variant: str = 'raw', endpoint: Optional[str] = None,
+              headers: Optional[Dict[str, str]] = None, timeout=10) -> Optional[bytes]:
+        """
+        Get content for a URL, downloading only when needed.
+
+        Args:
+            url: Remote URL
+            processor: Transforms downloaded bytes before they are cached
+            variant: Name of the processing variant (part of the cache key)
+            endpoint: Circuit breaker to route the download through
+            headers: Extra request headers
+            timeout: Request timeout
+
+        Returns:
+            Cached or freshly downloaded bytes, or None if unavailable. Stale
+            content is returned when revalidation fails.
+        """
+        key = self.key_for(url, variant)
+        with self._lock:
+            entry = dict(self._index.get(key) or {})
+            cached = self._read(key)
+
+        if cached is not None and entry.get('expires', 0) > time.time():
+            return cached
+
+        request_headers = dict(headers or {})
+        if cached is not None:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            get = get_http_session().get
+            if endpoint:
+                response = get_breaker(endpoint).call(get, url, headers=request_headers, timeout=timeout)
+            else:
+                response = get(url, headers=request_headers, timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Fetching {url} failed: {e}")
+            return cached
+
+        if response.status_code == 304 and cached is not None:
+            with self._lock:
+                if key in self._index:
+                    self._index[key]['expires'] = time.time() + self._freshness(response.headers)
+                    self._save_index()
+            return cached
+
+        if response.status_code != 200:
+            logger.warning(f"Fetching {url} returned {response.status_code}")
+            return cached
+
+        data = processor(response.content) if processor else response.content
+        if data:
+            self.put(
+                url, data, variant,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+                ttl=self._freshness(response.headers)
+            )
+        return data
+
+_cache: Optional[ContentCache] = None
+_cache_lock = threading.Lock()
+
+def get_image_cache() -> ContentCache:
+    """Shared cache for remote images (profile pictures and the like)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ContentCache()
+    return _cache
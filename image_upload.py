@@ -0,0 +1,298 @@
+from PyQt6.QtCore import QBuffer, QByteArray, QSize
+from PyQt6.QtGui import QImage, QImageReader
+from pathlib import Path
+from typing import Callable, Dict, Optional
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import threading
+import time
+import uuid
+import requests
+import logging
+from circuit_breaker import get_breaker
+from rate_limiter import RateLimitExceeded, rate_limiter
+from http_client import get_http_session
+from image_cache import DEFAULT_CACHE_DIR
+from retry_policy import RetryPolicy
+from utils import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+# Longest side of an uploaded image; larger photos are downscaled first
+DEFAULT_MAX_DIMENSION = 2048
+# Avatars are shown at 150px, up to 3x on HiDPI screens
+AVATAR_MAX_DIMENSION = 512
+# Sent as-is when the file is already small and within the size limit
+PASSTHROUGH_BYTES = 256 * 1024
+MAX_INDEXED_UPLOADS = 500
+
+ProgressCallback = Callable[[int, int], None]
+
+class PreparedImage:
+    """Encoded image bytes ready for upload."""
+
+    def __init__(self, data: bytes, mime_type: str, filename: str):
+        self.data = data
+        self.mime_type = mime_type
+        self.filename = filename
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+def jpeg_quality(pixels: int) -> int:
+    """Pick JPEG quality by pixel count; big images hide compression better."""
+    if pixels >= 2_000_000:
+        return 80
+    if pixels >= 500_000:
+        return 85
+    return 90
+
+def _encode(image: QImage, fmt: str, quality: int = -1) -> bytes:
+    byte_array = QByteArray()
+    buffer = QBuffer(byte_array)
+    buffer.open(QBuffer.OpenModeFlag.WriteOnly)
+    if not image.save(buffer, fmt, quality):
+        raise ValueError(f"Failed to encode image as {fmt}")
+    return byte_array.data()
+
+def prepare_image(file_path: str, max_dimension: int = DEFAULT_MAX_DIMENSION) -> PreparedImage:
+    """
+    Downscale and re-encode an image file for upload.
+
+    Large images are decoded straight at the target size, so a 40MP camera
+    photo never exists in memory at full resolution. Images with transparency
+    become PNG, everything else JPEG with a quality chosen by size. Runs on
+    worker threads (QImage only, no QPixmap).
+
+    Args:
+        file_path: Path to the source image
+        max_dimension: Longest side of the result in pixels
+
+    Returns:
+        PreparedImage with the encoded bytes
+
+    Raises:
+        ValueError: If the file cannot be read as an image
+    """
+    reader = QImageReader(file_path)
+    reader.setAutoTransform(True)  # honour EXIF orientation from phone cameras
+    size = reader.size()
+    if not size.isValid():
+        raise ValueError(f"Unsupported image file: {reader.errorString()}")
+
+    source_format = bytes(reader.format().data()).decode().lower()
+    needs_scaling = max(size.width(), size.height()) > max_dimension
+    if (not needs_scaling and source_format in ('jpeg', 'jpg', 'png')
+            and os.path.getsize(file_path) <= PASSTHROUGH_BYTES):
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        mime_type = mimetypes.guess_type(file_path)[0] or f"image/{source_format}"
+        return PreparedImage(data, mime_type, os.path.basename(file_path))
+
+    if needs_scaling:
+        scale = max_dimension / max(size.width(), size.height())
+        reader.setScaledSize(QSize(
+            max(1, round(size.width() * scale)), max(1, round(size.height() * scale))
+        ))
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(f"Failed to decode image: {reader.errorString()}")
+
+    stem = os.path.splitext(os.path.basename(file_path))[0] or 'image'
+    if image.hasAlphaChannel():
+        return PreparedImage(_encode(image, "PNG"), 'image/png', f"{stem}.png")
+    quality = jpeg_quality(image.width() * image.height())
+    return PreparedImage(_encode(image, "JPEG", quality), 'image/jpeg', f"{stem}.jpg")
+
+class MultipartStream:
+    """
+    multipart/form-data body read in chunks from memory.
+
+    requests streams file-like bodies, so the payload is sent as raw binary
+    (no base64) and every read reports upload progress. Content-Length comes
+    from __len__, which keeps the request non-chunked.
+    """
+
+    def __init__(self, fields: Dict[str, str], file_field: str, image: PreparedImage,
+                 progress: Optional[ProgressCallback] = None):
+        """
+        Build the body.
+
+        Args:
+            fields: Plain form fields
+            file_field: Name of the file part
+            image: Image to send as the file part
+            progress: Called with (bytes sent, total bytes)
+        """
+        self.boundary = uuid.uuid4().hex
+        head = io.BytesIO()
+        for name, value in fields.items():
+            head.write(
+                f'--{self.boundary}\r\n'
+                f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+                f'{value}\r\n'.encode()
+            )
+        head.write(
+            f'--{self.boundary}\r\n'
+            f'Content-Disposition: form-data; name="{file_field}"; filename="{image.filename}"\r\n'
+            f'Content-Type: {image.mime_type}\r\n\r\n'.encode()
+        )
+        tail = f'\r\n--{self.boundary}--\r\n'.encode()
+        self._parts = [memoryview(head.getvalue()), memoryview(image.data), memoryview(tail)]
+        self._total = sum(len(part) for part in self._parts)
+        self._part = 0
+        self._offset = 0
+        self._sent = 0
+        self._progress = progress
+
+    @property
+    def content_type(self) -> str:
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def __len__(self) -> int:
+        return self._total
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._total - self._sent
+        chunks = []
+        while size > 0 and self._part < len(self._parts):
+            part = self._parts[self._part]
+            chunk = part[self._offset:self._offset + size]
+            chunks.append(bytes(chunk))
+            size -= len(chunk)
+            self._offset += len(chunk)
+            if self._offset >= len(part):
+                self._part += 1
+                self._offset = 0
+        data = b''.join(chunks)
+        if data:
+            self._sent += len(data)
+            if self._progress:
+                try:
+                    self._progress(self._sent, self._total)
+                except Exception as e:
+                    logger.error(f"Upload progress callback failed: {e}")
+        return data
+
+def post_multipart(url: str, fields: Dict[str, str], file_field: str, image: PreparedImage,
+                   progress: Optional[ProgressCallback] = None, timeout=(5, 60)) -> requests.Response:
+    """
+    POST an image as binary multipart/form-data on the shared session.
+
+    Args:
+        url: Upload endpoint
+        fields: Plain form fields (API key, name, ...)
+        file_field: Name of the file part
+        image: Prepared image to send
+        progress: Called with (bytes sent, total bytes) from the sending thread
+        timeout: Request timeout
+
+    Returns:
+        The successful response
+
+    Raises:
+        requests.HTTPError: On any error status, so retries and circuit
+            breakers can classify it
+    """
+    body = MultipartStream(fields, file_field, image, progress)
+    response = get_http_session().post(
+        url, data=body, headers={'Content-Type': body.content_type}, timeout=timeout
+    )
+    response.raise_for_status()
+    return response
+
+def upload_prepared_image(url: str, fields: Dict[str, str], image: PreparedImage,
+                          progress: Optional[ProgressCallback] = None, file_field: str = 'image',
+                          endpoint: str = 'imgbb', retry_policy: Optional[RetryPolicy] = None,
+                          timeout=(5, 60), bucket: Optional[str] = 'imgbb') -> Dict:
+    """
+    Upload an image, retrying transient failures from the same prepared bytes.
+
+    Each attempt goes through the endpoint's circuit breaker and streams a
+    fresh body, so a retry never re-reads or re-encodes the source file.
+    The upload is charged once to the rate limiter's bucket, before sending.
+
+    Returns:
+        Parsed JSON response
+
+    Raises:
+        RateLimitExceeded: If the bucket has no budget left
+        ServiceError: Once retries are exhausted or the failure is permanent
+    """
+    if bucket and not rate_limiter.try_acquire(bucket):
+        raise RateLimitExceeded(bucket, rate_limiter.retry_after(bucket))
+    policy = retry_policy or RetryPolicy(max_attempts=3, base_delay=1.0)
+    response = policy.call(
+        get_breaker(endpoint).call,
+        post_multipart, url, fields, file_field, image, progress, timeout=timeout
+    )
+    return response.json()
+
+class UploadIndex:
+    """
+    Persistent map from source image content to the URL it was uploaded to.
+
+    Keys are the SHA-256 of the source file plus the upload size, so picking
+    the same picture again (or retrying after a later step failed) reuses the
+    existing upload instead of sending the image again.
+    """
+
+    def __init__(self, index_file: Path = DEFAULT_CACHE_DIR / 'uploads.json',
+                 max_entries: int = MAX_INDEXED_UPLOADS):
+        self.index_file = index_file
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            if self.index_file.exists():
+                return json.loads(self.index_file.read_text())
+        except Exception as e:
+            logger.error(f"Discarding unreadable upload index: {e}")
+        return {}
+
+    @staticmethod
+    def key_for_file(file_path: str, variant: str = '') -> str:
+        """Hash a file in chunks; variant separates different upload sizes."""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return f"{digest.hexdigest()}:{variant}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Previously uploaded URL for this content, if any."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry['url'] if entry else None
+
+    def put(self, key: str, url: str) -> None:
+        """Remember an upload, dropping the oldest entries past max_entries."""
+        with self._lock:
+            self._entries[key] = {'url': url, 'uploaded_at': time.time()}
+            if len(self._entries) > self.max_entries:
+                oldest = sorted(self._entries, key=lambda k: self._entries[k]['uploaded_at'])
+                for stale in oldest[:len(self._entries) - self.max_entries]:
+                    del self._entries[stale]
+            try:
+                self.index_file.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write_bytes(self.index_file, json.dumps(self._entries).encode())
+            except Exception as e:
+                logger.error(f"Failed to save upload index: {e}")
+
+_upload_index: Optional[UploadIndex] = None
+_upload_index_lock = threading.Lock()
+
+def get_upload_index() -> UploadIndex:
+    """Shared index of uploaded images."""
+    global _upload_index
+    if _upload_index is None:
+        with _upload_index_lock:
+            if _upload_index is None:
+                _upload_index = UploadIndex()
+    return _upload_index
@@ -1,9 +1,14 @@
-import requests
 import os
-from dotenv import load_dotenv
+from image_upload import (
+    DEFAULT_MAX_DIMENSION, PreparedImage, ProgressCallback, get_upload_index,
+    prepare_image, upload_prepared_image
+)
+from http_client import get_http_session
 from typing import Optional
 import logging
 from pathlib import Path
+import threading
+from rate_limiter import RateLimitExceeded
 
 logger = logging.getLogger(__name__)
 
@@ -13,20 +18,26 @@ def get_credentials_path():
                            r'C:\Users\E-TIME\PycharmProjects\LiteProjs\credentials')
     return Path(secure_path)
 
-class ImgBBAPI:
-    """Handles image uploads to ImgBB service."""
-    
-    def __init__(self):
-        """Initialize with API key from secure location."""
-        self.api_key = self._get_api_key()
-        if not self.api_key:
-            raise ValueError("ImgBB API key not found")
-        
-        self.upload_url = "https://api.imgbb.com/1/upload"
-        
-    def _get_api_key(self) -> Optional[str]:
-        """Get API key from secure location"""
+_api_key_lock = threading.Lock()
+_api_key_resolved = False
+_api_key: Optional[str] = None
+
+def load_api_key() -> Optional[str]:
+    """
+    Resolve the ImgBB API key once per process.
+
+    Probes the secure credentials folder, falls back to a local .env, and
+    caches the outcome (including a missing key) so the lookup never repeats.
+    """
+    global _api_key, _api_key_resolved
+    if _api_key_resolved:
+        return _api_key
+    with _api_key_lock:
+        if _api_key_resolved:
+            return _api_key
         try:
+            from dotenv import load_dotenv
+
             # First try secure credentials folder
             env_path = get_credentials_path() / '.env'
             if env_path.exists():
@@ -35,16 +46,33 @@ class ImgBBAPI:
                 # Fallback to local .env
                 load_dotenv()
             
-            api_key = os.getenv('IMGBB_API_KEY')
-            if api_key:
+            _api_key = os.getenv('IMGBB_API_KEY')
+            if _api_key:
                 logger.info("Successfully loaded ImgBB API key")
-                return api_key
+            else:
+                logger.error("ImgBB API key not found in environment variables")
                 
-            raise ValueError("ImgBB API key not found in environment variables")
-            
         except Exception as e:
             logger.error(f"Error loading ImgBB API key: {str(e)}")
-            return None
+            _api_key = None
+        _api_key_resolved = True
+        return _api_key
+
+class ImgBBAPI:
+    """Handles image uploads to ImgBB service."""
+    
+    def __init__(self, api_key: Optional[str] = None):
+        """
+        Initialize with an API key, by default the one from the secure location.
+        
+        Raises:
+            ValueError: If no API key is configured
+        """
+        self.api_key = api_key or load_api_key()
+        if not self.api_key:
+            raise ValueError("ImgBB API key not found")
+        
+        self.upload_url = "https://api.imgbb.com/1/upload"
     
     def upload_image(self, image_data: bytes, name: Optional[str] = None) -> Optional[str]:
         """
@@ -57,51 +85,74 @@ class ImgBBAPI:
         Returns:
             URL of uploaded image or None if upload fails
         """
-        try:
-            payload = {
-                'key': self.api_key,
-                'image': image_data,
-            }
+        image = PreparedImage(image_data, 'application/octet-stream', name or 'image')
+        return self.upload_prepared(image, name)
+        
+    def upload_prepared(self, image: PreparedImage, name: Optional[str] = None,
+                        progress: Optional[ProgressCallback] = None) -> Optional[str]:
+        """
+        Upload an already encoded image as binary multipart data.
+        
+        Args:
+            image: Image from prepare_image() or raw bytes wrapped in PreparedImage
+            name: Optional name for the image
+            progress: Called with (bytes sent, total bytes) while uploading
             
+        Returns:
+            URL of uploaded image or None if upload fails
+        """
+        try:
+            fields = {'key': self.api_key}
             if name:
-                payload['name'] = name
+                fields['name'] = name
                 
-            response = requests.post(
-                self.upload_url,
-                payload,
-                timeout=30  # 30 seconds timeout
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('success'):
-                    return result['data']['url']
+            # Transient failures are retried from the same bytes; fails fast while ImgBB is down
+            result = upload_prepared_image(self.upload_url, fields, image, progress)
+            if result.get('success'):
+                return result['data']['url']
                     
-            logger.error(f"Upload failed: {response.text}")
+            logger.error(f"Upload failed: {result}")
+            return None
+            
+        except RateLimitExceeded as e:
+            logger.error(f"ImgBB upload rate limited, retry in {e.retry_after:.0f}s")
             return None
             
         except Exception as e:
             logger.error(f"Error uploading image: {str(e)}")
             return None
             
-    def upload_image_file(self, file_path: str) -> Optional[str]:
+    def upload_image_file(self, file_path: str, max_dimension: int = DEFAULT_MAX_DIMENSION,
+                          progress: Optional[ProgressCallback] = None) -> Optional[str]:
         """
-        Upload image from file.
+        Downscale, re-encode and upload an image file.
+        
+        Blocks on decoding and network I/O, so call it from a worker thread.
         
         Args:
             file_path: Path to image file
+            max_dimension: Longest side of the uploaded image
+            progress: Called with (bytes sent, total bytes) while uploading
             
         Returns:
             URL of uploaded image or None if upload fails
         """
         try:
-            with open(file_path, 'rb') as f:
-                image_data = f.read()
-            return self.upload_image(image_data)
-            
+            index = get_upload_index()
+            key = index.key_for_file(file_path, f"max{max_dimension}")
+            existing = index.get(key)
+            if existing:
+                logger.info("Image already uploaded, reusing its URL")
+                return existing
+            image = prepare_image(file_path, max_dimension)
         except Exception as e:
             logger.error(f"Error reading image file: {str(e)}")
             return None
+            
+        url = self.upload_prepared(image, progress=progress)
+        if url:
+            index.put(key, url)
+        return url
 
     def test_imgbb_connection(self) -> bool:
         """Test ImgBB API key validity"""
@@ -113,7 +164,7 @@ class ImgBBAPI:
                 'image': test_data
             }
             
-            response = requests.post(
+            response = get_http_session().post(
                 self.upload_url,
                 payload,
                 timeout=10
@@ -130,5 +181,25 @@ class ImgBBAPI:
             logger.error(f"Error testing ImgBB connection: {str(e)}")
             return False
 
-# Create global instance
-imgbb_api = ImgBBAPI() 
\ No newline at end of file
+_imgbb_api: Optional[ImgBBAPI] = None
+_imgbb_api_lock = threading.Lock()
+
+def get_imgbb_api() -> ImgBBAPI:
+    """
+    Shared ImgBB client, created on first use.
+    
+    Raises:
+        ValueError: If no API key is configured
+    """
+    global _imgbb_api
+    if _imgbb_api is None:
+        with _imgbb_api_lock:
+            if _imgbb_api is None:
+                _imgbb_api = ImgBBAPI()
+    return _imgbb_api
+
+def __getattr__(name):
+    # Keeps `from imgbb_api import imgbb_api` working without building the client at import
+    if name == 'imgbb_api':
+        return get_imgbb_api()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
@@ -0,0 +1,155 @@
+from typing import Dict, List, Optional, Tuple
+import importlib.abc
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Set to 1 to log the slowest imports once the first window is up, or to a
+# file path to also write the report there. Unlike `python -X importtime`
+# this also works in PyInstaller builds.
+ENV_VAR = 'TASKMASTER_IMPORT_REPORT'
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a loader for the duration of one exec_module call."""
+
+    def __init__(self, finder: 'ImportTimer', loader):
+        self._finder = finder
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Put the real loader back so nothing downstream sees the wrapper
+        module.__loader__ = self._loader
+        if getattr(module, '__spec__', None) is not None:
+            module.__spec__.loader = self._loader
+        self._finder._enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._finder._exit(module.__name__)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    Meta path finder that times how long each module takes to execute.
+
+    Cumulative time includes the imports a module triggers; self time does
+    not. Only the first import of each module is measured, as later ones
+    come from sys.modules.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.cumulative: Dict[str, float] = {}
+        self.self_time: Dict[str, float] = {}
+        self.milestones: List[Tuple[str, float]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(self, spec.loader)
+                return spec
+        return None
+
+    def _stack(self) -> List[List[float]]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self) -> None:
+        # [start time, time spent in nested imports]
+        self._stack().append([time.perf_counter(), 0.0])
+
+    def _exit(self, name: str) -> None:
+        stack = self._stack()
+        started, nested = stack.pop()
+        elapsed = time.perf_counter() - started
+        if stack:
+            stack[-1][1] += elapsed
+        with self._lock:
+            self.cumulative[name] = elapsed
+            self.self_time[name] = elapsed - nested
+
+    def mark(self, label: str) -> None:
+        """Record a start-up milestone, timed from install."""
+        with self._lock:
+            self.milestones.append((label, time.perf_counter() - self.started))
+
+    def format(self, limit: int = 25) -> str:
+        with self._lock:
+            cumulative = dict(self.cumulative)
+            self_time = dict(self.self_time)
+            milestones = list(self.milestones)
+        top_level = sum(elapsed for name, elapsed in cumulative.items() if '.' not in name)
+        lines = [f"Import-time report: {len(cumulative)} modules, "
+                 f"{top_level * 1000:.0f} ms in top-level packages"]
+        for label, at in milestones:
+            lines.append(f"  {label}: {at * 1000:.0f} ms after start")
+        lines.append(f"  {'cumulative':>10}  {'self':>8}  module")
+        slowest = sorted(cumulative, key=cumulative.get, reverse=True)[:limit]
+        for name in slowest:
+            lines.append(f"  {cumulative[name] * 1000:8.1f}ms  {self_time[name] * 1000:6.1f}ms  {name}")
+        return '\n'.join(lines)
+
+_timer: Optional[ImportTimer] = None
+
+def install() -> ImportTimer:
+    """Start timing imports; call before importing anything heavy."""
+    global _timer
+    if _timer is None:
+        _timer = ImportTimer()
+        sys.meta_path.insert(0, _timer)
+    return _timer
+
+def install_from_env() -> bool:
+    """Install the timer when TASKMASTER_IMPORT_REPORT is set."""
+    if os.environ.get(ENV_VAR, '').strip().lower() in ('', '0', 'false', 'no'):
+        return False
+    install()
+    return True
+
+def is_enabled() -> bool:
+    return _timer is not None
+
+def mark(label: str) -> None:
+    if _timer is not None:
+        _timer.mark(label)
+
+def report(label: str = "first window", limit: int = 25) -> Optional[str]:
+    """
+    Log the report, marking a final milestone first.
+
+    If TASKMASTER_IMPORT_REPORT holds a path, the report is written there too.
+
+    Returns:
+        The report text, or None when timing is not enabled
+    """
+    if _timer is None:
+        return None
+    _timer.mark(label)
+    text = _timer.format(limit)
+    logger.info(text)
+
+    target = os.environ.get(ENV_VAR, '').strip()
+    if target and target.lower() not in ('1', 'true', 'yes', 'on'):
+        try:
+            with open(target, 'w', encoding='utf-8') as f:
+                f.write(text + '\n')
+        except OSError as e:
+            logger.error(f"Failed to write import report to {target}: {e}")
+    return text
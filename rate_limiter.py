@@ -0,0 +1,196 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sustained rate (tokens per second) and burst capacity for each endpoint class
+DEFAULT_BUDGETS: Dict[str, Tuple[float, float]] = {
+    'read': (100 / 60, 30),
+    'write': (60 / 60, 20),
+    'auth': (10 / 60, 5),
+    'imgbb': (6 / 60, 2),
+    'background': (30 / 60, 10),
+}
+
+class RateLimitExceeded(Exception):
+    """Raised when a call cannot run now and the caller asked not to queue it."""
+
+    def __init__(self, bucket: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded for '{bucket}', retry in {retry_after:.1f}s")
+        self.bucket = bucket
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """Classic token bucket: refills continuously at `rate` up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available; never blocks."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Seconds until `tokens` would be available."""
+        with self._lock:
+            self._refill()
+            missing = tokens - self._tokens
+            return max(0.0, missing / self.rate) if self.rate > 0 else float('inf')
+
+class RateLimiter:
+    """
+    Per-endpoint token buckets with a deferred queue for over-budget calls.
+
+    Submitted calls always run on worker threads: those within budget start
+    at once, over-budget ones are queued per bucket and dispatched from a
+    background thread as tokens refill, so the caller (usually the Qt GUI
+    thread) never waits on the request. Callers that must run inline take a
+    token with try_acquire() themselves.
+    """
+
+    def __init__(self, budgets: Optional[Dict[str, Tuple[float, float]]] = None, max_workers: int = 4):
+        """
+        Initialize the limiter.
+
+        Args:
+            budgets: Mapping of bucket name to (rate per second, burst capacity)
+            max_workers: Threads used to run deferred calls
+        """
+        self._buckets: Dict[str, TokenBucket] = {
+            name: TokenBucket(rate, capacity)
+            for name, (rate, capacity) in (budgets or DEFAULT_BUDGETS).items()
+        }
+        self._queues: Dict[str, Deque] = {name: deque() for name in self._buckets}
+        self._max_workers = max_workers
+        self._condition = threading.Condition()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _bucket(self, name: str) -> TokenBucket:
+        if name not in self._buckets:
+            raise KeyError(f"Unknown rate limit bucket: {name}")
+        return self._buckets[name]
+
+    def try_acquire(self, bucket: str) -> bool:
+        """
+        Take a token for an immediate call.
+
+        Returns False if the bucket is empty or earlier calls are still queued,
+        so direct callers cannot jump ahead of deferred ones.
+        """
+        with self._condition:
+            if self._queues[bucket]:
+                return False
+        return self._bucket(bucket).try_acquire()
+
+    def retry_after(self, bucket: str) -> float:
+        """Estimated seconds until a new call on this bucket would run."""
+        depth = self.queue_depth(bucket)
+        token_bucket = self._bucket(bucket)
+        return token_bucket.wait_time(depth + 1)
+
+    def queue_depth(self, bucket: Optional[str] = None) -> int:
+        """Number of deferred calls waiting, for one bucket or all of them."""
+        with self._condition:
+            if bucket is not None:
+                return len(self._queues[bucket])
+            return sum(len(queue) for queue in self._queues.values())
+
+    def submit(self, bucket: str, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        """
+        Run fn on a worker thread, at once if within budget, otherwise queued.
+
+        Args:
+            bucket: Budget to charge ('read', 'write', 'auth', 'imgbb', 'background')
+            fn: Callable to run
+
+        Returns:
+            Future resolved with fn's result or exception
+        """
+        future: Future = Future()
+        if self.try_acquire(bucket):
+            self._ensure_executor().submit(self._run, future, fn, args, kwargs)
+            return future
+
+        with self._condition:
+            self._queues[bucket].append((future, fn, args, kwargs))
+            logger.info(f"Deferred '{bucket}' call (queue depth: {len(self._queues[bucket])})")
+            self._ensure_dispatcher()
+            self._condition.notify()
+        return future
+
+    @staticmethod
+    def _run(future: Future, fn: Callable, args: tuple, kwargs: dict) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        with self._condition:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix='rate-limited'
+                )
+            return self._executor
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._ensure_executor()
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop, name='rate-limit-dispatcher', daemon=True
+            )
+            self._dispatcher.start()
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._condition:
+                next_wait = None
+                ready = []
+                for name, queue in self._queues.items():
+                    while queue and self._buckets[name].try_acquire():
+                        ready.append(queue.popleft())
+                    if queue:
+                        wait = self._buckets[name].wait_time()
+                        next_wait = wait if next_wait is None else min(next_wait, wait)
+
+                if not ready:
+                    if next_wait is None:
+                        # Nothing queued; park until submit() wakes us
+                        self._condition.wait()
+                    else:
+                        self._condition.wait(timeout=max(next_wait, 0.01))
+                    continue
+
+            for future, fn, args, kwargs in ready:
+                self._executor.submit(self._run, future, fn, args, kwargs)
+
+# Shared limiter so every caller draws from the same per-endpoint budgets
+rate_limiter = RateLimiter()
@@ -0,0 +1,141 @@
+from concurrent.futures import Future
+from collections import deque
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, List, Optional
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Priority(IntEnum):
+    """Request classes; lower values are always dispatched first."""
+    INTERACTIVE = 0   # user clicked something and is waiting
+    BACKGROUND = 1    # notification scans, retention sweeps, avatar fetches
+
+# Maximum requests of each class running at the same time
+DEFAULT_CONCURRENCY: Dict[Priority, int] = {
+    Priority.INTERACTIVE: 4,
+    Priority.BACKGROUND: 2,
+}
+
+class RequestScheduler:
+    """
+    Dispatches outbound requests by priority class with bounded concurrency.
+
+    Background work only starts when no interactive request is queued or in
+    flight, so a user action never waits behind a sweep or a prefetch.
+    Interactive calls that need their result on the spot can use
+    run_interactive(), which runs inline but still holds background work off.
+    """
+
+    def __init__(self, concurrency: Optional[Dict[Priority, int]] = None):
+        """
+        Initialize the scheduler; worker threads start on first use.
+
+        Args:
+            concurrency: Maximum concurrent requests per priority class
+        """
+        self._limits = dict(DEFAULT_CONCURRENCY)
+        self._limits.update(concurrency or {})
+        self._queues: Dict[Priority, Deque] = {priority: deque() for priority in Priority}
+        self._active: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self._condition = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._shutdown = False
+
+    def submit(self, fn: Callable, *args: Any,
+               priority: Priority = Priority.BACKGROUND, **kwargs: Any) -> Future:
+        """
+        Queue fn to run on a worker thread.
+
+        Args:
+            fn: Callable making the request
+            priority: Request class
+
+        Returns:
+            Future resolved with fn's result or exception
+        """
+        future: Future = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Scheduler has been shut down")
+            self._queues[priority].append((future, fn, args, kwargs))
+            self._ensure_workers()
+            self._condition.notify_all()
+        return future
+
+    def run_interactive(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run fn on the calling thread as an interactive request."""
+        with self._condition:
+            self._active[Priority.INTERACTIVE] += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._condition:
+                self._active[Priority.INTERACTIVE] -= 1
+                self._condition.notify_all()
+
+    def pending(self, priority: Optional[Priority] = None) -> int:
+        """Number of queued (not yet running) requests."""
+        with self._condition:
+            if priority is not None:
+                return len(self._queues[priority])
+            return sum(len(queue) for queue in self._queues.values())
+
+    def shutdown(self) -> None:
+        """Stop workers after they finish their current request; queued work is cancelled."""
+        with self._condition:
+            self._shutdown = True
+            for queue in self._queues.values():
+                while queue:
+                    queue.popleft()[0].cancel()
+            self._condition.notify_all()
+
+    def _ensure_workers(self) -> None:
+        wanted = sum(self._limits.values())
+        while len(self._workers) < wanted:
+            worker = threading.Thread(
+                target=self._work_loop, name=f'request-worker-{len(self._workers)}', daemon=True
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _interactive_busy(self) -> bool:
+        return bool(self._queues[Priority.INTERACTIVE]) or self._active[Priority.INTERACTIVE] > 0
+
+    def _next_item(self):
+        """Pick the next runnable request; caller holds the condition."""
+        for priority in Priority:
+            queue = self._queues[priority]
+            if not queue or self._active[priority] >= self._limits[priority]:
+                continue
+            if priority != Priority.INTERACTIVE and self._interactive_busy():
+                return None
+            return priority, queue.popleft()
+        return None
+
+    def _work_loop(self) -> None:
+        while True:
+            with self._condition:
+                picked = self._next_item()
+                while picked is None and not self._shutdown:
+                    self._condition.wait()
+                    picked = self._next_item()
+                if picked is None:
+                    return
+                priority, (future, fn, args, kwargs) = picked
+                self._active[priority] += 1
+
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args, **kwargs))
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                with self._condition:
+                    self._active[priority] -= 1
+                    self._condition.notify_all()
+
+# Shared scheduler so all screens compete for the same worker slots
+request_scheduler = RequestScheduler()
@@ -0,0 +1,86 @@
+from typing import Any, Callable, Optional
+import random
+import time
+import logging
+from service_errors import AuthError, ServiceError, classify_error
+
+logger = logging.getLogger(__name__)
+
+class RetryPolicy:
+    """Retries transient failures with capped exponential backoff and full jitter."""
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5,
+                 max_delay: float = 8.0, jitter: bool = True,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts: Total attempts including the first one
+            base_delay: Delay before the first retry, in seconds
+            max_delay: Upper bound for any single delay
+            jitter: Randomize delays so clients don't retry in lockstep
+            sleep: Function used to wait between attempts
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.sleep = sleep
+
+    def backoff(self, attempt: int, error: Optional[ServiceError] = None) -> float:
+        """
+        Delay before retry number `attempt` (0-based).
+
+        Honors a server-provided Retry-After when it is longer, within max_delay.
+        """
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if error is not None and error.retry_after:
+            delay = max(delay, min(self.max_delay, error.retry_after))
+        return delay
+
+    def should_retry(self, error: ServiceError, attempt: int) -> bool:
+        """Only transient errors are retried, and only while attempts remain."""
+        return error.retryable and attempt + 1 < self.max_attempts
+
+    def call(self, fn: Callable[..., Any], *args: Any,
+             on_auth_error: Optional[Callable[[], bool]] = None, **kwargs: Any) -> Any:
+        """
+        Call fn, retrying transient failures.
+
+        Args:
+            fn: Callable to run
+            on_auth_error: Called once on the first AuthError; return True if
+                credentials were refreshed and the call should be repeated
+
+        Returns:
+            Result of fn
+
+        Raises:
+            ServiceError: Classified error once retries are exhausted or the
+                failure is not transient
+        """
+        attempt = 0
+        auth_refreshed = False
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                error = classify_error(e)
+
+                if isinstance(error, AuthError) and on_auth_error and not auth_refreshed:
+                    auth_refreshed = True
+                    if on_auth_error():
+                        continue
+
+                if not self.should_retry(error, attempt):
+                    if error is e:
+                        raise
+                    raise error from e
+
+                delay = self.backoff(attempt, error)
+                logger.warning(f"{type(error).__name__} ({error}); retrying in {delay:.2f}s")
+                self.sleep(delay)
+                attempt += 1
@@ -1,36 +1,58 @@
+import import_report
+# Must run before the heavy imports below so they are timed
+import_report.install_from_env()
 import sys
-from PyQt6.QtWidgets import QApplication, QStackedWidget, QMessageBox
+from PyQt6.QtWidgets import QApplication, QMessageBox
 from ui.login_ui import LoginWindow
-from ui.main_ui import TaskManager
+from ui.lazy_stack import LazyStackedWidget
+from ui.theme import apply_theme
 from utils import SessionManager
-from ui.account_ui import AccountManager
-from firebase_config import current_user, initialize_firebase, firebase
+from firebase_config import current_user, get_firebase, load_config, verify_api_key
+from startup import StartupOrchestrator
 from pathlib import Path
 import logging
-from PyQt6.QtGui import QIcon
+from PyQt6.QtGui import QFontDatabase, QIcon
+from PyQt6.QtCore import QTimer
 import os
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def check_firebase_config():
+    if not verify_api_key(load_config()):
+        raise ValueError("Invalid API key configuration")
+
+def initialize_services():
+    # Imports and initializes pyrebase off the GUI thread
+    if get_firebase() is None:
+        raise RuntimeError("Firebase initialization failed")
+
+def warm_font_database():
+    # The first font lookup scans the system fonts; do it before any screen needs it
+    QFontDatabase.families()
+
+def open_http_pool():
+    # requests is a large import; keep it off the path to the first window
+    from http_client import get_http_session
+    get_http_session()
+
+def open_caches():
+    from image_cache import get_image_cache
+    from image_upload import get_upload_index
+    get_image_cache()
+    get_upload_index()
+
 class ToDoListApp(QApplication):
     """Main application class."""
     
     def __init__(self, sys_argv):
         super().__init__(sys_argv)
-        self.widget_stack = QStackedWidget()
+        # One application stylesheet, parsed once before any widget exists
+        apply_theme(self)
+        self.widget_stack = LazyStackedWidget()
         self.session_manager = SessionManager()
         
-        # Verify Firebase initialization
-        if not firebase:
-            logger.error("Firebase initialization failed!")
-            QMessageBox.critical(None, "Error", 
-                               "Failed to initialize Firebase. Please check your configuration!")
-            sys.exit(1)
-            
-        # Log Firebase status
-        logger.info("Firebase initialized successfully")
         logger.info(f"Current user state: {current_user}")
         
         # Set application icon
@@ -49,30 +71,33 @@ class ToDoListApp(QApplication):
         
         self.init_ui()
         
+        # The login screen is already up; everything else starts in the background
+        self.startup = self.build_startup()
+        self.startup.start()
+        
         # Handle application exit
         self.aboutToQuit.connect(self.cleanup)
         
+        if import_report.is_enabled():
+            # Runs once the event loop has shown the first window
+            QTimer.singleShot(0, import_report.report)
+        
     def init_ui(self):
         try:
-            # Add Login Window to the stack
+            # Only the login screen is built up front; the other screens are
+            # built on first navigation
             self.login_window = LoginWindow(self)
-            self.widget_stack.addWidget(self.login_window)
-
-            # Add Task Manager Window to the stack
-            self.task_manager = TaskManager(self)
-            self.widget_stack.addWidget(self.task_manager)
-
-            # Add Account Manager to the stack
-            self.account_manager = AccountManager(self, self.widget_stack)
-            self.widget_stack.addWidget(self.account_manager)
+            self.widget_stack.register('login', lambda: self.login_window)
+            self.widget_stack.register('tasks', self.build_task_manager)
+            self.widget_stack.register('account', self.build_account_manager)
 
             # Check for existing session
             session = self.session_manager.load_session()
             if session and session.get('logged_in'):
                 self.task_manager.set_user_id(session['user_id'])
-                self.widget_stack.setCurrentWidget(self.task_manager)
+                self.widget_stack.show_page('tasks')
             else:
-                self.widget_stack.setCurrentWidget(self.login_window)
+                self.widget_stack.show_page('login')
 
             self.widget_stack.setFixedSize(800, 600)
             self.widget_stack.show()
@@ -83,6 +108,54 @@ class ToDoListApp(QApplication):
                                f"Failed to initialize application: {str(e)}")
             sys.exit(1)
 
+    def build_startup(self) -> StartupOrchestrator:
+        """Start-up work that can run after the login screen is shown"""
+        startup = StartupOrchestrator(self)
+        startup.add('config', check_firebase_config)
+        startup.add('firebase', initialize_services, requires=['config'])
+        startup.add('fonts', warm_font_database)
+        startup.add('http_pool', open_http_pool)
+        startup.add('caches', open_caches)
+        # The task screen comes right after login; build it while the user types
+        startup.add('task_screen', lambda: self.widget_stack.page('tasks'),
+                    requires=['fonts'], gui=True)
+        startup.when_ready('config', self.handle_config_checked)
+        return startup
+
+    def handle_config_checked(self, ok):
+        """Quit with an error if Firebase cannot be configured"""
+        if not ok:
+            logger.error("Firebase configuration is invalid!")
+            QMessageBox.critical(None, "Error", 
+                               "Failed to initialize Firebase. Please check your configuration!")
+            self.exit(1)
+
+    @property
+    def task_manager(self):
+        """Task screen, built on first use."""
+        return self.widget_stack.page('tasks')
+
+    @property
+    def account_manager(self):
+        """Account screen, built on first use."""
+        return self.widget_stack.page('account')
+
+    def build_task_manager(self):
+        from ui.main_ui import TaskManager
+        return TaskManager(self)
+
+    def build_account_manager(self):
+        from ui.account_ui import AccountManager
+        return AccountManager(self, self.widget_stack)
+
+    def show_account_manager(self):
+        """Switch to the account screen"""
+        self.widget_stack.show_page('account')
+
+    def show_task_manager(self):
+        """Switch back to the task screen"""
+        self.widget_stack.show_page('tasks')
+
     def switch_to_task_manager(self, user_id, email=None):
         """Switch to task manager view"""
         logger.info(f"\n=== Switching to Task Manager ===")
@@ -115,8 +188,10 @@ class ToDoListApp(QApplication):
             # Reset current_user
             current_user = None
             
-            # Reset task manager state
-            self.task_manager.set_user_id(None)
+            # Reset task manager state, if it was ever shown
+            task_manager = self.widget_stack.built_page('tasks')
+            if task_manager:
+                task_manager.set_user_id(None)
             
             # Switch to login window
             self.widget_stack.setCurrentWidget(self.login_window)
@@ -141,6 +216,9 @@ class ToDoListApp(QApplication):
                         file.unlink()
                     except Exception as e:
                         logger.error(f"Failed to delete temp file {file}: {e}")
+            
+            # Persist any session update still waiting in the write-behind queue
+            self.session_manager.flush()
                         
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
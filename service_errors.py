@@ -0,0 +1,118 @@
+from typing import Optional
+import json
+
+class ServiceError(Exception):
+    """Base class for classified Firebase / ImgBB failures."""
+
+    # Whether repeating the same request may succeed
+    retryable = False
+
+    def __init__(self, message: str, status_code: Optional[int] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+class AuthError(ServiceError):
+    """Token missing, expired or rejected (401/403). Fix by refreshing the token."""
+
+class QuotaExceededError(ServiceError):
+    """Server asked us to slow down (429)."""
+    retryable = True
+
+class ServerError(ServiceError):
+    """Server-side failure (5xx)."""
+    retryable = True
+
+class NetworkError(ServiceError):
+    """Connection failure or timeout before a response arrived."""
+    retryable = True
+
+class ClientError(ServiceError):
+    """Request rejected for a reason retrying won't fix (other 4xx)."""
+
+# Substrings that identify auth failures when no status code is available
+_AUTH_MARKERS = (
+    'permission denied', 'invalid token', 'token expired', 'auth token is expired',
+    'not authenticated', 'no valid authentication token', 'invalid_id_token',
+    'token_expired', 'unauthorized',
+)
+
+def _status_code(error: Exception) -> Optional[int]:
+    """Find the HTTP status of a requests error, including pyrebase's re-wrapped ones."""
+    candidates = [error] + [arg for arg in getattr(error, 'args', ()) if isinstance(arg, Exception)]
+    for candidate in candidates:
+        response = getattr(candidate, 'response', None)
+        if response is not None and getattr(response, 'status_code', None):
+            return response.status_code
+    return None
+
+def _retry_after(error: Exception) -> Optional[float]:
+    candidates = [error] + [arg for arg in getattr(error, 'args', ()) if isinstance(arg, Exception)]
+    for candidate in candidates:
+        response = getattr(candidate, 'response', None)
+        if response is not None:
+            try:
+                return float(response.headers.get('Retry-After'))
+            except (TypeError, ValueError, AttributeError):
+                return None
+    return None
+
+def _error_message(error: Exception) -> str:
+    """Prefer the server's error text (pyrebase puts the body in args[1])."""
+    args = getattr(error, 'args', ())
+    if len(args) > 1 and isinstance(args[1], str):
+        try:
+            body = json.loads(args[1])
+            detail = body.get('error') if isinstance(body, dict) else None
+            if isinstance(detail, dict):
+                detail = detail.get('message')
+            if detail:
+                return str(detail)
+        except ValueError:
+            return args[1]
+    return str(error)
+
+def classify_error(error: Exception) -> ServiceError:
+    """
+    Map an arbitrary exception from pyrebase/requests onto a typed ServiceError.
+
+    Args:
+        error: Exception raised by an outbound call
+
+    Returns:
+        ServiceError subclass describing the failure
+    """
+    if isinstance(error, ServiceError):
+        return error
+
+    # Imported here so the failure types don't pull requests into start-up
+    import requests
+
+    message = _error_message(error)
+
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return NetworkError(message)
+
+    status = _status_code(error)
+    if status is not None:
+        if status in (401, 403):
+            return AuthError(message, status)
+        if status == 429:
+            return QuotaExceededError(message, status, _retry_after(error))
+        if status >= 500:
+            return ServerError(message, status)
+        if status >= 400:
+            return ClientError(message, status)
+
+    lowered = message.lower()
+    if '401' in lowered or any(marker in lowered for marker in _AUTH_MARKERS):
+        return AuthError(message, status)
+    if '429' in lowered or 'too many' in lowered:
+        return QuotaExceededError(message, status)
+
+    return ServiceError(message, status)
+
+def is_auth_error(error: Exception) -> bool:
+    """Whether an exception means the user's session is no longer valid."""
+    return isinstance(classify_error(error), AuthError)
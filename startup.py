@@ -0,0 +1,175 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+import logging
+import time
+import import_report
+from ui.workers import deliver
+
+logger = logging.getLogger(__name__)
+
+STARTUP_WORKERS = 4
+
+class StartupStep:
+    """One unit of start-up work and the steps it waits for."""
+
+    def __init__(self, name: str, run: Callable[[], object], requires: Sequence[str] = (),
+                 gui: bool = False):
+        """
+        Args:
+            name: Step name other steps refer to
+            run: Does the work; raising marks the step (and its dependents) failed
+            requires: Steps that must succeed first
+            gui: Run on the GUI thread (widget work) instead of a worker
+        """
+        self.name = name
+        self.run = run
+        self.requires = tuple(requires)
+        self.gui = gui
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.error: Optional[Exception] = None
+
+    @property
+    def done(self) -> bool:
+        return self.finished is not None
+
+    @property
+    def ok(self) -> bool:
+        return self.done and self.error is None
+
+class StartupOrchestrator(QObject):
+    """
+    Runs start-up steps as a dependency graph.
+
+    Each step starts as soon as everything it requires has succeeded, so
+    independent work (config parsing, fonts, HTTP pool, caches) overlaps
+    instead of running one after another before the first window. Worker
+    steps run on a small thread pool; GUI steps are queued on the event
+    loop. A step that fails also fails everything that depends on it.
+    """
+
+    step_finished = pyqtSignal(str, bool)  # name, succeeded
+    finished = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._steps: Dict[str, StartupStep] = {}
+        self._waiters: Dict[str, List[Callable[[bool], None]]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._started_at = 0.0
+        self._complete = False
+
+    def add(self, name: str, run: Callable[[], object], requires: Sequence[str] = (),
+            gui: bool = False) -> None:
+        """Register a step; all steps must be added before start()."""
+        self._steps[name] = StartupStep(name, run, requires, gui)
+
+    def is_ready(self, name: str) -> bool:
+        step = self._steps.get(name)
+        return bool(step and step.ok)
+
+    def when_ready(self, name: str, callback: Callable[[bool], None]) -> None:
+        """
+        Call back on the GUI thread once a step has finished.
+
+        Args:
+            name: Step to wait for
+            callback: Called with True if the step succeeded, False if it failed
+        """
+        step = self._steps[name]
+        if step.done:
+            callback(step.ok)
+        else:
+            self._waiters.setdefault(name, []).append(callback)
+
+    def start(self) -> None:
+        """Start every step whose requirements are met. Call on the GUI thread."""
+        for step in self._steps.values():
+            missing = [name for name in step.requires if name not in self._steps]
+            if missing:
+                raise ValueError(f"Startup step '{step.name}' requires unknown steps {missing}")
+        self._started_at = time.perf_counter()
+        self._executor = ThreadPoolExecutor(max_workers=STARTUP_WORKERS,
+                                            thread_name_prefix='startup')
+        self._schedule()
+
+    def _schedule(self) -> None:
+        for step in self._steps.values():
+            if step.started is not None:
+                continue
+            requirements = [self._steps[name] for name in step.requires]
+            if any(required.done and not required.ok for required in requirements):
+                step.started = time.perf_counter()
+                self._finish(step, RuntimeError(f"requirement of '{step.name}' failed"))
+            elif all(required.ok for required in requirements):
+                step.started = time.perf_counter()
+                if step.gui:
+                    # Yield to pending events (painting, input) before widget work
+                    QTimer.singleShot(0, lambda step=step: self._run_gui_step(step))
+                else:
+                    deliver(self._executor.submit(step.run),
+                            lambda _, step=step: self._finish(step),
+                            lambda error, step=step: self._finish(step, error))
+
+    def _run_gui_step(self, step: StartupStep) -> None:
+        try:
+            step.run()
+        except Exception as e:
+            self._finish(step, e)
+        else:
+            self._finish(step)
+
+    def _finish(self, step: StartupStep, error: Optional[Exception] = None) -> None:
+        step.finished = time.perf_counter()
+        step.error = error
+        if error is None:
+            logger.info(f"Startup step '{step.name}' ready in {self._elapsed_ms(step):.0f} ms")
+        else:
+            logger.error(f"Startup step '{step.name}' failed: {error}")
+        import_report.mark(f"startup step {step.name}")
+
+        self.step_finished.emit(step.name, error is None)
+        for callback in self._waiters.pop(step.name, []):
+            try:
+                callback(error is None)
+            except Exception as e:
+                logger.error(f"Error in startup callback for '{step.name}': {e}")
+
+        if all(other.done for other in self._steps.values()):
+            # Callbacks may run nested event loops (dialogs) that get here first
+            if self._complete:
+                return
+            self._complete = True
+            self._executor.shutdown(wait=False)
+            logger.info(self.summary())
+            self.finished.emit()
+        else:
+            self._schedule()
+
+    def _elapsed_ms(self, step: StartupStep) -> float:
+        return ((step.finished or time.perf_counter()) - (step.started or self._started_at)) * 1000
+
+    def critical_path(self) -> List[str]:
+        """Chain of steps that determined when start-up finished."""
+        finished = [step for step in self._steps.values() if step.done]
+        if not finished:
+            return []
+        step = max(finished, key=lambda s: s.finished)
+        path = [step.name]
+        while step.requires:
+            step = max((self._steps[name] for name in step.requires),
+                       key=lambda s: s.finished or 0)
+            path.append(step.name)
+        return path[::-1]
+
+    def summary(self) -> str:
+        """One-line timing report of the whole graph."""
+        total = max((step.finished for step in self._steps.values() if step.done),
+                    default=self._started_at) - self._started_at
+        steps = ', '.join(
+            f"{step.name} {self._elapsed_ms(step):.0f}ms" + ("" if step.ok else " (failed)")
+            for step in sorted(self._steps.values(), key=lambda s: s.finished or 0)
+        )
+        return (f"Startup finished in {total * 1000:.0f} ms; critical path "
+                f"{' -> '.join(self.critical_path())}; steps: {steps}")
@@ -0,0 +1,113 @@
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Set, Tuple
+
+# Above this many inserts and moves, replacing the whole list is cheaper
+DEFAULT_MAX_OPERATIONS = 500
+
+class TaskDiff:
+    """
+    Operations that turn a displayed task list into a new one.
+
+    Apply in order: removals, then steps, then updates. Steps are
+    ('insert', index, task) or ('move', from_index, to_index), each relative
+    to the list as left by the previous step.
+    """
+
+    def __init__(self, removed: List[str], steps: List[Tuple], updated: List[Tuple[str, Dict]],
+                 reset: bool = False):
+        self.removed = removed
+        self.steps = steps
+        self.updated = updated
+        # Too many changes to apply one by one; replace everything instead
+        self.reset = reset
+
+    def is_empty(self) -> bool:
+        return not (self.removed or self.steps or self.updated or self.reset)
+
+    def __repr__(self) -> str:
+        if self.reset:
+            return "TaskDiff(reset)"
+        inserts = sum(1 for step in self.steps if step[0] == 'insert')
+        return (f"TaskDiff(removed={len(self.removed)}, inserted={inserts}, "
+                f"moved={len(self.steps) - inserts}, updated={len(self.updated)})")
+
+def _stable_positions(sequence: Sequence[int]) -> Set[int]:
+    """Indices of one longest increasing subsequence (rows that need not move)."""
+    tails: List[int] = []      # smallest tail value of an increasing run of each length
+    tail_index: List[int] = []
+    previous = [-1] * len(sequence)
+    for i, value in enumerate(sequence):
+        length = bisect_left(tails, value)
+        if length == len(tails):
+            tails.append(value)
+            tail_index.append(i)
+        else:
+            tails[length] = value
+            tail_index[length] = i
+        previous[i] = tail_index[length - 1] if length else -1
+    stable = set()
+    i = tail_index[-1] if tail_index else -1
+    while i >= 0:
+        stable.add(i)
+        i = previous[i]
+    return stable
+
+def diff_tasks(old: Sequence[Dict], new: Sequence[Dict], ordered: bool = True,
+               max_operations: int = DEFAULT_MAX_OPERATIONS) -> TaskDiff:
+    """
+    Compare two task lists by 'key'.
+
+    Args:
+        old: Tasks currently displayed
+        new: Tasks that should be displayed
+        ordered: Whether the position in `new` matters; when False, tasks
+            that stay keep their place and new ones are appended
+        max_operations: Limit on inserts plus moves before a reset is
+            suggested instead
+
+    Returns:
+        TaskDiff with the minimal removals, moves, inserts and updates
+    """
+    new_by_key = {task['key']: task for task in new}
+    old_by_key = {task['key']: task for task in old}
+
+    removed = [key for key in old_by_key if key not in new_by_key]
+    updated = [(key, task) for key, task in new_by_key.items()
+               if key in old_by_key and old_by_key[key] != task]
+
+    inserts = [task for task in new if task['key'] not in old_by_key]
+    current = [task['key'] for task in old if task['key'] in new_by_key]
+
+    if not ordered:
+        if len(inserts) > max_operations:
+            return TaskDiff([], [], [], reset=True)
+        steps = [('insert', len(current) + i, task) for i, task in enumerate(inserts)]
+        return TaskDiff(removed, steps, updated)
+
+    # Keys already in the right relative order stay put; everything else moves
+    new_position = {task['key']: i for i, task in enumerate(new)}
+    stable_indices = _stable_positions([new_position[key] for key in current])
+    settled = {current[i] for i in stable_indices}
+    if len(inserts) + len(current) - len(settled) > max_operations:
+        return TaskDiff([], [], [], reset=True)
+
+    steps: List[Tuple] = []
+    for i, task in enumerate(new):
+        key = task['key']
+        if key in settled:
+            continue
+        # Every task before this one in `new` is already in place
+        if key in old_by_key:
+            source = current.index(key)
+            current.pop(source)
+            target = current.index(new[i - 1]['key']) + 1 if i else 0
+            if target != source:
+                steps.append(('move', source, target))
+            current.insert(target, key)
+        else:
+            target = current.index(new[i - 1]['key']) + 1 if i else 0
+            steps.append(('insert', target, task))
+            current.insert(target, key)
+        settled.add(key)
+
+    return TaskDiff(removed, steps, updated)
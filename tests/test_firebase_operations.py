@@ -0,0 +1,40 @@
+import threading
+
+from circuit_breaker import CircuitBreaker
+from firebase_operations import RateLimitedFirebaseOperations
+from rate_limiter import RateLimiter
+from request_scheduler import RequestScheduler
+from retry_policy import RetryPolicy
+from service_errors import ServerError
+
+class FakeSessionManager:
+    def get_current_token(self):
+        return 'token'
+
+    def get_valid_token(self):
+        return 'token'
+
+def test_submit_operation_retries_503_off_the_calling_thread():
+    threads = []
+    attempts = []
+    scheduler = RequestScheduler()
+    ops = RateLimitedFirebaseOperations(FakeSessionManager(), RateLimiter({'write': (1, 5)}), scheduler)
+    ops.breaker = CircuitBreaker('test-firebase')
+    ops.retry_policy = RetryPolicy(max_attempts=3, base_delay=0, jitter=False,
+                                   sleep=lambda delay: threads.append(threading.current_thread()))
+
+    def remove(token):
+        threads.append(threading.current_thread())
+        attempts.append(token)
+        if len(attempts) < 3:
+            raise ServerError("Service Unavailable", status_code=503)
+        return 'removed'
+
+    try:
+        assert ops.submit_operation(remove).result(timeout=5) == 'removed'
+    finally:
+        scheduler.shutdown()
+
+    # Two failed attempts with a backoff after each, then the success
+    assert len(attempts) == 3 and len(threads) == 5
+    assert threading.current_thread() not in threads
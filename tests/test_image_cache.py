@@ -0,0 +1,20 @@
+import time
+
+from image_cache import ContentCache
+
+def test_cache_hits_survive_a_restart_for_eviction(tmp_path):
+    cache = ContentCache(tmp_path, max_bytes=250)
+    cache.put('https://example.com/a.png', b'a' * 100)
+    cache.put('https://example.com/b.png', b'b' * 100)
+    # Make a the older entry, then read it; only its file records the hit
+    old = time.time() - 60
+    for entry in cache._index.values():
+        entry['last_access'] = old if entry['url'].endswith('a.png') else old + 1
+    cache._save_index()
+    assert cache.get('https://example.com/a.png') is not None
+
+    restarted = ContentCache(tmp_path, max_bytes=250)
+    restarted.put('https://example.com/c.png', b'c' * 100)
+
+    assert restarted.get('https://example.com/a.png') is not None
+    assert restarted.get('https://example.com/b.png') is None
@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta
+
+from devserver.auth import AuthService
+from firebase_config import TokenManager, token_expiry
+
+def test_expired_token_is_not_valid():
+    service = AuthService(token_lifetime=-60)
+    token = service.sign_up('expired@example.com', 'password123')['idToken']
+    manager = TokenManager()
+    manager.set_token(token)
+
+    assert manager.token_expiry <= token_expiry(token)
+    assert not manager.is_token_valid()
+    # No refresh token to fall back on, so nothing is handed out
+    assert manager.get_token() is None
+
+def test_fresh_token_expires_before_its_exp_claim():
+    token = AuthService(token_lifetime=3600).sign_up('fresh@example.com', 'password123')['idToken']
+    manager = TokenManager()
+    manager.set_token(token)
+
+    assert manager.is_token_valid()
+    assert token_expiry(token) - manager.token_expiry >= timedelta(minutes=4)
+    assert manager.token_expiry > datetime.now()
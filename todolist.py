@@ -1,13 +1,17 @@
+import import_report
+# Must run before the heavy imports below so they are timed
+import_report.install_from_env()
 import sys
-from PyQt6.QtWidgets import QApplication, QStackedWidget
+from PyQt6.QtWidgets import QApplication
 from ui.login_ui import LoginWindow
-from ui.main_ui import TaskManager
+from ui.lazy_stack import LazyStackedWidget
+from ui.theme import apply_theme
 from utils import SessionManager
-from ui.account_ui import AccountManager
 from firebase_config import current_user, token_manager
 from pathlib import Path
 import logging
 from PyQt6.QtGui import QIcon
+from PyQt6.QtCore import QTimer
 import os
 
 logging.basicConfig(level=logging.INFO)
@@ -19,7 +23,9 @@ class ToDoListApp(QApplication):
     
     def __init__(self, sys_argv):
         super().__init__(sys_argv)
-        self.widget_stack = QStackedWidget()
+        # One application stylesheet, parsed once before any widget exists
+        apply_theme(self)
+        self.widget_stack = LazyStackedWidget()
         self.session_manager = SessionManager()
         
         # Set application icon
@@ -44,30 +50,58 @@ class ToDoListApp(QApplication):
         # Handle application exit
         self.aboutToQuit.connect(self.cleanup)
         
+        if import_report.is_enabled():
+            # Runs once the event loop has shown the first window
+            QTimer.singleShot(0, import_report.report)
+        
     def init_ui(self):
-        # Add Login Window to the stack
+        # Only the login screen is built up front; the other screens are
+        # built on first navigation
         self.login_window = LoginWindow(self)
-        self.widget_stack.addWidget(self.login_window)
-
-        # Add Task Manager Window to the stack
-        self.task_manager = TaskManager(self)
-        self.widget_stack.addWidget(self.task_manager)
-
-        # Add Account Manager to the stack
-        self.account_manager = AccountManager(self, self.widget_stack)
-        self.widget_stack.addWidget(self.account_manager)
+        self.widget_stack.register('login', lambda: self.login_window)
+        self.widget_stack.register('tasks', self.build_task_manager)
+        self.widget_stack.register('account', self.build_account_manager)
 
         # Check for existing session
         session = self.session_manager.load_session()
         if session and session.get('logged_in'):
             self.task_manager.set_user_id(session['user_id'])
-            self.widget_stack.setCurrentWidget(self.task_manager)
+            self.widget_stack.show_page('tasks')
         else:
-            self.widget_stack.setCurrentWidget(self.login_window)
+            self.widget_stack.show_page('login')
+            # The task screen comes right after login; build it once the
+            # login screen is on screen
+            self.widget_stack.prewarm('tasks')
 
         self.widget_stack.setFixedSize(800, 600)
         self.widget_stack.show()
 
+    @property
+    def task_manager(self):
+        """Task screen, built on first use."""
+        return self.widget_stack.page('tasks')
+
+    @property
+    def account_manager(self):
+        """Account screen, built on first use."""
+        return self.widget_stack.page('account')
+
+    def build_task_manager(self):
+        from ui.main_ui import TaskManager
+        return TaskManager(self)
+
+    def build_account_manager(self):
+        from ui.account_ui import AccountManager
+        return AccountManager(self, self.widget_stack)
+
+    def show_account_manager(self):
+        """Switch to the account screen"""
+        self.widget_stack.show_page('account')
+
+    def show_task_manager(self):
+        """Switch back to the task screen"""
+        self.widget_stack.show_page('tasks')
+
     def switch_to_task_manager(self, user_id, email=None):
         """Switch to task manager view"""
         print(f"\n=== Switching to Task Manager ===")
@@ -100,8 +134,10 @@ class ToDoListApp(QApplication):
             # Clear token manager
             token_manager.clear()
             
-            # Reset task manager state
-            self.task_manager.set_user_id(None)
+            # Reset task manager state, if it was ever shown
+            task_manager = self.widget_stack.built_page('tasks')
+            if task_manager:
+                task_manager.set_user_id(None)
             
             # Switch to login window
             self.widget_stack.setCurrentWidget(self.login_window)
@@ -128,6 +164,9 @@ class ToDoListApp(QApplication):
                         file.unlink()
                     except Exception as e:
                         logger.error(f"Failed to delete temp file {file}: {e}")
+            
+            # Persist any session update still waiting in the write-behind queue
+            self.session_manager.flush()
                         
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
@@ -2,54 +2,100 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QMessageBox,
     QFormLayout, QLineEdit, QFileDialog, QFrame, QDialog, QTabWidget, QScrollArea
 )
-from PyQt6.QtCore import Qt, QBuffer, QByteArray
-from PyQt6.QtGui import QPixmap, QPainter, QPainterPath, QFont
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage
 from firebase_config import auth, db, current_user, storage
 from ui.modern_widgets import ModernButton, ModernLineEdit
+from ui import theme
 from ui.custom_widgets import show_error, show_success, show_question, ModernDialog
+from service_errors import is_auth_error
+from firebase_operations import RateLimitedFirebaseOperations
+from rate_limiter import RateLimitExceeded
+from image_cache import get_image_cache
+from request_scheduler import Priority, request_scheduler
+from ui.workers import call_in_gui_thread, deliver
+from ui.avatar_renderer import avatar_renderer
+from image_upload import (
+    AVATAR_MAX_DIMENSION, get_upload_index, prepare_image, upload_prepared_image
+)
 import json
 from datetime import datetime
 import os
-import requests
 from PyQt6.QtWidgets import QGraphicsDropShadowEffect
 from PyQt6.QtGui import QColor
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from ui.main_ui import TaskManager
 
+PROFILE_PICTURE_SIZE = 150
+
 class AccountManager(QWidget):
     def __init__(self, app, parent=None):
         super().__init__(parent)
         self.app = app
         self.user_id = None
+        self.firebase_ops = RateLimitedFirebaseOperations(app.session_manager)
+        self._avatar_url = None
+        self._upload_percent = None
         
-        # Get session data
-        session = self.app.session_manager.load_session()
-        if session and session.get('user_id'):
-            self.user_id = session['user_id']
-            
         self.init_ui()
-        
-        # Load user data after UI is initialized
-        if self.user_id:
-            try:
-                # Get user data from Firebase
-                user_data = db.child('users').child(self.user_id).get(token=session['idToken']).val()
-                if user_data:
-                    self.set_user_data(user_data)
-                else:
-                    # If no user data exists, create initial data
-                    user_data = {
-                        'email': session.get('email', ''),
-                        'username': '',
-                        'updated_at': datetime.now().isoformat()
-                    }
-                    db.child('users').child(self.user_id).set(user_data, token=session['idToken'])
-                    self.set_user_data(user_data)
-            except Exception as e:
-                print(f"Error loading user data: {str(e)}")
-                show_error(self, "Error", "Failed to load account data. Please try again!")
-                self.close()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_user_data()
+
+    def refresh_user_data(self):
+        """Load the logged-in user's profile in the background when it changed"""
+        session = self.app.session_manager.load_session()
+        user_id = session.get('user_id') if session else None
+        if not user_id or user_id == self.user_id:
+            return
+
+        self.user_id = user_id
+        self.username_input.clear()
+        self.email_input.setText(session.get('email', ''))
+        self._avatar_url = None
+        self.set_default_profile_picture()
+
+        # Through firebase_ops: charged to the read budget, refreshes the token on 401
+        future = self.firebase_ops.schedule_operation(
+            lambda token: db.child('users').child(user_id).get(token=token).val(),
+            priority=Priority.INTERACTIVE, bucket='read'
+        )
+        deliver(future,
+                lambda user_data: self.apply_user_data(user_id, session, user_data),
+                lambda e: self.fail_user_data_load(user_id, e))
+
+    def apply_user_data(self, user_id, session, user_data):
+        # Ignore results for a user who has since logged out
+        if user_id != self.user_id:
+            return
+        if user_data:
+            self.set_user_data(user_data)
+            return
+
+        # If no user data exists, create initial data
+        user_data = {
+            'email': session.get('email', ''),
+            'username': '',
+            'updated_at': datetime.now().isoformat()
+        }
+        future = self.firebase_ops.schedule_operation(
+            lambda token: db.child('users').child(user_id).set(user_data, token=token),
+            priority=Priority.INTERACTIVE, bucket='write'
+        )
+        deliver(future,
+                lambda _: self.apply_user_data(user_id, session, user_data),
+                lambda e: self.fail_user_data_load(user_id, e))
+
+    def fail_user_data_load(self, user_id, error):
+        if user_id != self.user_id:
+            return
+        print(f"Error loading user data: {str(error)}")
+        # Allow the next visit to try again
+        self.user_id = None
+        show_error(self, "Error", "Failed to load account data. Please try again!")
+        self.go_back()
 
     def init_ui(self):
         self.setWindowTitle("My Account")
@@ -59,12 +105,7 @@ class AccountManager(QWidget):
 
         # Profile section
         profile_container = QWidget()
-        profile_container.setStyleSheet("""
-            QWidget {
-                background-color: white;
-                border-radius: 15px;
-            }
-        """)
+        profile_container.setObjectName("profileCard")
         profile_layout = QVBoxLayout(profile_container)
 
         # Profile picture section
@@ -73,35 +114,18 @@ class AccountManager(QWidget):
         
         self.profile_pic = QLabel()
         self.profile_pic.setFixedSize(150, 150)
-        self.profile_pic.setStyleSheet("""
-            QLabel {
-                background-color: #f8f9fa;
-                border-radius: 75px;
-                border: 2px solid #e0e0e0;
-            }
-        """)
+        self.profile_pic.setObjectName("profilePicture")
         self.set_default_profile_picture()
 
         pic_buttons = QVBoxLayout()
         self.upload_pic_btn = ModernButton("Upload Picture 📸", color="#4a90e2")
         self.remove_pic_btn = ModernButton("Remove Picture ❌", color="#dc3545")
+        # Add a border to make them more visible
+        self.upload_pic_btn.setProperty('framed', True)
+        self.remove_pic_btn.setProperty('framed', True)
         pic_buttons.addWidget(self.upload_pic_btn)
         pic_buttons.addWidget(self.remove_pic_btn)
 
-        # Add some styling to make them more visible
-        self.upload_pic_btn.setStyleSheet(self.upload_pic_btn.styleSheet() + """
-            QPushButton {
-                font-weight: bold;
-                border: 2px solid #4a90e2;
-            }
-        """)
-        self.remove_pic_btn.setStyleSheet(self.remove_pic_btn.styleSheet() + """
-            QPushButton {
-                font-weight: bold;
-                border: 2px solid #dc3545;
-            }
-        """)
-
         pic_layout.addWidget(self.profile_pic)
         pic_layout.addLayout(pic_buttons)
         pic_layout.addStretch()
@@ -125,13 +149,7 @@ class AccountManager(QWidget):
 
         # Buttons
         button_container = QWidget()
-        button_container.setStyleSheet("""
-            QWidget {
-                background-color: #f8f9fa;
-                border-radius: 10px;
-                padding: 15px;
-            }
-        """)
+        button_container.setObjectName("accountButtonBar")
         button_layout = QHBoxLayout(button_container)
         button_layout.setSpacing(15)
         button_layout.setContentsMargins(15, 10, 15, 10)
@@ -180,92 +198,75 @@ class AccountManager(QWidget):
                 self.username_input.setText(user_data.get('username', ''))
                 self.email_input.setText(user_data.get('email', ''))
                 
-                # Load profile picture with timeout and better error handling
+                # Show the placeholder now; the real picture is swapped in when ready
                 profile_url = user_data.get('profile_picture_url')
-                if profile_url:
-                    try:
-                        # Set timeout and headers for better reliability
-                        headers = {
-                            'User-Agent': 'Mozilla/5.0',
-                            'Accept': 'image/webp,image/*,*/*;q=0.8'
-                        }
-                        response = requests.get(
-                            profile_url, 
-                            headers=headers,
-                            timeout=10  # 10 seconds timeout
-                        )
-                        
-                        if response.status_code == 200:
-                            pixmap = QPixmap()
-                            pixmap.loadFromData(response.content)
-                            
-                            # Process image
-                            size = 150
-                            scaled_pixmap = pixmap.scaled(
-                                size, size,
-                                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                                Qt.TransformationMode.SmoothTransformation
-                            )
-                            
-                            # Create mask
-                            final_pixmap = QPixmap(size, size)
-                            final_pixmap.fill(Qt.GlobalColor.transparent)
-                            
-                            painter = QPainter(final_pixmap)
-                            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-                            path = QPainterPath()
-                            path.addEllipse(0, 0, size, size)
-                            painter.setClipPath(path)
-                            
-                            # Center and draw
-                            x = (scaled_pixmap.width() - size) // 2
-                            y = (scaled_pixmap.height() - size) // 2
-                            painter.drawPixmap(-x, -y, scaled_pixmap)
-                            painter.end()
-                            
-                            self.profile_pic.setPixmap(final_pixmap)
-                            self.profile_pic.setStyleSheet("""
-                                QLabel {
-                                    background-color: transparent;
-                                    border-radius: 75px;
-                                    border: 2px solid #e0e0e0;
-                                }
-                            """)
-                        else:
-                            print(f"Failed to load profile picture: {response.status_code}")
-                            self.set_default_profile_picture()
-                            
-                    except requests.Timeout:
-                        print("Profile picture loading timed out")
-                        self.set_default_profile_picture()
-                        
-                    except requests.ConnectionError:
-                        print("Connection error loading profile picture")
-                        self.set_default_profile_picture()
-                        
-                    except Exception as e:
-                        print(f"Error loading profile picture: {str(e)}")
-                        self.set_default_profile_picture()
+                self._avatar_url = profile_url
+                cached = profile_url and avatar_renderer.cached_pixmap(
+                    profile_url, PROFILE_PICTURE_SIZE, self.profile_pic.devicePixelRatioF()
+                )
+                if cached:
+                    self.set_profile_pixmap(cached)
                 else:
                     self.set_default_profile_picture()
+                    if profile_url:
+                        self.load_profile_picture_async(profile_url)
                     
             except Exception as e:
                 print(f"Error setting user data: {str(e)}")
                 show_error(self, "Error", "Failed to load account data. Please try again! 😅")
                 self.app.switch_to_task_manager(self.user_id)
 
+    def load_profile_picture_async(self, profile_url):
+        """Fetch and render the profile picture off the GUI thread"""
+        dpr = self.profile_pic.devicePixelRatioF()
+        future = request_scheduler.submit(
+            self.fetch_profile_image, profile_url, dpr, priority=Priority.BACKGROUND
+        )
+        deliver(
+            future,
+            lambda image: self.show_profile_image(profile_url, dpr, image),
+            lambda e: print(f"Error loading profile picture: {str(e)}")
+        )
+
+    @staticmethod
+    def fetch_profile_image(profile_url, dpr) -> Optional[QImage]:
+        """Runs on a worker thread: get the rendered avatar for this screen's pixel ratio"""
+        # Set headers for better reliability
+        headers = {
+            'User-Agent': 'Mozilla/5.0',
+            'Accept': 'image/webp,image/*,*/*;q=0.8'
+        }
+        return avatar_renderer.render_image(
+            profile_url, PROFILE_PICTURE_SIZE, dpr,
+            lambda: get_image_cache().fetch(
+                profile_url,
+                endpoint='imgbb',
+                headers=headers,
+                timeout=10  # 10 seconds timeout
+            )
+        )
+
+    def show_profile_image(self, profile_url, dpr, image):
+        """Swap the rendered avatar in, unless a newer picture was requested meanwhile"""
+        if profile_url != self._avatar_url:
+            return
+        if image is None:
+            print("Failed to load profile picture")
+            return
+        self.set_profile_pixmap(
+            avatar_renderer.to_pixmap(profile_url, PROFILE_PICTURE_SIZE, dpr, image)
+        )
+
+    def set_profile_pixmap(self, pixmap):
+        """Show a rendered avatar in the profile picture label"""
+        self.profile_pic.setPixmap(pixmap)
+        theme.set_style_property(self.profile_pic, 'hasImage', True)
+
     def set_default_profile_picture(self):
         """Set a default profile picture"""
         self.profile_pic.setText("👤")
         self.profile_pic.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.profile_pic.setStyleSheet("""
-            QLabel {
-                background-color: #f0f0f0;
-                border-radius: 50px;
-                border: 2px solid #ddd;
-                font-size: 40px;
-            }
-        """)
+        theme.set_style_property(self.profile_pic, 'hasImage', False)
 
     def upload_profile_picture(self):
         """Upload a new profile picture using ImgBB"""
@@ -274,78 +275,90 @@ class AccountManager(QWidget):
             "Image Files (*.png *.jpg *.jpeg)"
         )
         if file_name:
-            try:
-                session = self.app.session_manager.load_session()
-                if not session or not session.get('idToken'):
-                    show_error(self, "Error", "Please log in to continue! 🔑")
-                    return
-
-                # Process image in memory
-                pixmap = QPixmap(file_name)
-                size = 150
-                square_pixmap = QPixmap(size, size)
-                square_pixmap.fill(Qt.GlobalColor.transparent)
-                
-                scaled_pixmap = pixmap.scaled(
-                    size, size,
-                    Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                
-                # Create circular mask in memory
-                painter = QPainter(square_pixmap)
-                painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-                path = QPainterPath()
-                path.addEllipse(0, 0, size, size)
-                painter.setClipPath(path)
-                painter.drawPixmap(0, 0, scaled_pixmap)
-                painter.end()
-
-                # Save to bytes and encode as base64
-                byte_array = QByteArray()
-                buffer = QBuffer(byte_array)
-                buffer.open(QBuffer.OpenModeFlag.WriteOnly)
-                square_pixmap.save(buffer, "PNG")
-                
-                # Convert to base64
-                import base64
-                image_data = base64.b64encode(byte_array.data()).decode('utf-8')
-
-                # Upload to ImgBB
-                url = "https://api.imgbb.com/1/upload"
-                payload = {
-                    'key': '5729755a91d2006b103bc300a8ab124e',
-                    'image': image_data
-                }
-                
-                response = requests.post(url, payload)
-                
-                if response.status_code == 200:
-                    image_url = response.json()['data']['url']
-                    
-                    # Store URL in Firebase database
-                    db.child('users').child(session['user_id']).update({
-                        'profile_picture_url': image_url,
-                        'updated_at': datetime.now().isoformat()
-                    }, token=session['idToken'])
-
-                    # Update UI
-                    self.profile_pic.setPixmap(square_pixmap)
-                    self.profile_pic.setStyleSheet("""
-                        QLabel {
-                            background-color: transparent;
-                            border-radius: 75px;
-                            border: 2px solid #e0e0e0;
-                        }
-                    """)
-                    show_success(self, "Success", "Profile picture updated! ✨")
-                else:
-                    print(f"ImgBB API Error: {response.text}")
-                    raise Exception("Failed to upload image")
+            session = self.app.session_manager.load_session()
+            if not session or not session.get('idToken'):
+                show_error(self, "Error", "Please log in to continue! 🔑")
+                return
 
-            except Exception as e:
-                print(f"Error uploading profile picture: {str(e)}")
-                show_error(self, "Error", "Failed to upload profile picture. Please try again! 😅")
+            # Decoding, re-encoding and the upload itself all happen on a worker thread
+            dpr = self.profile_pic.devicePixelRatioF()
+            self.upload_pic_btn.setEnabled(False)
+            self.upload_pic_btn.setText("Preparing... 📸")
+            future = request_scheduler.submit(
+                self.process_profile_upload, file_name, session, dpr,
+                self.report_upload_progress, self.firebase_ops, priority=Priority.INTERACTIVE
+            )
+            deliver(future, self.finish_profile_upload, self.fail_profile_upload)
+
+    def report_upload_progress(self, sent, total):
+        """Called from the upload thread; forwards whole-percent steps to the button"""
+        percent = sent * 100 // total if total else 100
+        if percent != self._upload_percent:
+            self._upload_percent = percent
+            call_in_gui_thread(lambda: self.upload_pic_btn.setText(f"Uploading {percent}% 📸"))
+
+    @staticmethod
+    def process_profile_upload(file_name, session, dpr, progress, firebase_ops):
+        """Runs on a worker thread: shrink, upload, record the URL and pre-render the avatar"""
+        # The same picture picked again is not uploaded twice
+        index = get_upload_index()
+        key = index.key_for_file(file_name, f"avatar{AVATAR_MAX_DIMENSION}")
+        image_url = index.get(key)
+
+        if image_url:
+            load_source = lambda: get_image_cache().fetch(image_url, endpoint='imgbb')
+        else:
+            image = prepare_image(file_name, AVATAR_MAX_DIMENSION)
+
+            # Upload to ImgBB as binary multipart data, retrying from the prepared bytes
+            url = "https://api.imgbb.com/1/upload"
+            fields = {'key': '5729755a91d2006b103bc300a8ab124e'}
+            image_url = upload_prepared_image(url, fields, image, progress)['data']['url']
+            index.put(key, image_url)
+
+            # Seed the cache so the next visit doesn't download it again
+            get_image_cache().put(image_url, image.data)
+            load_source = lambda: image.data
+
+        rendered = avatar_renderer.render_image(
+            image_url, PROFILE_PICTURE_SIZE, dpr, load_source
+        )
+
+        # Store URL in Firebase database; this is a worker thread, so wait
+        # for write budget and retry transient failures
+        profile = {
+            'profile_picture_url': image_url,
+            'updated_at': datetime.now().isoformat()
+        }
+        firebase_ops.submit_operation(
+            lambda token: db.child('users').child(session['user_id']).update(profile, token=token)
+        ).result()
+        return image_url, dpr, rendered
+
+    def finish_profile_upload(self, result):
+        """Show the uploaded picture"""
+        image_url, dpr, rendered = result
+        self.reset_upload_button()
+        self._avatar_url = image_url
+        if rendered is not None:
+            self.set_profile_pixmap(avatar_renderer.to_pixmap(
+                image_url, PROFILE_PICTURE_SIZE, dpr, rendered
+            ))
+        show_success(self, "Success", "Profile picture updated! ✨")
+
+    def fail_profile_upload(self, error):
+        """Report a failed upload"""
+        self.reset_upload_button()
+        print(f"Error uploading profile picture: {str(error)}")
+        if isinstance(error, RateLimitExceeded):
+            show_error(self, "Slow Down", f"Too many uploads. Please try again in {error.retry_after:.0f}s.")
+            return
+        show_error(self, "Error", "Failed to upload profile picture. Please try again! 😅")
+
+    def reset_upload_button(self):
+        self._upload_percent = None
+        self.upload_pic_btn.setText("Upload Picture 📸")
+        self.upload_pic_btn.setEnabled(True)
 
     def remove_profile_picture(self):
         """Remove the profile picture"""
@@ -388,8 +401,7 @@ class AccountManager(QWidget):
             
         except Exception as e:
             print(f"Error updating profile: {str(e)}")
-            error_msg = str(e)
-            if "not authenticated" in error_msg.lower() or "invalid token" in error_msg.lower():
+            if is_auth_error(e):
                 print("Authentication error - redirecting to login")
                 QMessageBox.warning(
                     self, 
@@ -462,15 +474,9 @@ class AccountManager(QWidget):
     def go_back(self):
         """Return to task manager"""
         try:
-            # Get the task manager widget (it should be at index 1)
-            task_manager = self.app.widget_stack.widget(1)
-            if task_manager:
-                self.app.widget_stack.setCurrentWidget(task_manager)
+            self.app.show_task_manager()
         except Exception as e:
             print(f"Error returning to task manager: {e}")
-            # Fallback - try to switch to widget at index 1
-            if self.app.widget_stack.count() > 1:
-                self.app.widget_stack.setCurrentWidget(self.app.widget_stack.widget(1))
 
     def show_app_info(self):
         """Show the welcome/about dialog with tabs"""
@@ -571,85 +577,7 @@ class AccountManager(QWidget):
         
         # Create main container
         container = QWidget()
-        container.setObjectName("container")
-        container.setStyleSheet("""
-            QWidget#container {
-                background-color: white;
-                border-radius: 10px;
-                padding: 10px;
-            }
-            QTabWidget::pane {
-                border: none;
-                background: white;
-                padding: 10px;
-            }
-            QTabWidget::tab-bar {
-                alignment: center;
-            }
-            /* Hide all corner widgets and buttons */
-            QTabWidget::right-corner,
-            QTabWidget::left-corner {
-                width: 0px;
-                border: none;
-                background: transparent;
-            }
-            QTabBar::scroller,
-            QTabBar QToolButton,
-            QTabBar::tear,
-            QTabBar::tear:left,
-            QTabBar::tear:right {
-                width: 0px;
-                height: 0px;
-                border: none;
-                background: transparent;
-            }
-            QTabBar::tab {
-                padding: 8px 16px;
-                margin: 4px 2px;
-                background: #f8f9fa;
-                border: 1px solid #e0e0e0;
-                border-radius: 6px;
-                min-width: 80px;
-                font-size: 13px;
-                color: #2c3e50;
-                font-weight: 500;
-            }
-            QTabBar::tab:selected {
-                background: #4a90e2;
-                color: white;
-                font-weight: bold;
-                border: none;
-            }
-            QTabBar::tab:hover:!selected {
-                background: #e9ecef;
-                color: #4a90e2;
-                border: 1px solid #4a90e2;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: #f0f0f0;
-                width: 8px;
-                border-radius: 4px;
-                margin: 0;
-            }
-            QScrollBar::handle:vertical {
-                background: #c0c0c0;
-                border-radius: 4px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: #a0a0a0;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-            QLabel {
-                font-size: 13px;
-                line-height: 1.5;
-                padding: 10px;
-                color: #2c3e50;
-            }
-        """)
+        container.setObjectName("aboutContainer")
         
         # Add shadow effect
         shadow = QGraphicsDropShadowEffect()
@@ -687,14 +615,7 @@ class AccountManager(QWidget):
             label = QLabel(content)
             label.setWordWrap(True)
             label.setTextFormat(Qt.TextFormat.RichText)
-            label.setStyleSheet("""
-                QLabel {
-                    padding: 20px;
-                    background: #ffffff;
-                    border-radius: 8px;
-                    border: 1px solid #e0e0e0;
-                }
-            """)
+            label.setObjectName("aboutContent")
             label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
             
             content_layout.addWidget(label)
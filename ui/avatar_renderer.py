@@ -0,0 +1,117 @@
+from PyQt6.QtCore import Qt, QBuffer, QByteArray
+from PyQt6.QtGui import QImage, QPainter, QPainterPath, QPixmap, QPixmapCache
+from typing import Callable, Optional
+import logging
+from image_cache import ContentCache, get_image_cache
+
+logger = logging.getLogger(__name__)
+
+def circular_image(source: QImage, pixel_size: int) -> QImage:
+    """
+    Scale and crop an image into a circle of pixel_size physical pixels.
+
+    Uses only QImage, so it is safe to call from worker threads.
+    """
+    scaled = source.scaled(
+        pixel_size, pixel_size,
+        Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+        Qt.TransformationMode.SmoothTransformation
+    )
+
+    # Create mask
+    result = QImage(pixel_size, pixel_size, QImage.Format.Format_ARGB32_Premultiplied)
+    result.fill(Qt.GlobalColor.transparent)
+
+    painter = QPainter(result)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    path = QPainterPath()
+    path.addEllipse(0, 0, pixel_size, pixel_size)
+    painter.setClipPath(path)
+
+    # Center and draw
+    x = (scaled.width() - pixel_size) // 2
+    y = (scaled.height() - pixel_size) // 2
+    painter.drawImage(-x, -y, scaled)
+    painter.end()
+    return result
+
+def encode_png(image: QImage) -> bytes:
+    """Encode a QImage as PNG bytes."""
+    byte_array = QByteArray()
+    buffer = QBuffer(byte_array)
+    buffer.open(QBuffer.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return byte_array.data()
+
+class AvatarRenderer:
+    """
+    Renders circular avatars once per source, logical size and device pixel ratio.
+
+    Rendered images are kept in QPixmapCache for repaints and in the on-disk
+    content cache across runs, so scaling and masking run at most once per
+    variant. Sources are identified by a stable key (normally the image URL;
+    ImgBB URLs never change content).
+    """
+
+    def __init__(self, disk_cache: Optional[ContentCache] = None):
+        self._disk_cache = disk_cache
+
+    @property
+    def disk_cache(self) -> ContentCache:
+        return self._disk_cache or get_image_cache()
+
+    @staticmethod
+    def variant(size: int, dpr: float) -> str:
+        return f"avatar-{size}@{dpr:g}x"
+
+    def cache_key(self, source_key: str, size: int, dpr: float) -> str:
+        return f"{self.variant(size, dpr)}:{source_key}"
+
+    def cached_pixmap(self, source_key: str, size: int, dpr: float) -> Optional[QPixmap]:
+        """Rendered pixmap from memory, or None. GUI thread only."""
+        pixmap = QPixmapCache.find(self.cache_key(source_key, size, dpr))
+        return pixmap if pixmap is not None and not pixmap.isNull() else None
+
+    def render_image(self, source_key: str, size: int, dpr: float,
+                     loader: Callable[[], Optional[bytes]]) -> Optional[QImage]:
+        """
+        Rendered avatar as a QImage, from disk or by rendering the source.
+
+        Safe on worker threads.
+
+        Args:
+            source_key: Stable identifier of the source image
+            size: Logical size in device-independent pixels
+            dpr: Device pixel ratio of the target screen
+            loader: Returns the source image bytes; only called on a disk miss
+
+        Returns:
+            Rendered image with its device pixel ratio set, or None
+        """
+        variant = self.variant(size, dpr)
+        rendered = self.disk_cache.get(source_key, variant)
+        image = QImage.fromData(rendered) if rendered else QImage()
+
+        if image.isNull():
+            source_data = loader()
+            source = QImage.fromData(source_data) if source_data else QImage()
+            if source.isNull():
+                return None
+            image = circular_image(source, round(size * dpr))
+            try:
+                self.disk_cache.put(source_key, encode_png(image), variant)
+            except Exception as e:
+                logger.error(f"Failed to cache rendered avatar: {e}")
+
+        image.setDevicePixelRatio(dpr)
+        return image
+
+    def to_pixmap(self, source_key: str, size: int, dpr: float, image: QImage) -> QPixmap:
+        """Convert a rendered image and keep it in QPixmapCache. GUI thread only."""
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+        QPixmapCache.insert(self.cache_key(source_key, size, dpr), pixmap)
+        return pixmap
+
+# Shared renderer for every place that shows user avatars
+avatar_renderer = AvatarRenderer()
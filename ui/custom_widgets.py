@@ -26,14 +26,7 @@ class ModernDialog(QDialog):
         
         # Create main container
         container = QWidget()
-        container.setObjectName("container")
-        container.setStyleSheet("""
-            QWidget#container {
-                background-color: white;
-                border-radius: 10px;
-                padding: 15px;
-            }
-        """)
+        container.setObjectName("dialogContainer")
         
         # Add shadow effect
         shadow = QGraphicsDropShadowEffect()
@@ -54,7 +47,7 @@ class ModernDialog(QDialog):
         icon_label.setFont(QFont("Arial", 18))
         title_label = QLabel(title)
         title_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-        title_label.setStyleSheet("color: #2c3e50;")
+        title_label.setObjectName("dialogHeading")
         
         title_layout.addWidget(icon_label)
         title_layout.addWidget(title_label)
@@ -63,12 +56,7 @@ class ModernDialog(QDialog):
         # Message
         message_label = QLabel(message)
         message_label.setWordWrap(True)
-        message_label.setStyleSheet("""
-            QLabel {
-                color: #2c3e50;
-                font-size: 12px;
-            }
-        """)
+        message_label.setObjectName("dialogMessage")
         
         # Buttons
         button_layout = QHBoxLayout()
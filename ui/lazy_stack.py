@@ -0,0 +1,80 @@
+from PyQt6.QtWidgets import QStackedWidget, QWidget
+from PyQt6.QtCore import QTimer
+from typing import Callable, Dict, List, Optional
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class LazyStackedWidget(QStackedWidget):
+    """
+    Stacked widget whose pages are built the first time they are needed.
+
+    Pages are registered by name with a factory. A page is constructed when
+    it is first shown or asked for, so only the screen shown at start-up is
+    on the cold-start path. Other pages can be pre-warmed after the first
+    paint, one per event-loop turn, so the UI stays responsive while they
+    are built.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._factories: Dict[str, Callable[[], QWidget]] = {}
+        self._pages: Dict[str, QWidget] = {}
+        self._prewarm_queue: List[str] = []
+        self._painted = False
+
+    def register(self, name: str, factory: Callable[[], QWidget]) -> None:
+        """Register a page; the factory is called on first use."""
+        self._factories[name] = factory
+
+    def is_built(self, name: str) -> bool:
+        return name in self._pages
+
+    def built_page(self, name: str) -> Optional[QWidget]:
+        """The page if it has been constructed, without building it."""
+        return self._pages.get(name)
+
+    def page(self, name: str) -> QWidget:
+        """The page with this name, constructing it if needed."""
+        page = self._pages.get(name)
+        if page is None:
+            started = time.perf_counter()
+            page = self._factories[name]()
+            self._pages[name] = page
+            self.addWidget(page)
+            logger.info(f"Built {name} page in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return page
+
+    def show_page(self, name: str) -> QWidget:
+        """Make a page current, constructing it first if needed."""
+        page = self.page(name)
+        self.setCurrentWidget(page)
+        return page
+
+    def prewarm(self, *names: str) -> None:
+        """Build these pages in the background once the window has painted."""
+        self._prewarm_queue.extend(name for name in names if name not in self._pages)
+        if self._painted:
+            QTimer.singleShot(0, self._prewarm_next)
+
+    def _prewarm_next(self) -> None:
+        while self._prewarm_queue:
+            name = self._prewarm_queue.pop(0)
+            if name in self._pages:
+                continue
+            try:
+                self.page(name)
+            except Exception as e:
+                logger.error(f"Failed to pre-warm {name} page: {e}")
+            break
+        if self._prewarm_queue:
+            # Yield to pending events between pages
+            QTimer.singleShot(0, self._prewarm_next)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            if self._prewarm_queue:
+                QTimer.singleShot(0, self._prewarm_next)
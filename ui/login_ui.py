@@ -13,7 +13,6 @@ from pathlib import Path
 import logging
 import sys
 import os
-import requests.exceptions
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -36,14 +35,7 @@ class PageTitle(QLabel):
         self.setFont(QFont("Arial", 24, QFont.Weight.Bold))
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setMinimumHeight(70)  # Ensure enough height for the text
-        self.setStyleSheet("""
-            QLabel {
-                color: #2c3e50;
-                padding: 15px 0;
-                margin: 10px 0;
-                background: transparent;
-            }
-        """)
+        self.setObjectName("PageTitle")
 
 class LoginWindow(QWidget):
     def __init__(self, app):
@@ -73,11 +65,7 @@ class LoginWindow(QWidget):
 
         self.welcome_label = FadeLabel("TaskMaster")
         self.welcome_label.setFont(QFont("Arial", 42, QFont.Weight.ExtraBold))
-        self.welcome_label.setStyleSheet("""
-            color: #2c3e50;
-            margin: 10px;
-            letter-spacing: 2px;
-        """)
+        self.welcome_label.setObjectName("loginTitle")
         
         # Add shadow effect to welcome label
         shadow = QGraphicsDropShadowEffect(self)
@@ -91,30 +79,14 @@ class LoginWindow(QWidget):
         subtitle.setText('<a href="https://d-techsolutions.agency" style="color: #ff0000; text-decoration: none;">by D-Tech Solutions</a>')
         subtitle.setOpenExternalLinks(True)
         subtitle.setFont(QFont("Arial", 14, QFont.Weight.Medium))
-        subtitle.setStyleSheet("""
-            QLabel {
-                margin-bottom: 5px;
-                letter-spacing: 1px;
-            }
-            QLabel:hover {
-                text-decoration: underline;
-            }
-        """)
+        subtitle.setObjectName("creditLink")
         
         # Add developer credit as clickable link
         dev_credit = QLabel()
         dev_credit.setText('<a href="https://danishahmad.xyz" style="color: #0066cc; text-decoration: none;">And by Danish Ahmad</a>')
         dev_credit.setOpenExternalLinks(True)
         dev_credit.setFont(QFont("Arial", 12, QFont.Weight.Medium))
-        dev_credit.setStyleSheet("""
-            QLabel {
-                margin-bottom: 15px;
-                letter-spacing: 1px;
-            }
-            QLabel:hover {
-                text-decoration: underline;
-            }
-        """)
+        dev_credit.setObjectName("developerLink")
         
         title_layout.addWidget(self.welcome_label, 0, Qt.AlignmentFlag.AlignCenter)
         title_layout.addWidget(subtitle, 0, Qt.AlignmentFlag.AlignCenter)
@@ -124,13 +96,7 @@ class LoginWindow(QWidget):
         
         # Create stacked widget with sliding animation
         self.stacked_widget = QStackedWidget()
-        self.stacked_widget.setStyleSheet("""
-            QStackedWidget {
-                background-color: white;
-                border-radius: 15px;
-                padding: 20px;
-            }
-        """)
+        self.stacked_widget.setObjectName("authPages")
         
         # Login Page
         login_widget = QWidget()
@@ -154,25 +120,9 @@ class LoginWindow(QWidget):
         password_layout.addWidget(self.login_password)
         
         # Add show/hide password button
-        self.show_password_btn = ModernButton("👁️", color="#6c757d")
+        self.show_password_btn = ModernButton("👁️", variant='secondary', size='icon')
         self.show_password_btn.setFixedHeight(45)  # Match height only
         self.show_password_btn.setFixedWidth(50)   # Reasonable width for the icon
-        self.show_password_btn.setStyleSheet("""
-            QPushButton {
-                padding: 8px;
-                border: none;
-                border-radius: 8px;
-                background-color: #6c757d;
-                color: white;
-                font-size: 18px;
-            }
-            QPushButton:hover {
-                background-color: #5a6268;
-            }
-            QPushButton:pressed {
-                background-color: #545b62;
-            }
-        """)
         self.show_password_btn.setCheckable(True)
         self.show_password_btn.clicked.connect(self.toggle_password_visibility)
         password_layout.addWidget(self.show_password_btn)
@@ -187,98 +137,19 @@ class LoginWindow(QWidget):
         forgot_layout.setContentsMargins(0, 0, 0, 0)
         
         self.forgot_password_btn = QPushButton("Forgot Password? ")
-        self.forgot_password_btn.setStyleSheet("""
-            QPushButton {
-                border: none;
-                color: #4a90e2;
-                font-size: 13px;
-                text-decoration: underline;
-                padding: 0;
-                text-align: left;
-                max-width: 150px;
-            }
-            QPushButton:hover {
-                color: #357abd;
-            }
-        """)
+        self.forgot_password_btn.setObjectName("linkButton")
         forgot_layout.addWidget(self.forgot_password_btn)
         forgot_layout.addStretch()
         
         login_layout.addWidget(forgot_container)
         
         # Add buttons
-        self.login_button = ModernButton("Login")
-        self.login_button.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                padding: 15px;
-                text-align: center;
-                border-radius: 8px;
-                font-size: 16px;
-                font-weight: bold;
-                min-width: 120px;
-                margin: 2px;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-                margin: 0px;
-                border: 2px solid #45a049;
-            }
-            QPushButton:pressed {
-                background-color: #3d8b40;
-                margin: 2px;
-            }
-        """)
-        
-        self.guest_button = ModernButton("Continue as Guest")
-        self.guest_button.setStyleSheet("""
-            QPushButton {
-                background-color: #6c757d;
-                color: white;
-                border: none;
-                padding: 15px;
-                text-align: center;
-                border-radius: 8px;
-                font-size: 16px;
-                font-weight: bold;
-                min-width: 120px;
-                margin: 2px;
-            }
-            QPushButton:hover {
-                background-color: #5a6268;
-                margin: 0px;
-                border: 2px solid #5a6268;
-            }
-            QPushButton:pressed {
-                background-color: #545b62;
-                margin: 2px;
-            }
-        """)
-        
-        self.switch_to_signup_button = ModernButton("Create New Account")
-        self.switch_to_signup_button.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: #2196F3;
-                border: 2px solid #2196F3;
-                padding: 12px;
-                text-align: center;
-                border-radius: 8px;
-                font-size: 14px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background-color: #2196F3;
-                color: white;
-            }
-            QPushButton:pressed {
-                background-color: #1976D2;
-                color: white;
-            }
-        """)
+        self.login_button = ModernButton("Login", variant='login', size='large')
+        
+        self.guest_button = ModernButton("Continue as Guest", variant='secondary', size='large')
+        
+        self.switch_to_signup_button = ModernButton("Create New Account", variant='signup', size='large')
+        self.switch_to_signup_button.setProperty('outlined', True)
         
         login_layout.addWidget(self.login_button)
         login_layout.addWidget(self.guest_button)
@@ -318,25 +189,9 @@ class LoginWindow(QWidget):
         signup_password_layout.addWidget(self.signup_password)
         
         # Add show/hide password button for signup
-        self.show_signup_password_btn = ModernButton("👁️", color="#6c757d")
+        self.show_signup_password_btn = ModernButton("👁️", variant='secondary', size='icon')
         self.show_signup_password_btn.setFixedHeight(45)  # Match height only
         self.show_signup_password_btn.setFixedWidth(50)   # Reasonable width for the icon
-        self.show_signup_password_btn.setStyleSheet("""
-            QPushButton {
-                padding: 8px;
-                border: none;
-                border-radius: 8px;
-                background-color: #6c757d;
-                color: white;
-                font-size: 18px;
-            }
-            QPushButton:hover {
-                background-color: #5a6268;
-            }
-            QPushButton:pressed {
-                background-color: #545b62;
-            }
-        """)
         self.show_signup_password_btn.setCheckable(True)
         self.show_signup_password_btn.clicked.connect(self.toggle_signup_password_visibility)
         signup_password_layout.addWidget(self.show_signup_password_btn)
@@ -347,53 +202,10 @@ class LoginWindow(QWidget):
         signup_layout.addWidget(self.signup_confirm_password)
         
         # Add signup button
-        self.signup_button = ModernButton("Sign Up")
-        self.signup_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                border: none;
-                padding: 15px;
-                text-align: center;
-                border-radius: 8px;
-                font-size: 16px;
-                font-weight: bold;
-                min-width: 120px;
-                margin: 2px;
-            }
-            QPushButton:hover {
-                background-color: #1976D2;
-                margin: 0px;
-                border: 2px solid #1976D2;
-            }
-            QPushButton:pressed {
-                background-color: #1565C0;
-                margin: 2px;
-            }
-        """)
-        
-        self.switch_to_login_button = ModernButton("Already have an account? Login")
-        self.switch_to_login_button.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: #4CAF50;
-                border: 2px solid #4CAF50;
-                padding: 12px;
-                text-align: center;
-                border-radius: 8px;
-                font-size: 14px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background-color: #4CAF50;
-                color: white;
-            }
-            QPushButton:pressed {
-                background-color: #45a049;
-                color: white;
-            }
-        """)
+        self.signup_button = ModernButton("Sign Up", variant='signup', size='large')
+        
+        self.switch_to_login_button = ModernButton("Already have an account? Login", variant='login', size='large')
+        self.switch_to_login_button.setProperty('outlined', True)
         
         signup_layout.addWidget(self.signup_button)
         signup_layout.addWidget(self.switch_to_login_button)
@@ -448,6 +260,8 @@ class LoginWindow(QWidget):
 
     def handle_signup(self):
         """Handle signup attempt"""
+        # requests is slow to import; the login screen shouldn't wait for it
+        import requests.exceptions
         email = self.signup_email.text().strip()
         password = self.signup_password.text().strip()
         confirm_password = self.signup_confirm_password.text().strip()
@@ -567,6 +381,7 @@ class LoginWindow(QWidget):
     def handle_login(self):
         """Handle login button click"""
         from firebase_config import is_initialized, auth, db
+        import requests.exceptions
         
         if not is_initialized():
             show_error(self, "Error", "Firebase initialization failed. Please restart the application.")
@@ -1,12 +1,16 @@
 from PyQt6.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QMessageBox, 
-    QLabel, QHeaderView, QFrame, QCheckBox, QInputDialog, QTabWidget, QCalendarWidget, QComboBox, 
-    QDialog, QStyledItemDelegate, QLineEdit, QMenu, QScrollArea
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QAbstractItemView, QMessageBox, 
+    QLabel, QHeaderView, QCheckBox, QInputDialog, QTabWidget, QCalendarWidget, QComboBox, 
+    QDialog, QStyledItemDelegate, QLineEdit, QMenu
 )
 from PyQt6.QtCore import Qt, QTimer, QDate, QEvent
 from PyQt6.QtGui import QFont, QColor
 from ui.modern_widgets import ModernButton, NotificationButton
 from ui.custom_widgets import show_error, show_success, show_question, show_message
+from ui.workers import deliver
+from ui.notification_list import NotificationListModel, NotificationListView
+from ui.task_model import PriorityLevel, TaskSortProxyModel, TaskTableModel, TASK_KEY_ROLE, notes_list
+from ui.task_view import TaskTableView
 from datetime import datetime, timedelta
 from typing import Dict, Optional, TYPE_CHECKING
 import logging
@@ -37,23 +41,13 @@ global_state = GlobalState()
 
 # Import Firebase modules after global state setup
 from firebase_config import db, auth, token_manager
-from firebase_operations import FirebaseOperations
+from firebase_operations import RateLimitedFirebaseOperations
+from rate_limiter import RateLimitExceeded
+from service_errors import AuthError, NetworkError, QuotaExceededError, ServerError, is_auth_error
+from circuit_breaker import CircuitOpenError
 
-class PriorityLevel:
-    URGENT = "Urgent ⚡"
-    HIGH = "High 🔴"
-    MEDIUM = "Medium 🟡"
-    LOW = "Low 🟢"
-    
-    @staticmethod
-    def get_priority_value(text):
-        priorities = {
-            PriorityLevel.URGENT: 1,
-            PriorityLevel.HIGH: 2,
-            PriorityLevel.MEDIUM: 3,
-            PriorityLevel.LOW: 4
-        }
-        return priorities.get(text, 4)
+# Failures of an inline request that mean "try again later", not "you did something wrong"
+UNAVAILABLE_ERRORS = (NetworkError, ServerError, QuotaExceededError, CircuitOpenError)
 
 class DatePickerDialog(QDialog):
     def __init__(self, parent=None):
@@ -78,13 +72,7 @@ class DateDelegate(QStyledItemDelegate):
             # Create a custom dialog for the calendar
             dialog = QDialog()
             dialog.setWindowTitle("Select Due Date")
-            dialog.setStyleSheet("""
-                QDialog {
-                    background-color: white;
-                    border-radius: 10px;
-                    border: 1px solid #e0e0e0;
-                }
-            """)
+            dialog.setObjectName("datePicker")
             
             # Create layout
             layout = QVBoxLayout(dialog)
@@ -92,32 +80,6 @@ class DateDelegate(QStyledItemDelegate):
             # Add calendar widget
             calendar = QCalendarWidget(dialog)
             calendar.setMinimumDate(QDate.currentDate())
-            calendar.setStyleSheet("""
-                QCalendarWidget {
-                    background-color: white;
-                    border: none;
-                }
-                QCalendarWidget QToolButton {
-                    color: #2d3748;
-                    background-color: transparent;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 4px;
-                }
-                QCalendarWidget QToolButton:hover {
-                    background-color: #e9ecef;
-                }
-                QCalendarWidget QMenu {
-                    background-color: white;
-                    border: 1px solid #e0e0e0;
-                    border-radius: 4px;
-                }
-                QCalendarWidget QSpinBox {
-                    border: 1px solid #e0e0e0;
-                    border-radius: 4px;
-                    padding: 2px;
-                }
-            """)
             layout.addWidget(calendar)
             
             # Add buttons
@@ -189,93 +151,38 @@ class NotificationDialog(QDialog):
         self.task_manager = task_manager
         self.setWindowTitle("Notifications")
         self.setMinimumWidth(400)
-        self.setStyleSheet("""
-            QDialog {
-                background-color: white;
-                border-radius: 10px;
-            }
-        """)
+        self.setObjectName("NotificationDialog")
         
         layout = QVBoxLayout(self)
         
         # Header with title and clear button
         header_layout = QHBoxLayout()
         title_label = QLabel("Notifications")
-        title_label.setStyleSheet("font-weight: bold; font-size: 14px;")
+        title_label.setObjectName("dialogTitle")
         clear_btn = ModernButton("Clear All", color="#6c757d")
         clear_btn.clicked.connect(self.clear_notifications)
         header_layout.addWidget(title_label)
         header_layout.addWidget(clear_btn)
         layout.addLayout(header_layout)
         
-        # Create scroll area for notifications
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background-color: white;
-            }
-        """)
-        
-        # Container for notifications
-        container = QWidget()
-        self.notifications_layout = QVBoxLayout(container)
-        self.notifications_layout.setSpacing(2)
-        self.notifications_layout.setContentsMargins(0, 0, 0, 0)
-        
-        if not task_manager.notifications:
-            no_notifications = QLabel("No notifications")
-            no_notifications.setStyleSheet("color: #6c757d; padding: 20px;")
-            no_notifications.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.notifications_layout.addWidget(no_notifications)
-        else:
-            for notif in task_manager.notifications:
-                notif_widget = self.create_notification_widget(notif)
-                self.notifications_layout.addWidget(notif_widget)
-        
-        scroll.setWidget(container)
-        layout.addWidget(scroll)
+        # One view paints every notification; no widgets per item
+        self.notification_model = NotificationListModel(self)
+        self.notification_model.set_notifications(task_manager.notifications)
+        self.notification_list = NotificationListView("No notifications")
+        self.notification_list.setModel(self.notification_model)
+        self.notification_list.clicked.connect(self.handle_notification_click)
+        layout.addWidget(self.notification_list)
         
         # Close button
         close_btn = ModernButton("Close")
         close_btn.clicked.connect(self.accept)
         layout.addWidget(close_btn)
         
-    def create_notification_widget(self, notif):
-        widget = QFrame()
-        widget.setStyleSheet("""
-            QFrame {
-                background-color: #f8f9fa;
-                border-radius: 4px;
-                padding: 8px;
-                margin: 2px;
-            }
-            QFrame:hover {
-                background-color: #e9ecef;
-            }
-        """)
-        widget.setCursor(Qt.CursorShape.PointingHandCursor)  # Set cursor properly
-        
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(8, 4, 8, 4)
-        
-        # Icon and message in one line
-        icon_label = QLabel(notif['icon'])
-        message = QLabel(f"{notif['message']} • {notif['time']}")
-        message.setStyleSheet("color: #4a5568;")
-        
-        layout.addWidget(icon_label)
-        layout.addWidget(message, stretch=1)
-        
-        # Store task key in widget for click handling
-        widget.task_key = notif.get('task_key')
-        
-        # Make widget clickable
-        widget.mousePressEvent = lambda e: self.notification_clicked(notif)
-        
-        return widget
-        
+    def handle_notification_click(self, index):
+        notif = self.notification_model.notification_at(index)
+        if notif:
+            self.notification_clicked(notif)
+            
     def notification_clicked(self, notif):
         if notif.get('task_key'):
             # Close notification dialog
@@ -287,15 +194,7 @@ class NotificationDialog(QDialog):
         """Clear all notifications"""
         self.task_manager.notifications.clear()
         self.task_manager.notification_btn.set_notification_count(0)
-        
-        # Update the UI to show no notifications
-        for i in reversed(range(self.notifications_layout.count())): 
-            self.notifications_layout.itemAt(i).widget().setParent(None)
-        
-        no_notifications = QLabel("No notifications")
-        no_notifications.setStyleSheet("color: #6c757d; padding: 20px;")
-        no_notifications.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.notifications_layout.addWidget(no_notifications)
+        self.notification_model.clear()
 
 class TaskManager(QWidget):
     """Main task management interface."""
@@ -306,7 +205,7 @@ class TaskManager(QWidget):
             super().__init__()
             self.app = app
             self.user_id = None
-            self.firebase_ops = FirebaseOperations(app.session_manager)
+            self.firebase_ops = RateLimitedFirebaseOperations(app.session_manager)
             self.notifications = []
             
             print("Initializing TaskManager...")
@@ -331,7 +230,7 @@ class TaskManager(QWidget):
             # Welcome message
             welcome_label = QLabel("My Tasks")
             welcome_label.setFont(QFont("Arial", 24, QFont.Weight.Bold))
-            welcome_label.setStyleSheet("color: #2c3e50;")
+            welcome_label.setObjectName("pageTitle")
             
             # Account button
             self.account_button = ModernButton("My Account 👤", color="#6c757d")
@@ -342,15 +241,20 @@ class TaskManager(QWidget):
             top_bar.addWidget(self.account_button)
             main_layout.addLayout(top_bar)
 
-            # Create tables first
-            self.task_table = ModernTable()
-            self.completed_table = ModernTable()
+            # Models hold the task data; views only render the visible rows
+            self.task_model = TaskTableModel()
+            self.completed_model = TaskTableModel(completed=True)
+            self.task_table = TaskTableView("No active tasks")
+            self.completed_table = TaskTableView("No completed tasks")
+            
+            # Active tasks are kept ordered by priority, then due date, then creation time
+            self.task_proxy = TaskSortProxyModel()
+            self.task_proxy.setSourceModel(self.task_model)
+            self.task_table.setModel(self.task_proxy)
+            self.completed_table.setModel(self.completed_model)
             
             # Setup tables with columns and formatting
             for table in [self.task_table, self.completed_table]:
-                table.setColumnCount(3)
-                table.setHorizontalHeaderLabels(["Task Name", "Due Date", "Priority"])
-                
                 # Set column widths
                 header = table.horizontalHeader()
                 header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
@@ -359,13 +263,9 @@ class TaskManager(QWidget):
                 table.setColumnWidth(1, 120)
                 table.setColumnWidth(2, 120)
                 
-                # Enable word wrap and adjust row heights
-                table.setWordWrap(True)
-                table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
-                
                 # Connect double-click handler only for active tasks table
                 if table == self.task_table:
-                    table.cellDoubleClicked.connect(self.handle_cell_double_click)
+                    table.doubleClicked.connect(self.handle_cell_double_click)
 
             # Remove the setup_tables call since we're doing it here
             self.setup_delegates()
@@ -373,55 +273,7 @@ class TaskManager(QWidget):
             # Add tab widget with improved styling
             self.tab_widget = QTabWidget()
             self.tab_widget.setFocusPolicy(Qt.FocusPolicy.NoFocus)  # Disable focus
-            self.tab_widget.setStyleSheet("""
-                QTabWidget::pane {
-                    border: none;
-                    border-radius: 10px;
-                    background: white;
-                    padding: 10px;
-                }
-                QTabWidget::tab-bar {
-                    alignment: left;
-                }
-                QTabBar {
-                    background: transparent;
-                }
-                QTabBar::tab {
-                    padding: 10px 20px;
-                    margin: 4px 2px;
-                    background: #f8f9fa;
-                    border: none;
-                    border-radius: 6px;
-                    min-width: 120px;
-                    font-size: 13px;
-                    color: #4a5568;
-                    outline: none;
-                    text-decoration: none;
-                }
-                QTabBar::tab:selected {
-                    background: #4a90e2;
-                    color: white;
-                    font-weight: bold;
-                    border: none;
-                    outline: none;
-                }
-                QTabBar::tab:hover:!selected {
-                    background: #e9ecef;
-                    color: #2d3748;
-                }
-                QTabBar::tab:focus {
-                    outline: none;
-                    border: none;
-                }
-                QTabBar::tab:selected:focus {
-                    outline: none;
-                    border: none;
-                }
-                QTabBar QToolButton {
-                    border: none;
-                    outline: none;
-                }
-            """)
+            self.tab_widget.setObjectName("taskTabs")
 
             # Create tabs
             self.active_tab = QWidget()
@@ -464,13 +316,7 @@ class TaskManager(QWidget):
 
             # Button container
             button_container = QWidget()
-            button_container.setStyleSheet("""
-                QWidget {
-                    background-color: #f8f9fa;
-                    border-radius: 10px;
-                    padding: 10px;
-                }
-            """)
+            button_container.setObjectName("buttonBar")
             button_layout = QHBoxLayout(button_container)
             button_layout.setSpacing(10)
             button_layout.setContentsMargins(10, 5, 10, 5)
@@ -531,26 +377,26 @@ class TaskManager(QWidget):
                 show_error(self, "Error", "Please log in to view tasks")
                 return
             
-            # Clear existing tasks
-            self.task_table.setRowCount(0)
-            self.completed_table.setRowCount(0)
-            
-            # Get tasks from Firebase
-            tasks = db.child('tasks').child(self.user_id).get(token=session['idToken'])
-            
-            if not tasks:
-                self.show_empty_state(self.task_table, "No active tasks")
-                self.show_empty_state(self.completed_table, "No completed tasks")
+            # Get tasks from Firebase before touching the tables, so the rows
+            # already shown stay visible if Firebase is unreachable
+            tasks = self.firebase_ops.execute_operation(
+                lambda token: db.child('tasks').child(self.user_id).get(token=token),
+                bucket='read',
+                fallback=lambda error: None
+            )
+            if tasks is None:
+                if self.task_model.rowCount() == 0:
+                    show_error(self, "Offline", "Couldn't reach the server. Please try again shortly.")
                 return
             
-            active_row = 0
-            completed_row = 0
+            self.task_table.set_placeholder_text("No active tasks")
+            self.completed_table.set_placeholder_text("No completed tasks")
             
-            # Block signals during loading
-            self.task_table.blockSignals(True)
-            self.completed_table.blockSignals(True)
+            active_tasks = []
+            completed_tasks = []
+            loaded_tasks = []
             
-            for task in tasks.each() or []:
+            for task in (tasks.each() or []) if tasks else []:
                 try:
                     task_data = task.val()
                     if not task_data:
@@ -558,34 +404,28 @@ class TaskManager(QWidget):
                     
                     # Add key to task data
                     task_data['key'] = task.key()
+                    loaded_tasks.append((task.key(), task_data))
                     
                     # Determine which table to use
-                    is_completed = task_data.get('completed', False)
-                    target_table = self.completed_table if is_completed else self.task_table
-                    current_row = completed_row if is_completed else active_row
-                    
-                    # Add row and load task
-                    target_table.insertRow(current_row)
-                    self.load_task_to_table(target_table, task_data, current_row)
-                    
-                    # Update counter
-                    if is_completed:
-                        completed_row += 1
+                    if task_data.get('completed', False):
+                        completed_tasks.append(task_data)
                     else:
-                        active_row += 1
+                        active_tasks.append(task_data)
                     
                 except Exception as e:
                     print(f"Error loading task: {str(e)}")
                     continue
-                
-            # Re-enable signals
-            self.task_table.blockSignals(False)
-            self.completed_table.blockSignals(False)
             
-            print(f"Successfully loaded {active_row} active and {completed_row} completed tasks")
+            # Only rows that changed since the last load are touched, so scroll
+            # position and selection survive a refresh
+            active_diff = self.task_model.reconcile(active_tasks, ordered=False)
+            completed_diff = self.completed_model.reconcile(completed_tasks)
+            
+            print(f"Successfully loaded {len(active_tasks)} active and {len(completed_tasks)} completed tasks "
+                  f"(active: {active_diff}, completed: {completed_diff})")
             
-            # Check for notifications after loading tasks
-            self.check_notifications()
+            # Derive notifications from the tasks we just loaded, no extra fetch
+            self.update_notifications(loaded_tasks)
             
         except Exception as e:
             print(f"Error loading initial tasks: {str(e)}")
@@ -594,42 +434,28 @@ class TaskManager(QWidget):
     def setup_delegates(self):
         """Set up delegates for table columns"""
         try:
-            # Disconnect any existing connections first
-            try:
-                self.task_table.itemChanged.disconnect()
-            except:
-                pass
-            
             # For active tasks table only (not completed table)
             date_delegate = DateDelegate(self.task_table)
             priority_delegate = PriorityDelegate(self.task_table)
             
-            # Remove the task name delegate to prevent direct editing
+            # The task name column has no delegate; the model keeps it read-only
             self.task_table.setItemDelegateForColumn(1, date_delegate)
             self.task_table.setItemDelegateForColumn(2, priority_delegate)
             
-            # Make task name column non-editable
-            for row in range(self.task_table.rowCount()):
-                if self.task_table.item(row, 0):
-                    self.task_table.item(row, 0).setFlags(
-                        self.task_table.item(row, 0).flags() & ~Qt.ItemFlag.ItemIsEditable
-                    )
-            
         except Exception as e:
             print(f"Error setting up delegates: {e}")
 
-    def handle_item_change(self, item):
-        """Handle changes to table items"""
+    def handle_item_change(self, index):
+        """Handle changes to table cells"""
         try:
-            if not item or not self.user_id:
+            if not index.isValid() or not self.user_id:
                 return
                 
-            row = item.row()
-            column = item.column()
-            new_value = item.text()
+            column = index.column()
+            new_value = index.data(Qt.ItemDataRole.DisplayRole)
             
             # Get task key
-            task_key = self.task_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
+            task_key = index.data(TASK_KEY_ROLE)
             if not task_key:
                 return
                 
@@ -639,9 +465,6 @@ class TaskManager(QWidget):
                 show_error(self, "Error", "Please log in again to update task")
                 return
                 
-            # Block signals temporarily to prevent recursive updates
-            self.task_table.blockSignals(True)
-            
             try:
                 # Update based on column
                 if column == 0:  # Task name
@@ -671,19 +494,12 @@ class TaskManager(QWidget):
                 show_error(self, "Error", "Failed to update task")
                 self.load_initial_tasks()  # Refresh to revert changes
                 
-            finally:
-                # Always unblock signals
-                self.task_table.blockSignals(False)
-                
         except Exception as e:
             print(f"Error in handle_item_change: {e}")
             self.load_initial_tasks()  # Refresh to revert changes
 
     def setup_table(self, table):
         """Setup table columns and formatting"""
-        table.setColumnCount(3)
-        table.setHorizontalHeaderLabels(["Task Name", "Due Date", "Priority"])
-        
         # Set column sizes
         header = table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
@@ -697,70 +513,55 @@ class TaskManager(QWidget):
         table.verticalHeader().setVisible(False)  # Hide row numbers
         
         # Additional styling
-        table.setStyleSheet("""
-            QTableWidget {
-                gridline-color: #f0f0f0;
-                background-color: white;
-                border: 1px solid #e0e0e0;
-                border-radius: 10px;
-                padding: 5px;
-            }
-            QTableWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #edf2f7;
-            }
-            QHeaderView::section {
-                background-color: #f8f9fa;
-                padding: 8px;
-                border: none;
-                font-weight: bold;
-                color: #2d3748;
-            }
-        """)
+        table.setObjectName("TaskTable")
 
         # Enable alternating row colors
         table.setAlternatingRowColors(True)
         
         # Enable selection of entire rows
-        table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
 
-    def show_empty_state(self, table, message="No tasks found"):
+    def show_empty_state(self, table, message="No tasks"):
         """Show empty state message in table"""
-        table.setRowCount(1)
-        empty_item = QTableWidgetItem(message)
-        empty_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        empty_item.setFlags(Qt.ItemFlag.NoItemFlags)  # Make non-selectable
-        empty_item.setForeground(QColor("#a0aec0"))
-        
-        # Span all columns
-        table.setSpan(0, 0, 1, table.columnCount())
-        table.setItem(0, 0, empty_item)
+        table.model().clear()
+        table.set_placeholder_text(message)
 
     def check_old_completed_tasks(self):
-        """Check and delete completed tasks older than 20 days"""
+        """Delete completed tasks older than 20 days as a background sweep"""
         try:
             session = self.app.session_manager.load_session()
             if not session or not session.get('idToken'):
                 return
             
-            tasks = db.child('tasks').child(self.user_id).get(token=session['idToken'])
-            if tasks and tasks.each():
+            user_id = self.user_id
+            
+            def find_expired(token):
+                tasks = db.child('tasks').child(user_id).get(token=token)
+                expired = []
                 current_time = datetime.now()
-                
-                for task in tasks.each():
+                for task in tasks.each() or []:
                     task_data = task.val()
                     if task_data and task_data.get('completed'):
                         completed_at = task_data.get('completed_at')
                         if completed_at:
                             completed_date = datetime.fromisoformat(completed_at)
-                            days_old = (current_time - completed_date).days
-                            
-                            if days_old >= 20:
-                                # Delete the old completed task
-                                db.child('tasks').child(self.user_id).child(task.key()).remove(
-                                    token=session['idToken']
-                                )
+                            if (current_time - completed_date).days >= 20:
+                                expired.append(task.key())
+                return expired
+            
+            def remove_expired(expired):
+                # Each delete is its own background request so user actions can cut in
+                for task_key in expired:
+                    self.firebase_ops.schedule_operation(
+                        lambda token, key=task_key: db.child('tasks').child(user_id).child(key).remove(token=token)
+                    )
+                    
+            future = self.firebase_ops.schedule_operation(find_expired)
+            future.add_done_callback(
+                lambda done: remove_expired(done.result()) if not done.exception() else
+                print(f"Error checking old completed tasks: {str(done.exception())}")
+            )
         except Exception as e:
             print(f"Error checking old completed tasks: {str(e)}")
 
@@ -777,7 +578,7 @@ class TaskManager(QWidget):
         """
         logger.error(f"Error in TaskManager: {error}")
         
-        if "auth" in str(error).lower():
+        if is_auth_error(error):
             show_error(self, "Session Expired", 
                       "Please log in again to continue.")
             self.app.switch_to_login()
@@ -785,79 +586,32 @@ class TaskManager(QWidget):
             show_error(self, title, 
                       message or f"An error occurred: {str(error)}")
 
-    def sort_tasks_by_priority(self):
-        """Sort tasks by priority"""
-        try:
-            rows = self.task_table.rowCount()
-            tasks = []
-            
-            # Collect all tasks
-            for row in range(rows):
-                task_name = self.task_table.item(row, 0).text()
-                due_date = self.task_table.item(row, 1).text()
-                priority = self.task_table.item(row, 2).text()
-                task_key = self.task_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-                priority_value = PriorityLevel.get_priority_value(priority)
-                
-                tasks.append({
-                    'row': row,
-                    'task_name': task_name,
-                    'due_date': due_date,
-                    'priority': priority,
-                    'priority_value': priority_value,
-                    'key': task_key
-                })
-            
-            # Sort by priority value
-            tasks.sort(key=lambda x: x['priority_value'])
-            
-            # Reorder table
-            for new_row, task in enumerate(tasks):
-                old_row = task['row']
-                if new_row != old_row:
-                    self.task_table.insertRow(new_row)
-                    for col in range(self.task_table.columnCount()):
-                        self.task_table.setItem(
-                            new_row, 
-                            col, 
-                            self.task_table.takeItem(old_row + (1 if old_row > new_row else 0), col))
-                    self.task_table.removeRow(old_row + (1 if old_row > new_row else 0))
-            
-        except Exception as e:
-            print(f"Error sorting tasks: {str(e)}")
-
-    def handle_item_double_click(self, item):
-        """Handle double-click on table items"""
+    def handle_item_double_click(self, index):
+        """Handle double-click on table cells"""
         try:
-            # Get the table that was clicked
-            table = item.tableWidget()
-            
             # Don't allow editing in completed table
-            if table == self.completed_table:
+            if index.model() is not self.task_proxy:
                 return
             
-            column = table.column(item)
-            row = table.row(item)
+            column = index.column()
             
             # Get task key
-            task_key = table.item(row, 0).data(Qt.ItemDataRole.UserRole)
+            task_key = index.data(TASK_KEY_ROLE)
             if not task_key:
                 return
             
             if column == 0:  # Task name
-                # Allow direct editing
-                item.setFlags(item.flags() | Qt.ItemFlag.ItemIsEditable)
-                table.editItem(item)
+                self.show_task_update_dialog(task_key)
             elif column == 1:  # Due date
-                self.show_date_picker(row, task_key)
+                self.show_date_picker(task_key)
             elif column == 2:  # Priority
-                self.show_priority_selector(row, task_key)
+                self.show_priority_selector(task_key)
             
         except Exception as e:
             print(f"Error handling double click: {e}")
             show_error(self, "Error", "Failed to handle item edit")
 
-    def show_date_picker(self, row, task_key):
+    def show_date_picker(self, task_key):
         """Show date picker dialog for updating due date"""
         try:
             date_dialog = DatePickerDialog(self)
@@ -876,14 +630,14 @@ class TaskManager(QWidget):
                 }, token=session['idToken'])
                 
                 # Update table
-                self.task_table.item(row, 1).setText(new_date)
+                self.task_model.update_task(task_key, {'due_date': new_date})
                 show_success(self, "Success", "Due date updated! ����")
                 
         except Exception as e:
             print(f"Error updating due date: {e}")
             show_error(self, "Error", "Failed to update due date")
 
-    def show_priority_selector(self, row, task_key):
+    def show_priority_selector(self, task_key):
         """Show priority selector dialog for updating priority"""
         try:
             priority_dialog = QDialog(self)
@@ -899,7 +653,7 @@ class TaskManager(QWidget):
             ])
             
             # Set current priority
-            current_priority = self.task_table.item(row, 2).text()
+            current_priority = (self.task_model.task(task_key) or {}).get('priority', '')
             index = priority_combo.findText(current_priority)
             if index >= 0:
                 priority_combo.setCurrentIndex(index)
@@ -926,71 +680,40 @@ class TaskManager(QWidget):
                 }, token=session['idToken'])
                 
                 # Update table
-                self.task_table.item(row, 2).setText(new_priority)
-                
-                # Resort tasks
-                self.sort_tasks_by_priority()
+                self.task_model.update_task(task_key, {
+                    'priority': new_priority,
+                    'priority_value': PriorityLevel.get_priority_value(new_priority)
+                })
                 show_success(self, "Success", "Priority updated! 🎯")
                 
         except Exception as e:
             print(f"Error updating priority: {e}")
             show_error(self, "Error", "Failed to update priority")
 
-    def handle_cell_double_click(self, row, column):
+    def handle_cell_double_click(self, index):
         """Handle double-click on table cells"""
         try:
             # Only handle double-clicks in the task name column (column 0) for active tasks
-            if column == 0 and self.tab_widget.currentWidget() == self.active_tab:
-                # Get the item safely
-                current_item = self.task_table.item(row, 0)
-                if not current_item:
-                    return
-                
-                # Store the task key before any operations
-                task_key = current_item.data(Qt.ItemDataRole.UserRole)
-                if not task_key:
+            if index.column() == 0 and self.tab_widget.currentWidget() == self.active_tab:
+                task = self.task_table.task_at(index)
+                if not task or not task.get('key'):
                     return
                 
-                # Get the text content safely
-                task_text = current_item.text()
-                if not task_text:
-                    return
-                
-                # Split into lines and get task name and notes
-                lines = task_text.split('\n')
-                task_name = lines[0] if lines else ""
-                notes = '\n'.join(line.lstrip('• ') for line in lines[1:] if line.strip())
-                
-                # Get current task data
-                task_data = {
-                    'task_name': task_name,
-                    'due_date': self.task_table.item(row, 1).text(),
-                    'priority': self.task_table.item(row, 2).text(),
-                    'notes': notes
-                }
-                
-                # Show update dialog
-                updated_data = self.show_task_dialog(task_data)
+                # Show update dialog with the task's own data
+                updated_data = self.show_task_dialog(dict(task))
                 if updated_data:
-                    self.update_task_data(row, task_key, updated_data)
+                    self.update_task_data(task['key'], updated_data)
                 
         except Exception as e:
             print(f"Error handling cell double-click: {str(e)}")
 
-    def add_note(self, row):
-        """Add a note to the selected task"""
+    def add_note(self, task_key):
+        """Add a note to a task"""
         try:
-            task_key = self.task_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-            if not task_key:
+            task = self.task_model.task(task_key)
+            if not task:
                 return
             
-            current_item = self.task_table.item(row, 0)
-            if not current_item:
-                return
-            
-            current_text = current_item.text().replace('+ Add Note', '').strip()
-            task_name = current_text.split('\n')[0]
-            
             # Create small popup dialog
             dialog = QDialog(self)
             dialog.setWindowTitle("Add Note")
@@ -1019,9 +742,8 @@ class TaskManager(QWidget):
                 note_text = note_input.text().strip()
                 if note_text:
                     # Get existing notes
-                    notes = [line for line in current_text.split('\n')[1:] 
-                            if line and line != '+ Add Note']
-                    notes.append(f"• {note_text}")
+                    notes = notes_list(task)
+                    notes.append(note_text)
                     
                     # Update in Firebase
                     session = self.app.session_manager.load_session()
@@ -1032,83 +754,12 @@ class TaskManager(QWidget):
                         }, token=session['idToken'])
                         
                         # Update UI
-                        new_text = task_name + '\n' + '\n'.join(notes)
-                        current_item.setText(new_text)
-                        self.task_table.resizeRowToContents(row)
+                        self.task_model.update_task(task_key, {'notes': '\n'.join(notes)})
                         
         except Exception as e:
             print(f"Error adding note: {str(e)}")
             show_error(self, "Error", "Failed to add note")
 
-    def load_task_to_table(self, table, task_data, row):
-        """Load task data into table"""
-        try:
-            # Get task name and notes
-            task_name = task_data.get('task_name', '')
-            notes = task_data.get('notes', '')
-            
-            # Create items
-            name_item = QTableWidgetItem()
-            date_item = QTableWidgetItem(task_data.get('due_date', 'N/A'))
-            priority_item = QTableWidgetItem(task_data.get('priority', 'Low'))
-            
-            # Build display text
-            if table == self.completed_table:
-                # For completed tasks - apply strikethrough to everything
-                font = QFont()
-                font.setStrikeOut(True)
-                
-                # Format task name and notes with strikethrough
-                display_text = task_name
-                if notes:
-                    notes_list = [note.strip() for note in notes.split('\n') if note.strip()]
-                    if notes_list:
-                        display_text += '\n' + '\n'.join(f"• {note}" for note in notes_list)
-                
-                # Apply strikethrough font to all items
-                name_item.setFont(font)
-                date_item.setFont(font)
-                priority_item.setFont(font)
-                
-                # Set gray color for completed items
-                gray_color = QColor("#6c757d")
-                name_item.setForeground(gray_color)
-                date_item.setForeground(gray_color)
-                priority_item.setForeground(gray_color)
-                
-            else:
-                # For active tasks
-                display_text = task_name
-                if notes:
-                    notes_list = [note.strip() for note in notes.split('\n') if note.strip()]
-                    if notes_list:
-                        display_text += '\n' + '\n'.join(f"• {note}" for note in notes_list)
-                
-                # Make task name bold for active tasks
-                font = QFont()
-                font.setBold(True)
-                name_item.setFont(font)
-            
-            # Set the text
-            name_item.setText(display_text)
-            
-            # Store task key
-            name_item.setData(Qt.ItemDataRole.UserRole, task_data.get('key'))
-            
-            # Make task name non-editable
-            name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            
-            # Set items in table
-            table.setItem(row, 0, name_item)
-            table.setItem(row, 1, date_item)
-            table.setItem(row, 2, priority_item)
-            
-            # Adjust row height
-            table.resizeRowToContents(row)
-            
-        except Exception as e:
-            print(f"Error loading task to table: {str(e)}")
-
     def add_task(self):
         """Add a new task"""
         try:
@@ -1128,28 +779,30 @@ class TaskManager(QWidget):
                 })
                 
                 try:
-                    # Save to Firebase
-                    task_ref = db.child('tasks').child(self.user_id).push(
-                        task_data,
-                        token=session['idToken']
+                    # Save to Firebase (one attempt; refreshes the token on 401)
+                    task_ref = self.firebase_ops.execute_operation(
+                        lambda token: db.child('tasks').child(self.user_id).push(
+                            task_data,
+                            token=token
+                        )
                     )
                     
                     if task_ref and task_ref.get('name'):
                         task_data['key'] = task_ref['name']
-                        row = self.task_table.rowCount()
-                        self.task_table.insertRow(row)
-                        self.load_task_to_table(self.task_table, task_data, row)
-                        self.sort_tasks_by_priority()
+                        self.task_model.add_task(task_data)
                         show_success(self, "Success", "Task added! 🎯")
                     else:
                         show_error(self, "Error", "Failed to save task")
                         
-                except Exception as firebase_error:
-                    if "401" in str(firebase_error) or "Permission denied" in str(firebase_error):
-                        show_error(self, "Error", "Session expired. Please log in again.")
-                        self.app.switch_to_login()
-                    else:
-                        raise firebase_error
+                except AuthError:
+                    show_error(self, "Error", "Session expired. Please log in again.")
+                    self.app.switch_to_login()
+                    
+                except RateLimitExceeded as e:
+                    show_error(self, "Slow Down", f"Too many changes at once. Please try again in {e.retry_after:.0f}s.")
+
+                except UNAVAILABLE_ERRORS:
+                    show_error(self, "Offline", "Couldn't reach the server, so the task wasn't saved. Please try again shortly.")
                     
         except Exception as e:
             print(f"Error adding task: {str(e)}")
@@ -1164,80 +817,19 @@ class TaskManager(QWidget):
         # Limit length
         return text[:200]  # Limit to 200 characters
 
-    def sort_tasks_by_priority(self):
-        """Sort tasks by priority"""
-        try:
-            rows = self.task_table.rowCount()
-            tasks = []
-            
-            # Collect all tasks
-            for row in range(rows):
-                task_name = self.task_table.item(row, 0).text()
-                due_date = self.task_table.item(row, 1).text()
-                priority = self.task_table.item(row, 2).text()
-                task_key = self.task_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-                priority_value = PriorityLevel.get_priority_value(priority)
-                
-                tasks.append({
-                    'row': row,
-                    'task_name': task_name,
-                    'due_date': due_date,
-                    'priority': priority,
-                    'priority_value': priority_value,
-                    'key': task_key
-                })
-            
-            # Sort by priority value
-            tasks.sort(key=lambda x: x['priority_value'])
-            
-            # Reorder table
-            for new_row, task in enumerate(tasks):
-                old_row = task['row']
-                if new_row != old_row:
-                    self.task_table.insertRow(new_row)
-                    for col in range(self.task_table.columnCount()):
-                        self.task_table.setItem(
-                            new_row, 
-                            col, 
-                            self.task_table.takeItem(old_row + (1 if old_row > new_row else 0), col))
-                    self.task_table.removeRow(old_row + (1 if old_row > new_row else 0))
-            
-        except Exception as e:
-            print(f"Error sorting tasks: {str(e)}")
-
     def update_task(self):
         """Update the selected task"""
         try:
-            # Get selected row
-            current_row = self.task_table.currentRow()
-            if current_row < 0:
+            # Get selected task
+            task = self.task_table.current_task()
+            if not task:
                 show_error(self, "Error", "Please select a task to update")
                 return
             
-            # Get task data
-            task_key = self.task_table.item(current_row, 0).data(Qt.ItemDataRole.UserRole)
-            task_name = self.task_table.item(current_row, 0).text().split('\n')[0]
-            due_date = self.task_table.item(current_row, 1).text()
-            priority = self.task_table.item(current_row, 2).text()
-            
-            # Get notes
-            current_text = self.task_table.item(current_row, 0).text()
-            notes = '\n'.join(line.lstrip('• ') for line in current_text.split('\n')[1:] 
-                            if line and line != '+ Add Note')
-            
-            # Create task data for dialog
-            task_data = {
-                'key': task_key,
-                'task_name': task_name,
-                'due_date': due_date,
-                'priority': priority,
-                'notes': notes
-            }
-            
             # Show task dialog with current data
-            updated_data = self.show_task_dialog(task_data)
+            updated_data = self.show_task_dialog(dict(task))
             if updated_data:
-                self.update_task_data(current_row, task_key, updated_data)
+                self.update_task_data(task['key'], updated_data)
             
         except Exception as e:
             print(f"Error updating task: {str(e)}")
@@ -1246,31 +838,23 @@ class TaskManager(QWidget):
     def toggle_task_completion(self):
         """Toggle task completion status"""
         try:
-            # Get selected row
-            current_row = self.task_table.currentRow()
-            if current_row < 0:
+            # Get selected task
+            task = self.task_table.current_task()
+            if not task:
                 show_error(self, "Error", "Please select a task to mark as completed")
                 return
             
-            # Get task data
-            task_key = self.task_table.item(current_row, 0).data(Qt.ItemDataRole.UserRole)
-            task_name = self.task_table.item(current_row, 0).text().split('\n')[0]  # Get just the task name
-            due_date = self.task_table.item(current_row, 1).text()
-            priority = self.task_table.item(current_row, 2).text()
-            
-            # Get notes if any
-            current_text = self.task_table.item(current_row, 0).text()
-            notes = '\n'.join(line.lstrip('• ') for line in current_text.split('\n')[1:] 
-                            if line and line != '+ Add Note')
+            task_key = task['key']
+            priority = task.get('priority', '')
             
             # Create task data
             task_data = {
-                'task_name': task_name,
-                'due_date': due_date,
+                'task_name': task.get('task_name', ''),
+                'due_date': task.get('due_date', ''),
                 'priority': priority,
                 'priority_value': PriorityLevel.get_priority_value(priority),
                 'completed': True,  # Mark as completed
-                'notes': notes,
+                'notes': task.get('notes', ''),
                 'completed_at': datetime.now().isoformat(),  # Add completion timestamp
                 'updated_at': datetime.now().isoformat()
             }
@@ -1284,50 +868,31 @@ class TaskManager(QWidget):
                     )
                 )
                 
-                # If update successful, update UI
-                task_data['key'] = task_key
-                new_row = self.completed_table.rowCount()
-                self.completed_table.insertRow(new_row)
-                self.load_task_to_table(self.completed_table, task_data, new_row)
-                
-                # Remove from active tasks
-                self.task_table.removeRow(current_row)
+                # If update successful, move the task between tables
+                self.completed_model.add_task(dict(task, **task_data))
+                self.task_model.remove_task(task_key)
                 
                 # Show success message
                 show_success(self, "Success", "Task completed! 🎉")
-                
-                # Update empty states if needed
-                if self.task_table.rowCount() == 0:
-                    self.show_empty_state(self.task_table, "No active tasks")
                     
+            except RateLimitExceeded as e:
+                show_error(self, "Slow Down", f"Too many changes at once. Please try again in {e.retry_after:.0f}s.")
+                
+            except UNAVAILABLE_ERRORS:
+                show_error(self, "Offline", "Couldn't reach the server, so the task wasn't completed. Please try again shortly.")
+                
+            except AuthError:
+                show_error(self, "Error", "Session expired. Please log in again to continue.")
+                self.app.switch_to_login()
+                
             except Exception as e:
                 print(f"Error toggling task completion: {str(e)}")
-                if "401" in str(e) or "Permission denied" in str(e):
-                    show_error(self, "Error", "Session expired. Please log in again to continue.")
-                    self.app.switch_to_login()
-                else:
-                    show_error(self, "Error", "Failed to mark task as completed. Please try again.")
+                show_error(self, "Error", "Failed to mark task as completed. Please try again.")
                 
         except Exception as e:
             print(f"Error toggling task completion: {str(e)}")
             show_error(self, "Error", "Failed to mark task as completed. Please try again.")
 
-    def show_empty_state(self, table, message="No tasks"):
-        """Show empty state message in table"""
-        table.setRowCount(1)
-        empty_item = QTableWidgetItem(message)
-        empty_item.setFlags(Qt.ItemFlag.NoItemFlags)  # Make it non-editable
-        empty_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        # Apply styling
-        font = QFont()
-        font.setItalic(True)
-        empty_item.setFont(font)
-        empty_item.setForeground(QColor("#6c757d"))  # Gray color
-        
-        table.setItem(0, 0, empty_item)
-        table.setSpan(0, 0, 1, table.columnCount())  # Merge all columns
-
     def logout(self):
         """Handle user logout"""
         try:
@@ -1340,8 +905,6 @@ class TaskManager(QWidget):
                 self.set_user_id(None)
                 
                 # Clear tables
-                self.task_table.setRowCount(0)
-                self.completed_table.setRowCount(0)
                 self.show_empty_state(self.task_table, "Please log in to view tasks")
                 self.show_empty_state(self.completed_table, "Please log in to view tasks")
                 
@@ -1361,21 +924,14 @@ class TaskManager(QWidget):
     def show_account(self):
         """Show account management window"""
         try:
-            from ui.account_ui import AccountManager
-            
             # Check if user is logged in
             session = self.app.session_manager.load_session()
             if not session or not session.get('idToken'):
                 show_error(self, "Error", "Please log in to access account settings")
                 return
             
-            # Create account manager page
-            if not hasattr(self.app.widget_stack, 'account_page'):
-                self.app.widget_stack.account_page = AccountManager(self.app)
-                self.app.widget_stack.addWidget(self.app.widget_stack.account_page)
-            
-            # Switch to account page
-            self.app.widget_stack.setCurrentWidget(self.app.widget_stack.account_page)
+            # The shell builds the account page the first time it is opened
+            self.app.show_account_manager()
             
         except Exception as e:
             print(f"Error showing account page: {str(e)}")
@@ -1542,7 +1098,7 @@ class TaskManager(QWidget):
             print(f"Error deleting task: {str(e)}")
             show_error(self, "Error", "Failed to delete task")
 
-    def update_task_data(self, row, task_key, updated_data):
+    def update_task_data(self, task_key, updated_data):
         """Update task data in Firebase and UI"""
         try:
             # Get session
@@ -1551,39 +1107,41 @@ class TaskManager(QWidget):
                 show_error(self, "Error", "Please log in to update tasks")
                 return
 
+            current = self.task_model.task(task_key) or {}
+
             # Ensure required fields are present for Firebase validation
             updated_data.update({
                 'updated_at': datetime.now().isoformat(),
                 'user_id': self.user_id,
                 # Preserve existing fields
-                'created_at': self.get_task_created_at(task_key) or datetime.now().isoformat(),
-                'task_name': updated_data.get('task_name') or self.task_table.item(row, 0).text().split('\n')[0]
+                'created_at': (current.get('created_at') or self.get_task_created_at(task_key)
+                               or datetime.now().isoformat()),
+                'task_name': updated_data.get('task_name') or current.get('task_name', '')
             })
 
             try:
-                # Update in Firebase
-                db.child('tasks').child(self.user_id).child(task_key).update(
-                    updated_data,
-                    token=session['idToken']
+                # Update in Firebase (one attempt; refreshes the token on 401)
+                self.firebase_ops.execute_operation(
+                    lambda token: db.child('tasks').child(self.user_id).child(task_key).update(
+                        updated_data,
+                        token=token
+                    )
                 )
                 
-                # Update UI
-                updated_data['key'] = task_key
-                self.load_task_to_table(self.task_table, updated_data, row)
-                
-                # Sort if priority changed
-                current_priority = self.task_table.item(row, 2).text()
-                if current_priority != updated_data.get('priority'):
-                    self.sort_tasks_by_priority()
+                # Update UI; the sort proxy moves the row if its order changed
+                self.task_model.update_task(task_key, updated_data)
                 
                 show_success(self, "Success", "Task updated! 🎯")
                 
-            except Exception as firebase_error:
-                if "401" in str(firebase_error) or "Permission denied" in str(firebase_error):
-                    show_error(self, "Error", "Session expired. Please log in again.")
-                    self.app.switch_to_login()
-                else:
-                    raise firebase_error
+            except AuthError:
+                show_error(self, "Error", "Session expired. Please log in again.")
+                self.app.switch_to_login()
+                
+            except RateLimitExceeded as e:
+                show_error(self, "Slow Down", f"Too many changes at once. Please try again in {e.retry_after:.0f}s.")
+                
+            except UNAVAILABLE_ERRORS:
+                show_error(self, "Offline", "Couldn't reach the server, so the changes weren't saved. Please try again shortly.")
                 
         except Exception as e:
             print(f"Error updating task data: {str(e)}")
@@ -1620,13 +1178,10 @@ class TaskManager(QWidget):
                 for task in tasks.each() or []:
                     task_data = task.val()
                     if task_data and task_data.get('completed'):
-                        # Delete the task
-                        db.child('tasks').child(self.user_id).child(task.key()).remove(
-                            token=session['idToken']
-                        )
+                        # Delete the task; bursts beyond the write budget are queued
+                        self.queue_task_removal(task.key())
                 
             # Clear the completed table
-            self.completed_table.setRowCount(0)
             self.show_empty_state(self.completed_table, "No completed tasks")
             show_success(self, "Success", "All completed tasks deleted! 🗑️")
             
@@ -1637,15 +1192,15 @@ class TaskManager(QWidget):
     def delete_selected_completed_tasks(self):
         """Delete selected completed tasks"""
         try:
-            # Get selected rows
-            selected_rows = set(item.row() for item in self.completed_table.selectedItems())
-            if not selected_rows:
+            # Get selected tasks
+            selected_keys = [task['key'] for task in self.completed_table.selected_tasks() if task]
+            if not selected_keys:
                 show_error(self, "Error", "Please select tasks to delete")
                 return
                 
             # Confirm deletion
             response = show_question(self, "Delete Selected", 
-                                  f"Are you sure you want to delete {len(selected_rows)} selected task(s)?")
+                                  f"Are you sure you want to delete {len(selected_keys)} selected task(s)?")
             if response != "Yes":
                 return
                 
@@ -1654,20 +1209,12 @@ class TaskManager(QWidget):
                 show_error(self, "Error", "Please log in to delete tasks")
                 return
                 
-            # Delete tasks from Firebase and table
-            for row in sorted(selected_rows, reverse=True):
-                task_key = self.completed_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-                if task_key:
-                    # Delete from Firebase
-                    db.child('tasks').child(self.user_id).child(task_key).remove(
-                        token=session['idToken']
-                    )
-                    # Remove from table
-                    self.completed_table.removeRow(row)
-                    
-            # Show empty state if no tasks left
-            if self.completed_table.rowCount() == 0:
-                self.show_empty_state(self.completed_table, "No completed tasks")
+            # Delete from Firebase (queued when over the write budget)
+            for task_key in selected_keys:
+                self.queue_task_removal(task_key)
+                
+            # Remove from table in one pass
+            self.completed_model.remove_tasks(selected_keys)
                 
             show_success(self, "Success", "Selected tasks deleted! 🗑️")
             
@@ -1675,8 +1222,22 @@ class TaskManager(QWidget):
             print(f"Error deleting selected tasks: {str(e)}")
             show_error(self, "Error", "Failed to delete selected tasks")
 
+    def queue_task_removal(self, task_key):
+        """Delete a task through the rate limiter without blocking the UI"""
+        user_id = self.user_id
+        future = self.firebase_ops.submit_operation(
+            lambda token: db.child('tasks').child(user_id).child(task_key).remove(token=token)
+        )
+        
+        def log_failure(done):
+            if done.exception():
+                logger.error(f"Failed to delete task {task_key}: {done.exception()}")
+                
+        future.add_done_callback(log_failure)
+        return future
+
     def check_notifications(self):
-        """Check for various notifications"""
+        """Check for various notifications as a background request"""
         try:
             if not self.user_id:
                 return
@@ -1685,16 +1246,33 @@ class TaskManager(QWidget):
             if not session or not session.get('idToken'):
                 return
                 
+            user_id = self.user_id
+            future = self.firebase_ops.schedule_operation(
+                lambda token: db.child('tasks').child(user_id).get(token=token)
+            )
+            deliver(
+                future,
+                lambda tasks: self.apply_notification_scan(user_id, tasks),
+                lambda e: print(f"Error checking notifications: {str(e)}")
+            )
+            
+        except Exception as e:
+            print(f"Error checking notifications: {str(e)}")
+            
+    def apply_notification_scan(self, user_id, tasks):
+        """Apply a finished background notification scan"""
+        # Ignore results for a user who has since logged out
+        if user_id != self.user_id or not tasks:
+            return
+        self.update_notifications((task.key(), task.val()) for task in tasks.each() or [])
+            
+    def update_notifications(self, tasks):
+        """Rebuild notifications from (task_key, task_data) pairs"""
+        try:
             self.notifications = []
             current_time = datetime.now()
-            
-            # Get all tasks
-            tasks = db.child('tasks').child(self.user_id).get(token=session['idToken'])
-            if not tasks:
-                return
                 
-            for task in tasks.each() or []:
-                task_data = task.val()
+            for task_key, task_data in tasks:
                 if not task_data:
                     continue
                     
@@ -1717,7 +1295,7 @@ class TaskManager(QWidget):
                                 'message': f'"{task_name}" was due on {due_date_str}',
                                 'time': 'Overdue',
                                 'type': 'overdue',
-                                'task_key': task.key()
+                                'task_key': task_key
                             })
                         
                         # Check for tasks due today
@@ -1728,7 +1306,7 @@ class TaskManager(QWidget):
                                 'message': f'"{task_name}" is due today',
                                 'time': 'Today',
                                 'type': 'due_today',
-                                'task_key': task.key()
+                                'task_key': task_key
                             })
                         
                         # Check for tasks due tomorrow
@@ -1739,7 +1317,7 @@ class TaskManager(QWidget):
                                 'message': f'"{task_name}" is due tomorrow',
                                 'time': 'Tomorrow',
                                 'type': 'due_tomorrow',
-                                'task_key': task.key()
+                                'task_key': task_key
                             })
                         
                         # Check for tasks due within a week
@@ -1751,7 +1329,7 @@ class TaskManager(QWidget):
                                 'message': f'"{task_name}" is due in {days_until} days',
                                 'time': f'Due in {days_until} days',
                                 'type': 'upcoming',
-                                'task_key': task.key()
+                                'task_key': task_key
                             })
                     except ValueError:
                         continue
@@ -1760,7 +1338,7 @@ class TaskManager(QWidget):
             self.notification_btn.set_notification_count(len(self.notifications))
             
         except Exception as e:
-            print(f"Error checking notifications: {str(e)}")
+            print(f"Error updating notifications: {str(e)}")
             
     def show_notifications(self):
         """Show notifications dialog"""
@@ -1773,96 +1351,16 @@ class TaskManager(QWidget):
     def show_task_update_dialog(self, task_key):
         """Show update dialog for a specific task"""
         try:
-            # Find the task in the active tasks table
-            for row in range(self.task_table.rowCount()):
-                if self.task_table.item(row, 0).data(Qt.ItemDataRole.UserRole) == task_key:
-                    # Get current task data
-                    task_name = self.task_table.item(row, 0).text().split('\n')[0]
-                    due_date = self.task_table.item(row, 1).text()
-                    priority = self.task_table.item(row, 2).text()
-                    
-                    # Get notes
-                    current_text = self.task_table.item(row, 0).text()
-                    notes = '\n'.join(line.lstrip('• ') for line in current_text.split('\n')[1:] 
-                                    if line and line != '+ Add Note')
-                    
-                    # Create task data for dialog
-                    task_data = {
-                        'key': task_key,
-                        'task_name': task_name,
-                        'due_date': due_date,
-                        'priority': priority,
-                        'notes': notes
-                    }
-                    
-                    # Show task dialog with current data
-                    updated_data = self.show_task_dialog(task_data)
-                    if updated_data:
-                        self.update_task_data(row, task_key, updated_data)
-                    break
+            # Find the task among the active tasks
+            task = self.task_model.task(task_key)
+            if task:
+                # Show task dialog with current data
+                updated_data = self.show_task_dialog(dict(task))
+                if updated_data:
+                    self.update_task_data(task_key, updated_data)
                     
         except Exception as e:
             print(f"Error showing task update dialog: {str(e)}")
             show_error(self, "Error", "Failed to open task update dialog")
 
-# Add this new class for modern table styling
-class ModernTable(QTableWidget):
-    def __init__(self):
-        super().__init__()
-        self.setStyleSheet("""
-            QTableWidget {
-                background-color: #f5f7fa;
-                border: 1px solid #e1e8ed;
-                border-radius: 8px;
-                gridline-color: #e1e8ed;
-            }
-            QTableWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #e1e8ed;
-                color: #2c3e50;
-                font-size: 13px;
-            }
-            QTableWidget::item:selected {
-                background-color: #edf2f7;
-                color: #2c3e50;
-            }
-            QTableWidget::item:hover {
-                background-color: #edf2f7;
-            }
-            QTableWidget QHeaderView::section {
-                background-color: #f8f9fa;
-                color: #2c3e50;
-                padding: 10px;
-                border: none;
-                border-bottom: 2px solid #e1e8ed;
-                font-weight: bold;
-                font-size: 13px;
-            }
-            QTableWidget QHeaderView::section:hover {
-                background-color: #edf2f7;
-            }
-        """)
-        
-        self.setAlternatingRowColors(False)  # Disable alternating colors
-        self.setFrameShape(QFrame.Shape.NoFrame)
-        self.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
-        self.verticalHeader().setVisible(False)
-        self.setShowGrid(True)
-        self.setWordWrap(True)
-
-    def mousePressEvent(self, event):
-        """Handle mouse press events"""
-        item = self.itemAt(event.pos())
-        if not item:
-            self.clearSelection()
-            self.setCurrentItem(None)
-        super().mousePressEvent(event)
-
-    def mouseReleaseEvent(self, event):
-        """Handle mouse release events"""
-        super().mouseReleaseEvent(event)
-        if not self.selectedItems():
-            self.clearSelection()
-
 __all__ = ['TaskManager']
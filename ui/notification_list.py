@@ -0,0 +1,153 @@
+from PyQt6.QtWidgets import QAbstractItemView, QFrame, QListView, QStyle, QStyledItemDelegate
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRectF, QSize
+from PyQt6.QtGui import QColor, QFont, QPainter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+NOTIFICATION_ROLE = Qt.ItemDataRole.UserRole
+# Header rows carry (bucket title, count) instead of a notification
+HEADER_ROLE = Qt.ItemDataRole.UserRole + 1
+
+# Notification 'type' -> section title, in display order
+BUCKETS: List[Tuple[str, str]] = [
+    ('overdue', "Overdue"),
+    ('due_today', "Due Today"),
+    ('due_tomorrow', "Due Tomorrow"),
+    ('upcoming', "Upcoming"),
+]
+
+ROW_HEIGHT = 36
+
+class NotificationListModel(QAbstractListModel):
+    """
+    Notifications as a flat list with a header row before each bucket.
+
+    Rows are plain tuples; nothing per notification is allocated beyond
+    what the delegate paints for visible rows.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # ('header', (title, count)) or ('item', notification)
+        self._rows: List[Tuple[str, object]] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        if self._rows[index.row()][0] == 'header':
+            return Qt.ItemFlag.ItemIsEnabled
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        kind, value = self._rows[index.row()]
+        if kind == 'header':
+            if role == HEADER_ROLE:
+                return value
+            if role == Qt.ItemDataRole.DisplayRole:
+                return f"{value[0]} ({value[1]})"
+            return None
+        if role == NOTIFICATION_ROLE:
+            return value
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{value['icon']} {value['message']} • {value['time']}"
+        return None
+
+    def set_notifications(self, notifications: Iterable[Dict]) -> None:
+        """Replace the list, grouping notifications by bucket."""
+        grouped: Dict[str, List[Dict]] = {bucket: [] for bucket, _ in BUCKETS}
+        for notif in notifications:
+            grouped.setdefault(notif.get('type'), []).append(notif)
+
+        titles = dict(BUCKETS)
+        rows: List[Tuple[str, object]] = []
+        for bucket, items in grouped.items():
+            if items:
+                rows.append(('header', (titles.get(bucket, "Other"), len(items))))
+                rows.extend(('item', notif) for notif in items)
+
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.set_notifications([])
+
+    def notification_at(self, index: QModelIndex) -> Optional[Dict]:
+        return index.data(NOTIFICATION_ROLE) if index.isValid() else None
+
+class NotificationDelegate(QStyledItemDelegate):
+    """Paints bucket headers and notification rows without any child widgets."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._header_font = QFont()
+        self._header_font.setBold(True)
+        self._header_color = QColor("#6c757d")
+        self._text_color = QColor("#4a5568")
+        self._background = QColor("#f8f9fa")
+        self._hover_background = QColor("#e9ecef")
+
+    def sizeHint(self, option, index):
+        # Rows take the viewport's width; text is elided to fit
+        return QSize(0, ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = option.rect
+
+        header = index.data(HEADER_ROLE)
+        if header:
+            painter.setFont(self._header_font)
+            painter.setPen(self._header_color)
+            painter.drawText(rect.adjusted(4, 0, -4, -4),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignBottom,
+                             index.data(Qt.ItemDataRole.DisplayRole))
+            painter.restore()
+            return
+
+        hovered = option.state & QStyle.StateFlag.State_MouseOver
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self._hover_background if hovered else self._background)
+        painter.drawRoundedRect(QRectF(rect.adjusted(2, 2, -2, -2)), 4, 4)
+
+        painter.setFont(option.font)
+        painter.setPen(self._text_color)
+        text_rect = rect.adjusted(12, 0, -12, 0)
+        text = option.fontMetrics.elidedText(
+            index.data(Qt.ItemDataRole.DisplayRole), Qt.TextElideMode.ElideRight, text_rect.width()
+        )
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, text)
+        painter.restore()
+
+class NotificationListView(QListView):
+    """List of notifications that draws its own empty-state placeholder."""
+
+    def __init__(self, placeholder_text: str = "No notifications", parent=None):
+        super().__init__(parent)
+        self._placeholder_text = placeholder_text
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setObjectName("NotificationList")
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        # Every row is the same height, so layout never measures rows one by one
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
+        self.setItemDelegate(NotificationDelegate(self))
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        model = self.model()
+        if self._placeholder_text and (model is None or model.rowCount() == 0):
+            painter = QPainter(self.viewport())
+            painter.setPen(QColor("#6c757d"))
+            painter.drawText(self.viewport().rect().adjusted(20, 20, -20, -20),
+                             Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop,
+                             self._placeholder_text)
+            painter.end()
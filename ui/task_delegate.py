@@ -0,0 +1,211 @@
+from PyQt6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionViewItem
+from PyQt6.QtCore import Qt, QEvent, QRect, QSize, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QFontMetrics
+from typing import Dict, Optional, Set, Tuple
+from ui.task_model import NAME_COLUMN, TASK_KEY_ROLE, TASK_ROLE, TASK_VERSION_ROLE, notes_list
+
+# Matches the QTableView#TaskTable::item padding in ui/theme.py
+CELL_PADDING = 8
+NOTES_SPACING = 2
+# Space on the left of the name for the expand/collapse arrow
+TOGGLE_WIDTH = 16
+TEXT_COLOR = QColor("#2c3e50")
+MUTED_COLOR = QColor("#6c757d")
+TEXT_FLAGS = (Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop
+              | Qt.TextFlag.TextWordWrap)
+LINE_FLAGS = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop
+
+def notes_count_text(count: int) -> str:
+    return f"{count} note" if count == 1 else f"{count} notes"
+
+class RowLayout:
+    """Measured text of one task cell, reused until the task or width changes."""
+
+    __slots__ = ('name', 'name_height', 'notes_count', 'notes_height')
+
+    def __init__(self, name: str, name_height: int, notes_count: int, notes_height: int = 0):
+        self.name = name                  # elided to one line when collapsed
+        self.name_height = name_height
+        self.notes_count = notes_count
+        self.notes_height = notes_height  # 0 unless the notes are shown
+
+class TaskRowDelegate(QStyledItemDelegate):
+    """
+    Paints the task name column straight from the task dict.
+
+    The name is drawn in the model's font (bold, or struck through for
+    completed tasks). By default each task takes one line with a count of
+    its notes; clicking the arrow expands that task to show its notes as a
+    bullet list. Expansion is remembered per task key, and notes are only
+    laid out for expanded tasks. Measurements are cached by task key and
+    invalidated by task version, text width and expansion.
+    """
+
+    # Task key whose expansion changed; the view re-fits that row
+    expansion_changed = pyqtSignal(str)
+
+    def __init__(self, parent=None, notes_collapsed: bool = True):
+        super().__init__(parent)
+        self.notes_collapsed = notes_collapsed
+        self._expanded: Set[str] = set()
+        # task key -> (version, text width, expanded, layout)
+        self._layouts: Dict[str, Tuple[int, int, bool, RowLayout]] = {}
+
+    def clear_cache(self) -> None:
+        self._layouts.clear()
+
+    def set_notes_collapsed(self, collapsed: bool) -> None:
+        """Switch between one line per task and always showing notes."""
+        self.notes_collapsed = collapsed
+
+    def is_expanded(self, key: str) -> bool:
+        return not self.notes_collapsed or key in self._expanded
+
+    def set_expanded(self, key: str, expanded: bool) -> None:
+        if expanded == (key in self._expanded):
+            return
+        if expanded:
+            self._expanded.add(key)
+        else:
+            self._expanded.discard(key)
+        self.expansion_changed.emit(key)
+
+    def toggle_expanded(self, key: str) -> None:
+        self.set_expanded(key, key not in self._expanded)
+
+    @staticmethod
+    def notes_text(task: Dict) -> str:
+        return '\n'.join(f"• {note}" for note in notes_list(task))
+
+    @staticmethod
+    def _fonts(option: QStyleOptionViewItem, index) -> Tuple[QFont, QFont]:
+        """Name font from the model, notes font from the view with matching strikeout."""
+        name_font = index.data(Qt.ItemDataRole.FontRole) or option.font
+        notes_font = QFont(option.font)
+        notes_font.setBold(False)
+        notes_font.setStrikeOut(name_font.strikeOut())
+        return name_font, notes_font
+
+    def _layout(self, task: Dict, version: int, width: int,
+                name_font: QFont, notes_font: QFont) -> RowLayout:
+        key = task.get('key', '')
+        expanded = self.is_expanded(key)
+        cached = self._layouts.get(key)
+        if cached and cached[:3] == (version, width, expanded):
+            return cached[3]
+
+        name = task.get('task_name', '')
+        # Counting is cheap; only expanded rows pay for laying out note text
+        notes = notes_list(task)
+        text_width = max(width - (TOGGLE_WIDTH if notes else 0), 1)
+        name_metrics = QFontMetrics(name_font)
+
+        if expanded:
+            bounds = QRect(0, 0, text_width, 1 << 20)
+            name_height = name_metrics.boundingRect(bounds, TEXT_FLAGS, name).height()
+            notes_height = QFontMetrics(notes_font).boundingRect(
+                bounds, TEXT_FLAGS, self.notes_text(task)
+            ).height() + NOTES_SPACING if notes else 0
+            layout = RowLayout(name, name_height, len(notes), notes_height)
+        else:
+            if notes:
+                count_width = QFontMetrics(notes_font).horizontalAdvance(
+                    "  " + notes_count_text(len(notes)))
+                text_width = max(text_width - count_width, 1)
+            layout = RowLayout(
+                name_metrics.elidedText(name, Qt.TextElideMode.ElideRight, text_width),
+                name_metrics.height(), len(notes)
+            )
+
+        self._layouts[key] = (version, width, expanded, layout)
+        return layout
+
+    def _layout_for(self, option, index, width: int) -> Optional[RowLayout]:
+        task = index.data(TASK_ROLE) if index.column() == NAME_COLUMN else None
+        if not task:
+            return None
+        name_font, notes_font = self._fonts(option, index)
+        return self._layout(task, index.data(TASK_VERSION_ROLE) or 0, width, name_font, notes_font)
+
+    def sizeHint(self, option, index):
+        layout = self._layout_for(option, index, option.rect.width() - 2 * CELL_PADDING)
+        if layout is None:
+            return super().sizeHint(option, index)
+        return QSize(option.rect.width(),
+                     layout.name_height + layout.notes_height + 2 * CELL_PADDING)
+
+    def _toggle_rect(self, option) -> QRect:
+        return QRect(option.rect.left(), option.rect.top(),
+                     CELL_PADDING + TOGGLE_WIDTH, option.rect.height())
+
+    def editorEvent(self, event, model, option, index):
+        # A click on the arrow expands or collapses the task's notes
+        if (self.notes_collapsed and index.column() == NAME_COLUMN
+                and event.type() in (QEvent.Type.MouseButtonRelease, QEvent.Type.MouseButtonDblClick)
+                and event.button() == Qt.MouseButton.LeftButton
+                and self._toggle_rect(option).contains(event.position().toPoint())):
+            task = index.data(TASK_ROLE)
+            if task and notes_list(task):
+                if event.type() == QEvent.Type.MouseButtonRelease:
+                    self.toggle_expanded(index.data(TASK_KEY_ROLE))
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def paint(self, painter, option, index):
+        rect = option.rect.adjusted(CELL_PADDING, CELL_PADDING, -CELL_PADDING, -CELL_PADDING)
+        layout = self._layout_for(option, index, rect.width())
+        if layout is None:
+            super().paint(painter, option, index)
+            return
+
+        # Background, selection and hover come from the style; text is ours
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ''
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, opt.widget)
+
+        name_font, notes_font = self._fonts(option, index)
+        color = index.data(Qt.ItemDataRole.ForegroundRole) or TEXT_COLOR
+        expanded = self.is_expanded(index.data(TASK_KEY_ROLE))
+
+        # Centre short content in rows kept at the default height
+        content_height = layout.name_height + layout.notes_height
+        if rect.height() > content_height:
+            rect.setTop(rect.top() + (rect.height() - content_height) // 2)
+
+        painter.save()
+        painter.setClipRect(option.rect)
+        if layout.notes_count:
+            if self.notes_collapsed:
+                painter.setPen(MUTED_COLOR)
+                painter.setFont(notes_font)
+                painter.drawText(QRect(rect.left(), rect.top(), TOGGLE_WIDTH, layout.name_height),
+                                 LINE_FLAGS, "▾" if expanded else "▸")
+            rect.setLeft(rect.left() + TOGGLE_WIDTH)
+
+        painter.setPen(color)
+        painter.setFont(name_font)
+        name_rect = QRect(rect.left(), rect.top(), rect.width(), layout.name_height)
+        if expanded:
+            painter.drawText(name_rect, TEXT_FLAGS, layout.name)
+            if layout.notes_height:
+                task = index.data(TASK_ROLE)
+                painter.setFont(notes_font)
+                painter.drawText(
+                    QRect(rect.left(), rect.top() + layout.name_height + NOTES_SPACING,
+                          rect.width(), layout.notes_height - NOTES_SPACING),
+                    TEXT_FLAGS, self.notes_text(task)
+                )
+        else:
+            painter.drawText(name_rect, LINE_FLAGS, layout.name)
+            if layout.notes_count:
+                name_width = QFontMetrics(name_font).horizontalAdvance(layout.name)
+                painter.setPen(MUTED_COLOR)
+                painter.setFont(notes_font)
+                painter.drawText(
+                    QRect(rect.left() + name_width, rect.top(), rect.width() - name_width,
+                          layout.name_height),
+                    LINE_FLAGS, "  " + notes_count_text(layout.notes_count)
+                )
+        painter.restore()
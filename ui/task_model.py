@@ -0,0 +1,565 @@
+from PyQt6.QtCore import Qt, QAbstractProxyModel, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor, QFont
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import bisect
+from task_diff import TaskDiff, diff_tasks
+
+# Roles beyond the standard ones; the key role matches what the old table items stored
+TASK_KEY_ROLE = Qt.ItemDataRole.UserRole
+TASK_ROLE = Qt.ItemDataRole.UserRole + 1
+# Changes whenever the task's contents change; lets views cache per-task layout
+TASK_VERSION_ROLE = Qt.ItemDataRole.UserRole + 2
+
+COLUMNS = ["Task Name", "Due Date", "Priority"]
+NAME_COLUMN, DUE_DATE_COLUMN, PRIORITY_COLUMN = range(len(COLUMNS))
+
+class PriorityLevel:
+    URGENT = "Urgent ⚡"
+    HIGH = "High 🔴"
+    MEDIUM = "Medium 🟡"
+    LOW = "Low 🟢"
+    
+    @staticmethod
+    def get_priority_value(text):
+        priorities = {
+            PriorityLevel.URGENT: 1,
+            PriorityLevel.HIGH: 2,
+            PriorityLevel.MEDIUM: 3,
+            PriorityLevel.LOW: 4
+        }
+        return priorities.get(text, 4)
+
+def priority_rank(task: Dict) -> int:
+    """Numeric priority (1 = urgent), derived from the label when not stored."""
+    return task.get('priority_value') or PriorityLevel.get_priority_value(task.get('priority'))
+
+def notes_list(task: Dict) -> List[str]:
+    """Non-empty notes of a task, in order."""
+    return [note.strip() for note in (task.get('notes') or '').split('\n') if note.strip()]
+
+def task_display_text(task: Dict) -> str:
+    """Task name followed by its notes as bullet lines."""
+    notes = notes_list(task)
+    text = task.get('task_name', '')
+    if notes:
+        text += '\n' + '\n'.join(f"• {note}" for note in notes)
+    return text
+
+class TaskTableModel(QAbstractTableModel):
+    """
+    Table model over a list of task dicts.
+
+    Cell text, fonts and colours are produced on demand per role, so nothing
+    is allocated for rows the view never shows. Rows are addressed by task
+    key through an index kept in sync with the list.
+    """
+
+    def __init__(self, completed: bool = False, parent=None):
+        """
+        Initialize an empty model.
+
+        Args:
+            completed: Style rows as completed (struck through and grey)
+            parent: Optional QObject parent
+        """
+        super().__init__(parent)
+        self.completed = completed
+        self._tasks: List[Dict] = []
+        self._rows: Dict[str, int] = {}
+        self._versions: Dict[str, int] = {}
+        self._revision = 0
+
+        # Shared by every row instead of one QFont per item
+        self._name_font = QFont()
+        self._cell_font = QFont()
+        if completed:
+            self._name_font.setStrikeOut(True)
+            self._cell_font.setStrikeOut(True)
+        else:
+            self._name_font.setBold(True)
+        self._completed_color = QColor("#6c757d")
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._tasks)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        # Due date and priority of active tasks are edited through their delegates
+        if not self.completed and index.column() != NAME_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._tasks):
+            return None
+        task = self._tasks[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == NAME_COLUMN:
+                return task_display_text(task)
+            if column == DUE_DATE_COLUMN:
+                return task.get('due_date', 'N/A')
+            if column == PRIORITY_COLUMN:
+                return task.get('priority', 'Low')
+        elif role == Qt.ItemDataRole.FontRole:
+            if column == NAME_COLUMN:
+                return self._name_font
+            if self.completed:
+                return self._cell_font
+        elif role == Qt.ItemDataRole.ForegroundRole:
+            if self.completed:
+                return self._completed_color
+        elif role == TASK_KEY_ROLE:
+            return task.get('key')
+        elif role == TASK_ROLE:
+            return task
+        elif role == TASK_VERSION_ROLE:
+            return self._versions.get(task.get('key'), 0)
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        """Local edits from the due date and priority delegates."""
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        field = {DUE_DATE_COLUMN: 'due_date', PRIORITY_COLUMN: 'priority'}.get(index.column())
+        if field is None:
+            return False
+        task = self._tasks[index.row()]
+        task[field] = value
+        if field == 'priority':
+            task['priority_value'] = PriorityLevel.get_priority_value(value)
+        self._touch(task['key'])
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+        return True
+
+    def _touch(self, key: str) -> None:
+        self._revision += 1
+        self._versions[key] = self._revision
+
+    def _reindex(self, start: int = 0) -> None:
+        for row in range(start, len(self._tasks)):
+            self._rows[self._tasks[row]['key']] = row
+
+    def set_tasks(self, tasks: Iterable[Dict]) -> None:
+        """Replace all rows."""
+        self.beginResetModel()
+        self._tasks = [task for task in tasks if task.get('key')]
+        self._rows = {}
+        self._reindex()
+        self._versions = {}
+        for task in self._tasks:
+            self._touch(task['key'])
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.set_tasks([])
+
+    def tasks(self) -> List[Dict]:
+        return list(self._tasks)
+
+    def keys(self) -> List[str]:
+        return [task['key'] for task in self._tasks]
+
+    def task(self, key: str) -> Optional[Dict]:
+        row = self._rows.get(key)
+        return None if row is None else self._tasks[row]
+
+    def task_at(self, row: int) -> Optional[Dict]:
+        return self._tasks[row] if 0 <= row < len(self._tasks) else None
+
+    def row_for_key(self, key: str) -> int:
+        return self._rows.get(key, -1)
+
+    def add_task(self, task: Dict) -> None:
+        """Append a task, or update it if the key is already shown."""
+        if task['key'] in self._rows:
+            self.update_task(task['key'], task)
+            return
+        row = len(self._tasks)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._tasks.append(task)
+        self._rows[task['key']] = row
+        self._touch(task['key'])
+        self.endInsertRows()
+
+    def update_task(self, key: str, changes: Dict) -> bool:
+        """Merge changed fields into a task and repaint its row."""
+        row = self._rows.get(key)
+        if row is None:
+            return False
+        self._tasks[row].update(changes)
+        self._touch(key)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+        return True
+
+    def remove_task(self, key: str) -> bool:
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._tasks[row]
+        self._versions.pop(key, None)
+        self.endRemoveRows()
+        self._reindex(row)
+        return True
+
+    def remove_tasks(self, keys: Iterable[str]) -> None:
+        """Remove many tasks, one removal per contiguous block of rows."""
+        rows = sorted({self._rows[key] for key in keys if key in self._rows}, reverse=True)
+        position = 0
+        while position < len(rows):
+            last = first = rows[position]
+            position += 1
+            while position < len(rows) and rows[position] == first - 1:
+                first = rows[position]
+                position += 1
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for task in self._tasks[first:last + 1]:
+                self._versions.pop(task['key'], None)
+            del self._tasks[first:last + 1]
+            self.endRemoveRows()
+        self._rows = {}
+        self._reindex()
+
+    def reconcile(self, tasks: Sequence[Dict], ordered: bool = True) -> TaskDiff:
+        """
+        Bring the rows in line with a fresh task list, touching only what changed.
+
+        Args:
+            tasks: Tasks that should be shown
+            ordered: Whether row order should follow `tasks`; pass False when
+                a sort proxy decides the displayed order anyway
+
+        Returns:
+            The diff that was applied
+        """
+        tasks = [task for task in tasks if task.get('key')]
+        diff = diff_tasks(self._tasks, tasks, ordered=ordered)
+        if diff.reset:
+            self.set_tasks(tasks)
+            return diff
+
+        self.remove_tasks(diff.removed)
+
+        for step in diff.steps:
+            if step[0] == 'insert':
+                _, row, task = step
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._tasks.insert(row, task)
+                self._touch(task['key'])
+                self.endInsertRows()
+            else:
+                _, source, target = step
+                # Destination is given in pre-move coordinates
+                destination = target + 1 if target > source else target
+                self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), destination)
+                self._tasks.insert(target, self._tasks.pop(source))
+                self.endMoveRows()
+        if diff.steps:
+            self._rows = {}
+            self._reindex()
+
+        for key, task in diff.updated:
+            row = self._rows[key]
+            self._tasks[row] = task
+            self._touch(key)
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+        return diff
+
+
+def _due_date_value(task: Dict) -> float:
+    try:
+        return date.fromisoformat(task.get('due_date') or '').toordinal()
+    except (TypeError, ValueError):
+        return float('inf')  # no or unreadable due date sorts last
+
+def _created_at_value(task: Dict) -> float:
+    try:
+        return datetime.fromisoformat(task.get('created_at') or '').timestamp()
+    except (TypeError, ValueError):
+        return float('inf')
+
+# Typed value of each sortable field; smaller sorts first in ascending order
+SORT_FIELDS: Dict[str, Callable[[Dict], float]] = {
+    'priority': priority_rank,
+    'due_date': _due_date_value,
+    'created_at': _created_at_value,
+}
+
+DEFAULT_SORT_KEYS: List[Tuple[str, Qt.SortOrder]] = [
+    ('priority', Qt.SortOrder.AscendingOrder),
+    ('due_date', Qt.SortOrder.AscendingOrder),
+    ('created_at', Qt.SortOrder.AscendingOrder),
+]
+
+class TaskSortProxyModel(QAbstractProxyModel):
+    """
+    Sorted and optionally filtered view of a TaskTableModel.
+
+    Rows are ordered by a configurable list of (field, order) keys computed
+    from the typed task values, with the task key as the final tie-breaker.
+    A full sort is a single Python sort over precomputed keys; after that,
+    inserted, removed and edited tasks are placed with a binary search and
+    moved on their own, so selection and scroll position survive. (Qt's
+    QSortFilterProxyModel calls back into Python for every comparison, which
+    takes seconds on tens of thousands of rows.)
+    """
+
+    def __init__(self, sort_keys: Sequence[Tuple[str, Qt.SortOrder]] = DEFAULT_SORT_KEYS,
+                 filter_fn: Optional[Callable[[Dict], bool]] = None, parent=None):
+        """
+        Initialize the proxy.
+
+        Args:
+            sort_keys: (field, order) pairs, most significant first; fields
+                come from SORT_FIELDS
+            filter_fn: Returns False for tasks to hide
+            parent: Optional QObject parent
+        """
+        super().__init__(parent)
+        self._sort_keys = list(sort_keys)
+        self._filter = filter_fn
+        self._order: List[int] = []      # proxy row -> source row
+        self._keys: List[tuple] = []     # sort key of each proxy row, ascending
+        self._proxy_rows: Optional[Dict[int, int]] = {}  # source row -> proxy row, rebuilt lazily
+        self._layout_keys: List[str] = []
+
+    # Configuration
+
+    def sort_keys(self) -> List[Tuple[str, Qt.SortOrder]]:
+        return list(self._sort_keys)
+
+    def set_sort_keys(self, sort_keys: Sequence[Tuple[str, Qt.SortOrder]]) -> None:
+        """Change the ordering; selection follows the tasks."""
+        self._sort_keys = list(sort_keys)
+        self._begin_layout_change()
+        self._rebuild()
+        self._end_layout_change()
+
+    def set_filter(self, filter_fn: Optional[Callable[[Dict], bool]]) -> None:
+        self.beginResetModel()
+        self._filter = filter_fn
+        self._rebuild()
+        self.endResetModel()
+
+    def sort_key(self, task: Dict) -> tuple:
+        values = []
+        for field, order in self._sort_keys:
+            value = SORT_FIELDS[field](task)
+            values.append(-value if order == Qt.SortOrder.DescendingOrder else value)
+        values.append(task.get('key', ''))
+        return tuple(values)
+
+    def _accepts(self, task: Dict) -> bool:
+        return self._filter is None or bool(self._filter(task))
+
+    # QAbstractProxyModel interface
+
+    def setSourceModel(self, model: TaskTableModel):
+        previous = self.sourceModel()
+        if previous is not None:
+            for signal, slot in self._source_connections(previous):
+                signal.disconnect(slot)
+        self.beginResetModel()
+        super().setSourceModel(model)
+        if model is not None:
+            for signal, slot in self._source_connections(model):
+                signal.connect(slot)
+        self._rebuild()
+        self.endResetModel()
+
+    def _source_connections(self, model):
+        return [
+            (model.modelAboutToBeReset, self.beginResetModel),
+            (model.modelReset, self._on_source_reset),
+            (model.layoutAboutToBeChanged, self._begin_layout_change),
+            (model.layoutChanged, self._on_source_layout_changed),
+            (model.rowsInserted, self._on_rows_inserted),
+            (model.rowsAboutToBeRemoved, self._on_rows_about_to_be_removed),
+            (model.rowsRemoved, self._on_rows_removed),
+            (model.rowsMoved, self._on_rows_moved),
+            (model.dataChanged, self._on_data_changed),
+        ]
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < len(self._order)) or not (0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()):
+        source = self.sourceModel()
+        return 0 if parent.isValid() or source is None else source.columnCount()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or proxy_index.row() >= len(self._order):
+            return QModelIndex()
+        return self.sourceModel().index(self._order[proxy_index.row()], proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = self._proxy_row(source_index.row())
+        return QModelIndex() if row is None else self.createIndex(row, source_index.column())
+
+    # Mapping maintenance
+
+    def _proxy_row(self, source_row: int) -> Optional[int]:
+        if self._proxy_rows is None:
+            self._proxy_rows = {source: proxy for proxy, source in enumerate(self._order)}
+        return self._proxy_rows.get(source_row)
+
+    def _rebuild(self) -> None:
+        source = self.sourceModel()
+        entries = []
+        if source is not None:
+            for row in range(source.rowCount()):
+                task = source.task_at(row)
+                if self._accepts(task):
+                    entries.append((self.sort_key(task), row))
+        entries.sort()
+        self._keys = [key for key, _ in entries]
+        self._order = [row for _, row in entries]
+        self._proxy_rows = None
+
+    def _insert(self, source_row: int, key: tuple) -> None:
+        position = bisect.bisect_left(self._keys, key)
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._keys.insert(position, key)
+        self._order.insert(position, source_row)
+        self._proxy_rows = None
+        self.endInsertRows()
+
+    def _remove(self, proxy_row: int) -> None:
+        self.beginRemoveRows(QModelIndex(), proxy_row, proxy_row)
+        del self._keys[proxy_row]
+        del self._order[proxy_row]
+        self._proxy_rows = None
+        self.endRemoveRows()
+
+    def _reposition(self, source_row: int) -> None:
+        """Re-filter and re-sort one task after it changed."""
+        task = self.sourceModel().task_at(source_row)
+        proxy_row = self._proxy_row(source_row)
+        accepted = self._accepts(task)
+        if proxy_row is None:
+            if accepted:
+                self._insert(source_row, self.sort_key(task))
+            return
+        if not accepted:
+            self._remove(proxy_row)
+            return
+
+        key = self.sort_key(task)
+        position = bisect.bisect_left(self._keys, key)
+        target = position - 1 if position > proxy_row else position
+        if target != proxy_row:
+            # Destination is given in pre-move coordinates
+            self.beginMoveRows(QModelIndex(), proxy_row, proxy_row, QModelIndex(), position)
+            del self._keys[proxy_row]
+            del self._order[proxy_row]
+            self._keys.insert(target, key)
+            self._order.insert(target, source_row)
+            self._proxy_rows = None
+            self.endMoveRows()
+        else:
+            self._keys[proxy_row] = key
+        self.dataChanged.emit(self.index(target, 0), self.index(target, self.columnCount() - 1))
+
+    # Source model signals
+
+    def _on_source_reset(self) -> None:
+        self._rebuild()
+        self.endResetModel()
+
+    def _begin_layout_change(self, *args) -> None:
+        # Remember which task each persistent index points at
+        self.layoutAboutToBeChanged.emit()
+        source = self.sourceModel()
+        self._layout_keys = [
+            source.task_at(self._order[index.row()])['key'] for index in self.persistentIndexList()
+        ]
+
+    def _end_layout_change(self) -> None:
+        persistent = self.persistentIndexList()
+        source = self.sourceModel()
+        rows = {source.task_at(row)['key']: proxy for proxy, row in enumerate(self._order)}
+        self.changePersistentIndexList(persistent, [
+            self.index(rows[key], index.column()) if key in rows else QModelIndex()
+            for key, index in zip(self._layout_keys, persistent)
+        ])
+        self._layout_keys = []
+        self.layoutChanged.emit()
+
+    def _on_source_layout_changed(self, *args) -> None:
+        self._rebuild()
+        self._end_layout_change()
+
+    def _on_rows_inserted(self, parent, first, last) -> None:
+        count = last - first + 1
+        self._order = [row + count if row >= first else row for row in self._order]
+        self._proxy_rows = None
+        source = self.sourceModel()
+        for row in range(first, last + 1):
+            task = source.task_at(row)
+            if self._accepts(task):
+                self._insert(row, self.sort_key(task))
+
+    def _on_rows_about_to_be_removed(self, parent, first, last) -> None:
+        doomed = sorted((proxy for proxy, row in enumerate(self._order) if first <= row <= last),
+                        reverse=True)
+        position = 0
+        while position < len(doomed):
+            end = start = doomed[position]
+            position += 1
+            while position < len(doomed) and doomed[position] == start - 1:
+                start = doomed[position]
+                position += 1
+            self.beginRemoveRows(QModelIndex(), start, end)
+            del self._keys[start:end + 1]
+            del self._order[start:end + 1]
+            self.endRemoveRows()
+        self._proxy_rows = None
+
+    def _on_rows_removed(self, parent, first, last) -> None:
+        count = last - first + 1
+        self._order = [row - count if row > last else row for row in self._order]
+        self._proxy_rows = None
+
+    def _on_rows_moved(self, parent, start, end, destination_parent, destination) -> None:
+        # Source order doesn't affect ours; only the row numbers we point at change
+        count = end - start + 1
+        offset = destination - start if destination < start else destination - end - 1
+
+        def moved(row):
+            if start <= row <= end:
+                return row + offset
+            if destination <= row < start:
+                return row + count
+            if end < row < destination:
+                return row - count
+            return row
+
+        self._order = [moved(row) for row in self._order]
+        self._proxy_rows = None
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()) -> None:
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self._reposition(row)
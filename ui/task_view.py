@@ -0,0 +1,156 @@
+from PyQt6.QtWidgets import QAbstractItemView, QFrame, QStyleOptionViewItem, QTableView
+from PyQt6.QtCore import Qt, QModelIndex, QTimer
+from PyQt6.QtGui import QColor, QFont, QPainter
+from typing import Dict, List, Optional
+from ui.task_delegate import TaskRowDelegate
+from ui.task_model import NAME_COLUMN, TASK_ROLE
+
+class TaskTableView(QTableView):
+    """
+    Styled task table that draws its own empty-state placeholder.
+
+    Row heights are fitted to their contents only for rows that scroll into
+    view, so opening a long list costs the same as opening a short one. The
+    height comes from the task name delegate's cached measurement, so
+    re-fitting after a scroll, resize or refresh is a lookup per visible row.
+
+    Tasks show one line with a notes count until expanded (click the arrow,
+    or Right/Left on the selected row); see TaskRowDelegate.
+    """
+
+    def __init__(self, placeholder_text: str = "", parent=None):
+        super().__init__(parent)
+        # Styled by the application stylesheet (see ui/theme.py)
+        self.setObjectName("TaskTable")
+
+        self.setAlternatingRowColors(False)  # Disable alternating colors
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.verticalHeader().setVisible(False)
+        self.verticalHeader().setDefaultSectionSize(45)
+        self.setShowGrid(True)
+        self.setWordWrap(True)
+
+        self.row_delegate = TaskRowDelegate(self)
+        self.setItemDelegateForColumn(NAME_COLUMN, self.row_delegate)
+        self.row_delegate.expansion_changed.connect(self.invalidate_row_heights)
+
+        self._placeholder_text = placeholder_text
+        self._placeholder_font = QFont()
+        self._placeholder_font.setItalic(True)
+
+        # Rows whose height has been fitted since the last layout change
+        self._fitted_rows = set()
+        self._fit_pending = False
+        self._last_width = 0
+        self.verticalScrollBar().valueChanged.connect(self.schedule_row_fit)
+
+    def setModel(self, model):
+        super().setModel(model)
+        for signal in (model.modelReset, model.layoutChanged, model.rowsInserted,
+                       model.rowsRemoved, model.rowsMoved, model.dataChanged):
+            signal.connect(self.invalidate_row_heights)
+        self.invalidate_row_heights()
+
+    def set_placeholder_text(self, text: str) -> None:
+        """Text drawn in the middle of the table while it has no rows."""
+        self._placeholder_text = text
+        self.viewport().update()
+
+    def set_notes_collapsed(self, collapsed: bool) -> None:
+        """Show one line per task (True) or every task's notes inline (False)."""
+        self.row_delegate.set_notes_collapsed(collapsed)
+        self.invalidate_row_heights()
+        self.viewport().update()
+
+    def invalidate_row_heights(self, *args) -> None:
+        """Re-fit visible rows after the data or layout changed."""
+        self._fitted_rows.clear()
+        self.schedule_row_fit()
+
+    def schedule_row_fit(self, *args) -> None:
+        if not self._fit_pending:
+            self._fit_pending = True
+            QTimer.singleShot(0, self.fit_visible_rows)
+
+    def fit_visible_rows(self) -> None:
+        """Fit the heights of the rows currently in the viewport."""
+        self._fit_pending = False
+        model = self.model()
+        if model is None or model.rowCount() == 0:
+            return
+        row = max(self.rowAt(0), 0)
+        bottom = self.viewport().height()
+        while row < model.rowCount() and self.rowViewportPosition(row) <= bottom:
+            if row not in self._fitted_rows:
+                self._fitted_rows.add(row)
+                height = self.row_height_hint(row)
+                if height != self.rowHeight(row):
+                    self.setRowHeight(row, height)
+            row += 1
+
+    def row_height_hint(self, row: int) -> int:
+        """Height of a row, taken from the name column alone."""
+        index = self.model().index(row, NAME_COLUMN)
+        option = QStyleOptionViewItem()
+        self.initViewItemOption(option)
+        # Same width the cell is painted with (the grid line takes a pixel)
+        option.rect.setWidth(self.visualRect(index).width())
+        hint = self.itemDelegateForIndex(index).sizeHint(option, index)
+        return max(hint.height(), self.verticalHeader().defaultSectionSize())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # Wrapped text changes height with the width
+        if self.viewport().width() != self._last_width:
+            self._last_width = self.viewport().width()
+            self.invalidate_row_heights()
+        else:
+            self.schedule_row_fit()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        model = self.model()
+        if self._placeholder_text and (model is None or model.rowCount() == 0):
+            painter = QPainter(self.viewport())
+            painter.setFont(self._placeholder_font)
+            painter.setPen(QColor("#6c757d"))
+            painter.drawText(self.viewport().rect(), Qt.AlignmentFlag.AlignCenter, self._placeholder_text)
+            painter.end()
+
+    def task_at(self, index: QModelIndex) -> Optional[Dict]:
+        """Task dict shown at a view index."""
+        return index.data(TASK_ROLE) if index.isValid() else None
+
+    def current_task(self) -> Optional[Dict]:
+        """Task of the selected row, if any."""
+        selected = self.selectionModel().selectedRows() if self.selectionModel() else []
+        return self.task_at(selected[0]) if selected else None
+
+    def selected_tasks(self) -> List[Dict]:
+        if not self.selectionModel():
+            return []
+        return [self.task_at(index) for index in self.selectionModel().selectedRows()]
+
+    def keyPressEvent(self, event):
+        """Right expands and Left collapses the selected task's notes."""
+        if event.key() in (Qt.Key.Key_Right, Qt.Key.Key_Left):
+            task = self.current_task()
+            if task and self.row_delegate.notes_collapsed:
+                self.row_delegate.set_expanded(task['key'], event.key() == Qt.Key.Key_Right)
+                return
+        super().keyPressEvent(event)
+
+    def mousePressEvent(self, event):
+        """Handle mouse press events"""
+        if not self.indexAt(event.pos()).isValid():
+            self.clearSelection()
+            self.setCurrentIndex(QModelIndex())
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        """Handle mouse release events"""
+        super().mouseReleaseEvent(event)
+        if not self.selectionModel().hasSelection():
+            self.clearSelection()
@@ -0,0 +1,500 @@
+from PyQt6.QtWidgets import QApplication, QWidget
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# ModernButton variants and their base colors
+BUTTON_COLORS: Dict[str, str] = {
+    'primary': '#4a90e2',
+    'success': '#28a745',
+    'secondary': '#6c757d',
+    'danger': '#dc3545',
+    'warning': '#ffc107',
+    # Login screen buttons
+    'login': '#4CAF50',
+    'signup': '#2196F3',
+}
+
+# Variants whose hover/pressed colors were picked by hand: variant -> (hover, pressed)
+HAND_PICKED_COLORS: Dict[str, Tuple[str, str]] = {
+    'login': ('#45a049', '#3d8b40'),
+    'signup': ('#1976D2', '#1565C0'),
+}
+
+HOVER_AMOUNT = -20
+PRESSED_AMOUNT = -40
+
+@lru_cache(maxsize=None)
+def adjust_color(color: str, amount: int) -> str:
+    """
+    Darken (negative amount) or lighten a #rrggbb color.
+
+    Args:
+        color: Color as '#rrggbb'
+        amount: Added to each channel, clamped to 0-255
+
+    Returns:
+        The adjusted color as '#rrggbb'
+    """
+    color = color.lstrip('#')
+    rgb = tuple(int(color[i:i+2], 16) for i in (0, 2, 4))
+    rgb = tuple(max(0, min(255, c + amount)) for c in rgb)
+    return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
+
+def _state_colors(variant: str) -> Tuple[str, str, str]:
+    base = BUTTON_COLORS[variant]
+    hover, pressed = HAND_PICKED_COLORS.get(
+        variant, (adjust_color(base, HOVER_AMOUNT), adjust_color(base, PRESSED_AMOUNT))
+    )
+    return base, hover, pressed
+
+# variant -> (base, hover, pressed), computed once at import
+STATE_COLORS: Dict[str, Tuple[str, str, str]] = {
+    variant: _state_colors(variant) for variant in BUTTON_COLORS
+}
+
+_VARIANT_BY_COLOR: Dict[str, str] = {
+    color.lower(): variant for variant, color in reversed(BUTTON_COLORS.items())
+}
+
+def variant_for_color(color: str) -> Optional[str]:
+    """The button variant with this base color, or None for a custom color."""
+    return _VARIANT_BY_COLOR.get(color.lower())
+
+_BUTTON_BASE = """
+QPushButton#ModernButton {
+    padding: 8px 16px;
+    border: none;
+    border-radius: 6px;
+    color: white;
+    font-size: 13px;
+    font-weight: bold;
+    min-width: 80px;
+    outline: none;
+}
+QPushButton#ModernButton:hover {
+    margin-top: -2px;
+    margin-bottom: 2px;
+}
+QPushButton#ModernButton:pressed {
+    margin-top: 0px;
+    margin-bottom: 0px;
+}
+QPushButton#ModernButton:focus {
+    outline: none;
+    border: none;
+}
+QPushButton#ModernButton[buttonSize="large"] {
+    padding: 15px;
+    border-radius: 8px;
+    font-size: 16px;
+    min-width: 120px;
+    margin: 2px;
+}
+QPushButton#ModernButton[buttonSize="large"]:hover {
+    margin: 0px;
+}
+QPushButton#ModernButton[buttonSize="large"]:pressed {
+    margin: 2px;
+}
+QPushButton#ModernButton[buttonSize="icon"] {
+    padding: 8px;
+    border-radius: 8px;
+    font-size: 18px;
+    /* 50px wide including padding; Qt applies min-width over setFixedWidth */
+    min-width: 34px;
+    max-width: 34px;
+}
+QPushButton#ModernButton[buttonSize="icon"]:hover {
+    margin: 0px;
+}
+"""
+
+# Filled button of one variant; {v} is the variant name
+_BUTTON_VARIANT = """
+QPushButton#ModernButton[variant="{v}"] {{
+    background-color: {base};
+}}
+QPushButton#ModernButton[variant="{v}"]:hover {{
+    background-color: {hover};
+}}
+QPushButton#ModernButton[variant="{v}"]:pressed {{
+    background-color: {pressed};
+}}
+QPushButton#ModernButton[variant="{v}"][framed="true"] {{
+    border: 2px solid {base};
+}}
+QPushButton#ModernButton[variant="{v}"][buttonSize="large"]:hover {{
+    border: 2px solid {hover};
+}}
+QPushButton#ModernButton[variant="{v}"][outlined="true"] {{
+    background-color: transparent;
+    color: {base};
+    border: 2px solid {base};
+    padding: 12px;
+    font-size: 14px;
+    margin: 0px;
+}}
+QPushButton#ModernButton[variant="{v}"][outlined="true"]:hover {{
+    background-color: {base};
+    color: white;
+    border: 2px solid {base};
+}}
+QPushButton#ModernButton[variant="{v}"][outlined="true"]:pressed {{
+    background-color: {hover};
+    color: white;
+    margin: 0px;
+}}
+"""
+
+_WIDGETS = """
+QLineEdit#ModernLineEdit {
+    padding: 8px 12px;
+    border: 1px solid #e0e0e0;
+    border-radius: 8px;
+    background-color: #f5f5f5;
+    font-size: 14px;
+    color: #333333;
+    selection-background-color: #4a90e2;
+    selection-color: white;
+}
+QLineEdit#ModernLineEdit:hover, QLineEdit#ModernLineEdit:focus {
+    background-color: #f5f5f5;
+    border: 1px solid #d0d0d0;
+}
+
+QPushButton#NotificationButton {
+    background-color: #f8f9fa;
+    border: none;
+    border-radius: 20px;
+    padding: 8px;
+}
+QPushButton#NotificationButton:hover {
+    background-color: #e9ecef;
+}
+QLabel#NotificationBadge {
+    color: white;
+    background-color: #dc3545;
+    border-radius: 10px;
+    padding: 2px 5px;
+    margin: 2px;
+    font-size: 10px;
+    font-weight: bold;
+}
+
+QPushButton#linkButton {
+    border: none;
+    color: #4a90e2;
+    font-size: 13px;
+    text-decoration: underline;
+    padding: 0;
+    text-align: left;
+    max-width: 150px;
+}
+QPushButton#linkButton:hover {
+    color: #357abd;
+}
+
+QTableView#TaskTable {
+    background-color: #f5f7fa;
+    border: 1px solid #e1e8ed;
+    border-radius: 8px;
+    gridline-color: #e1e8ed;
+}
+QTableView#TaskTable::item {
+    padding: 8px;
+    border-bottom: 1px solid #e1e8ed;
+    color: #2c3e50;
+    font-size: 13px;
+}
+QTableView#TaskTable::item:selected {
+    background-color: #edf2f7;
+    color: #2c3e50;
+}
+QTableView#TaskTable::item:hover {
+    background-color: #edf2f7;
+}
+QTableView#TaskTable QHeaderView::section {
+    background-color: #f8f9fa;
+    color: #2c3e50;
+    padding: 10px;
+    border: none;
+    border-bottom: 2px solid #e1e8ed;
+    font-weight: bold;
+    font-size: 13px;
+}
+QTableView#TaskTable QHeaderView::section:hover {
+    background-color: #edf2f7;
+}
+
+QListView#NotificationList {
+    background-color: white;
+    border: none;
+}
+QDialog#NotificationDialog {
+    background-color: white;
+    border-radius: 10px;
+}
+QLabel#dialogTitle {
+    font-weight: bold;
+    font-size: 14px;
+}
+
+QDialog#datePicker {
+    background-color: white;
+    border-radius: 10px;
+    border: 1px solid #e0e0e0;
+}
+QDialog#datePicker QCalendarWidget {
+    background-color: white;
+    border: none;
+}
+QDialog#datePicker QCalendarWidget QToolButton {
+    color: #2d3748;
+    background-color: transparent;
+    border: none;
+    border-radius: 4px;
+    padding: 4px;
+}
+QDialog#datePicker QCalendarWidget QToolButton:hover {
+    background-color: #e9ecef;
+}
+QDialog#datePicker QCalendarWidget QMenu {
+    background-color: white;
+    border: 1px solid #e0e0e0;
+    border-radius: 4px;
+}
+QDialog#datePicker QCalendarWidget QSpinBox {
+    border: 1px solid #e0e0e0;
+    border-radius: 4px;
+    padding: 2px;
+}
+
+QLabel#pageTitle, QLabel#dialogHeading {
+    color: #2c3e50;
+}
+QLabel#dialogMessage {
+    color: #2c3e50;
+    font-size: 12px;
+}
+QWidget#dialogContainer {
+    background-color: white;
+    border-radius: 10px;
+    padding: 15px;
+}
+
+QTabWidget#taskTabs::pane {
+    border: none;
+    border-radius: 10px;
+    background: white;
+    padding: 10px;
+}
+QTabWidget#taskTabs::tab-bar {
+    alignment: left;
+}
+QTabWidget#taskTabs QTabBar {
+    background: transparent;
+}
+QTabWidget#taskTabs QTabBar::tab {
+    padding: 10px 20px;
+    margin: 4px 2px;
+    background: #f8f9fa;
+    border: none;
+    border-radius: 6px;
+    min-width: 120px;
+    font-size: 13px;
+    color: #4a5568;
+    outline: none;
+    text-decoration: none;
+}
+QTabWidget#taskTabs QTabBar::tab:selected {
+    background: #4a90e2;
+    color: white;
+    font-weight: bold;
+}
+QTabWidget#taskTabs QTabBar::tab:hover:!selected {
+    background: #e9ecef;
+    color: #2d3748;
+}
+QTabWidget#taskTabs QTabBar QToolButton {
+    border: none;
+    outline: none;
+}
+
+QWidget#buttonBar {
+    background-color: #f8f9fa;
+    border-radius: 10px;
+    padding: 10px;
+}
+QWidget#accountButtonBar {
+    background-color: #f8f9fa;
+    border-radius: 10px;
+    padding: 15px;
+}
+QWidget#profileCard {
+    background-color: white;
+    border-radius: 15px;
+}
+QLabel#profilePicture {
+    background-color: #f0f0f0;
+    border-radius: 50px;
+    border: 2px solid #ddd;
+    font-size: 40px;
+}
+QLabel#profilePicture[hasImage="true"] {
+    background-color: transparent;
+    border-radius: 75px;
+    border: 2px solid #e0e0e0;
+}
+
+QWidget#aboutContainer {
+    background-color: white;
+    border-radius: 10px;
+    padding: 10px;
+}
+QWidget#aboutContainer QTabWidget::pane {
+    border: none;
+    background: white;
+    padding: 10px;
+}
+QWidget#aboutContainer QTabWidget::tab-bar {
+    alignment: center;
+}
+QWidget#aboutContainer QTabWidget::right-corner,
+QWidget#aboutContainer QTabWidget::left-corner {
+    width: 0px;
+    border: none;
+    background: transparent;
+}
+QWidget#aboutContainer QTabBar::scroller,
+QWidget#aboutContainer QTabBar QToolButton,
+QWidget#aboutContainer QTabBar::tear {
+    width: 0px;
+    height: 0px;
+    border: none;
+    background: transparent;
+}
+QWidget#aboutContainer QTabBar::tab {
+    padding: 8px 16px;
+    margin: 4px 2px;
+    background: #f8f9fa;
+    border: 1px solid #e0e0e0;
+    border-radius: 6px;
+    min-width: 80px;
+    font-size: 13px;
+    color: #2c3e50;
+    font-weight: 500;
+}
+QWidget#aboutContainer QTabBar::tab:selected {
+    background: #4a90e2;
+    color: white;
+    font-weight: bold;
+    border: none;
+}
+QWidget#aboutContainer QTabBar::tab:hover:!selected {
+    background: #e9ecef;
+    color: #4a90e2;
+    border: 1px solid #4a90e2;
+}
+QWidget#aboutContainer QScrollBar:vertical {
+    border: none;
+    background: #f0f0f0;
+    width: 8px;
+    border-radius: 4px;
+    margin: 0;
+}
+QWidget#aboutContainer QScrollBar::handle:vertical {
+    background: #c0c0c0;
+    border-radius: 4px;
+    min-height: 20px;
+}
+QWidget#aboutContainer QScrollBar::handle:vertical:hover {
+    background: #a0a0a0;
+}
+QWidget#aboutContainer QScrollBar::add-line:vertical,
+QWidget#aboutContainer QScrollBar::sub-line:vertical {
+    height: 0px;
+}
+QWidget#aboutContainer QLabel {
+    font-size: 13px;
+    padding: 10px;
+    color: #2c3e50;
+}
+QWidget#aboutContainer QLabel#aboutContent {
+    padding: 20px;
+    background: #ffffff;
+    border-radius: 8px;
+    border: 1px solid #e0e0e0;
+}
+
+QLabel#PageTitle {
+    color: #2c3e50;
+    padding: 15px 0;
+    margin: 10px 0;
+    background: transparent;
+}
+QLabel#loginTitle {
+    color: #2c3e50;
+    margin: 10px;
+    letter-spacing: 2px;
+}
+QLabel#creditLink {
+    margin-bottom: 5px;
+    letter-spacing: 1px;
+}
+QLabel#developerLink {
+    margin-bottom: 15px;
+    letter-spacing: 1px;
+}
+QStackedWidget#authPages {
+    background-color: white;
+    border-radius: 15px;
+    padding: 20px;
+}
+"""
+
+@lru_cache(maxsize=1)
+def build_stylesheet() -> str:
+    """
+    The whole application stylesheet, built once.
+
+    Widgets opt in through their object name and dynamic properties
+    (e.g. ModernButton's 'variant'), so creating one no longer parses a
+    stylesheet of its own.
+    """
+    parts = [_BUTTON_BASE]
+    for variant, (base, hover, pressed) in STATE_COLORS.items():
+        parts.append(_BUTTON_VARIANT.format(v=variant, base=base, hover=hover, pressed=pressed))
+    parts.append(_WIDGETS)
+    return ''.join(parts)
+
+@lru_cache(maxsize=None)
+def custom_button_stylesheet(color: str) -> str:
+    """Per-widget sheet for a ModernButton whose color is not a theme variant."""
+    return (f"QPushButton#ModernButton {{ background-color: {color}; }}"
+            f"QPushButton#ModernButton:hover {{ background-color: {adjust_color(color, HOVER_AMOUNT)}; }}"
+            f"QPushButton#ModernButton:pressed {{ background-color: {adjust_color(color, PRESSED_AMOUNT)}; }}")
+
+def apply_theme(app: QApplication) -> None:
+    """Install the application stylesheet; call before creating widgets."""
+    started = time.perf_counter()
+    app.setStyleSheet(build_stylesheet())
+    logger.info(f"Applied theme in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+def set_style_property(widget: QWidget, name: str, value) -> None:
+    """
+    Change a dynamic property that the stylesheet selects on.
+
+    Qt does not re-evaluate property selectors by itself, so the widget is
+    re-polished only when the value actually changes.
+    """
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
@@ -0,0 +1,59 @@
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+class _GuiInvoker(QObject):
+    """Runs callables on the thread it lives in (the GUI thread) via a queued signal."""
+    invoke = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.invoke.connect(self._run, Qt.ConnectionType.QueuedConnection)
+
+    def _run(self, fn):
+        try:
+            fn()
+        except Exception as e:
+            logger.error(f"Error in GUI callback: {e}")
+
+_invoker: Optional[_GuiInvoker] = None
+
+def call_in_gui_thread(fn: Callable[[], Any]) -> None:
+    """
+    Schedule fn on the GUI thread.
+
+    The first call must come from the GUI thread so the invoker lives there.
+    """
+    global _invoker
+    if _invoker is None:
+        _invoker = _GuiInvoker()
+    _invoker.invoke.emit(fn)
+
+def deliver(future: Future, on_success: Callable[[Any], Any],
+            on_error: Optional[Callable[[Exception], Any]] = None) -> None:
+    """
+    Hand a future's outcome to callbacks on the GUI thread.
+
+    Args:
+        future: Future completed on a worker thread
+        on_success: Called with the result
+        on_error: Called with the exception (logged if omitted)
+    """
+    # Create the invoker now, while we are still on the GUI thread
+    call_in_gui_thread(lambda: None)
+
+    def done(completed: Future):
+        if completed.cancelled():
+            return
+        error = completed.exception()
+        if error is None:
+            call_in_gui_thread(lambda: on_success(completed.result()))
+        elif on_error is not None:
+            call_in_gui_thread(lambda: on_error(error))
+        else:
+            logger.error(f"Background request failed: {error}")
+
+    future.add_done_callback(done)
@@ -1,18 +1,97 @@
 import json
 import os
+import atexit
+import tempfile
+import threading
 from pathlib import Path
 from firebase_config import current_user, db, token_manager, auth
-from typing import Optional, Dict
+from typing import Callable, Optional, Dict
 import logging
-from cryptography.fernet import Fernet
 import base64
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """
+    Write data to path so readers see either the old or the new file, never a torn one.
+    
+    Args:
+        path: Destination file
+        data: Bytes to write
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except Exception:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+class WriteBehindPersister:
+    """Coalesces bursts of session updates into a single atomic file write."""
+    
+    def __init__(self, path: Path, encode: Callable[[Dict], bytes], delay: float = 0.5):
+        """
+        Initialize the persister.
+        
+        Args:
+            path: File the session is persisted to
+            encode: Turns session data into the bytes written to disk
+            delay: Seconds to wait for further updates before writing
+        """
+        self.path = path
+        self.encode = encode
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._pending: Optional[Dict] = None
+        self._timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+        
+    def schedule(self, session_data: Dict) -> None:
+        """Queue session data; only the latest data is written when the timer fires."""
+        with self._lock:
+            self._pending = session_data
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+                
+    def flush(self) -> None:
+        """Write any pending session data now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            session_data, self._pending = self._pending, None
+            if session_data is None:
+                return
+            try:
+                atomic_write_bytes(self.path, self.encode(session_data))
+            except Exception as e:
+                logger.error(f"Failed to persist session: {e}")
+                
+    def cancel(self) -> None:
+        """Drop any pending write."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending = None
+
 class SessionManager:
     """Manages user session data and token handling."""
     
+    # Errors that mean the session file is unreadable and should be discarded
+    _corrupt_session_errors = (json.JSONDecodeError,)
+    
     def __init__(self):
         """Initialize session manager with required paths."""
         self.app_data_dir = Path.home() / '.todoapp'
@@ -20,6 +99,12 @@ class SessionManager:
         self.token_manager = token_manager
         self._ensure_app_directory()
         
+        # Decoded in-memory copy of the session file; the file is only read once
+        self._cache_lock = threading.RLock()
+        self._session_cache: Optional[Dict] = None
+        self._cache_loaded = False
+        self._persister = WriteBehindPersister(self.session_file, self._encode_session)
+        
     def _ensure_app_directory(self) -> None:
         """Create application directory if it doesn't exist."""
         try:
@@ -29,6 +114,14 @@ class SessionManager:
             logger.error(f"Failed to create directory: {e}")
             raise RuntimeError(f"Cannot create app directory: {e}")
 
+    def _encode_session(self, session_data: Dict) -> bytes:
+        """Serialize session data for storage."""
+        return json.dumps(session_data).encode()
+        
+    def _decode_session(self, raw_data: bytes) -> Dict:
+        """Deserialize stored session data."""
+        return json.loads(raw_data)
+
     def save_session(self, user_id: str, email: str, 
                     token: Optional[str] = None, 
                     refresh_token: Optional[str] = None, 
@@ -36,6 +129,9 @@ class SessionManager:
         """
         Save user session data securely.
         
+        The in-memory copy is updated immediately; the file is written
+        shortly afterwards so consecutive updates cost a single write.
+        
         Args:
             user_id: User's unique identifier
             email: User's email address
@@ -53,8 +149,10 @@ class SessionManager:
                 'is_guest': is_guest
             }
             
-            with open(self.session_file, 'w') as f:
-                json.dump(session_data, f)
+            with self._cache_lock:
+                self._session_cache = session_data
+                self._cache_loaded = True
+            self._persister.schedule(dict(session_data))
                 
             logger.info(f"Session saved for user: {email}")
             
@@ -69,38 +167,66 @@ class SessionManager:
         Returns:
             Session data dictionary or None if no session exists
         """
-        try:
-            if not self.session_file.exists():
+        with self._cache_lock:
+            if self._cache_loaded:
+                return dict(self._session_cache) if self._session_cache else None
+                
+            try:
+                if not self.session_file.exists():
+                    session_data = None
+                else:
+                    session_data = self._decode_session(self.session_file.read_bytes())
+                    
+            except self._corrupt_session_errors:
+                logger.error("Corrupted session file detected")
+                # Cached as empty first, so clear_session() doesn't read it again
+                self._session_cache = None
+                self._cache_loaded = True
+                self.clear_session()
                 return None
                 
-            with open(self.session_file, 'r') as f:
-                return json.load(f)
+            except Exception as e:
+                logger.error(f"Failed to load session: {e}")
+                return None
                 
-        except json.JSONDecodeError:
-            logger.error("Corrupted session file detected")
-            self.clear_session()
-            return None
-            
-        except Exception as e:
-            logger.error(f"Failed to load session: {e}")
-            return None
+            self._session_cache = session_data
+            self._cache_loaded = True
+            return dict(session_data) if session_data else None
+
+    def flush(self) -> None:
+        """Write any pending session update to disk immediately."""
+        self._persister.flush()
 
     def clear_session(self):
         """Clear user session data"""
+        try:
+            # Check if it's a guest session
+            session = self.load_session()
+            if session and session.get('is_guest'):
+                # Clear guest data from Firebase if needed
+                if current_user:
+                    try:
+                        db.child('tasks').child(session['user_id']).remove()
+                    except:
+                        pass  # Ignore errors when clearing guest data
+        except:
+            pass
+            
+        with self._cache_lock:
+            self._persister.cancel()
+            self._session_cache = None
+            self._cache_loaded = True
+            
         if self.session_file.exists():
             try:
-                # Check if it's a guest session
-                session = self.load_session()
-                if session and session.get('is_guest'):
-                    # Clear guest data from Firebase if needed
-                    if current_user:
-                        try:
-                            db.child('tasks').child(session['user_id']).remove()
-                        except:
-                            pass  # Ignore errors when clearing guest data
-            except:
-                pass
-            self.session_file.unlink()
+                self.session_file.unlink()
+            except OSError as e:
+                logger.error(f"Failed to remove session file: {e}")
+
+    def get_current_token(self) -> Optional[str]:
+        """Return the stored ID token without contacting the auth server."""
+        session = self.load_session()
+        return session.get('idToken') if session else None
 
     def get_valid_token(self):
         """Get a valid token, refreshing if necessary"""
@@ -131,6 +257,9 @@ class SecureSessionManager(SessionManager):
     """Manages encrypted user session data."""
     
     def __init__(self):
+        # cryptography is slow to import; only pay for it when encryption is used
+        from cryptography.fernet import Fernet, InvalidToken
+        self._corrupt_session_errors = (json.JSONDecodeError, InvalidToken)
         super().__init__()
         self._key = self._get_or_create_key()
         self._fernet = Fernet(self._key)
@@ -141,52 +270,16 @@ class SecureSessionManager(SessionManager):
         if key_file.exists():
             return key_file.read_bytes()
         else:
+            from cryptography.fernet import Fernet
             key = Fernet.generate_key()
-            key_file.write_bytes(key)
+            atomic_write_bytes(key_file, key)
             return key
             
-    def save_session(self, user_id: str, email: str, 
-                    token: Optional[str] = None, 
-                    refresh_token: Optional[str] = None, 
-                    is_guest: bool = False) -> None:
-        """Save encrypted session data."""
-        try:
-            session_data = {
-                'user_id': user_id,
-                'email': email,
-                'logged_in': True,
-                'idToken': token,
-                'refreshToken': refresh_token,
-                'is_guest': is_guest
-            }
-            
-            # Encrypt session data
-            encrypted_data = self._fernet.encrypt(
-                json.dumps(session_data).encode()
-            )
-            
-            with open(self.session_file, 'wb') as f:
-                f.write(encrypted_data)
-                
-            logger.info(f"Encrypted session saved for user: {email}")
-            
-        except Exception as e:
-            logger.error(f"Failed to save encrypted session: {e}")
-            raise RuntimeError(f"Cannot save session data: {e}")
-            
-    def load_session(self) -> Optional[Dict]:
-        """Load and decrypt session data."""
-        try:
-            if not self.session_file.exists():
-                return None
-                
-            with open(self.session_file, 'rb') as f:
-                encrypted_data = f.read()
-                
-            decrypted_data = self._fernet.decrypt(encrypted_data)
-            return json.loads(decrypted_data)
-            
-        except Exception as e:
-            logger.error(f"Failed to load encrypted session: {e}")
-            self.clear_session()
-            return None
+    def _encode_session(self, session_data: Dict) -> bytes:
+        """Encrypt session data; runs once per batched write, not per update."""
+        return self._fernet.encrypt(json.dumps(session_data).encode())
+        
+    def _decode_session(self, raw_data: bytes) -> Dict:
+        """Decrypt session data; runs once per process thanks to the session cache."""
+        return json.loads(self._fernet.decrypt(raw_data))
+